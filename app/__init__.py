@@ -46,8 +46,28 @@ def create_app(config_override: dict | None = None) -> Flask:
     db.init_app(app)
     bcrypt.init_app(app)
     login_manager.init_app(app)
+    # With several worker processes, emits are relayed through a message
+    # queue so they reach clients connected to any worker.
+    from app.utils.socketio_queue import socketio_queue_options
+    queue_options = socketio_queue_options(app)
+    if not queue_options and int(os.environ.get("WEB_CONCURRENCY", "1")) > 1:
+        logging.getLogger(__name__).warning(
+            "WEB_CONCURRENCY > 1 without SOCKETIO_MESSAGE_QUEUE: realtime "
+            "events only reach clients connected to the emitting worker."
+        )
     socketio.init_app(app, cors_allowed_origins=app.config["CORS_ORIGINS"],
-                      async_mode="gevent", logger=False, engineio_logger=False)
+                      async_mode="gevent", logger=False, engineio_logger=False,
+                      **queue_options)
+
+    from app.services.armory.cache import init_armory_cache
+    from app.services.armory.http import init_armory_http
+    from app.services.armory.resilience import init_armory_resilience
+    init_armory_http(app)
+    init_armory_cache(app)
+    init_armory_resilience(app)
+
+    from app.utils.rate_limit import init_rate_limiter
+    init_rate_limiter(app)
 
     # ------------------------------------------------------------ ProxyFix
     # Werkzeug ProxyFix reads X-Forwarded-For/Proto/Host headers set by
@@ -111,6 +131,13 @@ def create_app(config_override: dict | None = None) -> Flask:
         from app.i18n import _t
         return jsonify({"error": _t("common.errors.authRequired")}), 401
 
+    # ------------------------------------------- Realtime emit coalescing
+    # Socket.IO emits made while handling a request are sent once, at the end
+    from app.utils import realtime
+    app.before_request(realtime.begin_batch)
+    app.after_request(realtime.flush_batch)
+    app.teardown_request(realtime.end_batch)
+
     # ----------------------------------------------------- Security headers
     @app.after_request
     def set_security_headers(response):
@@ -186,7 +213,12 @@ def create_app(config_override: dict | None = None) -> Flask:
             _ensure_db_dir()
             db.create_all()
 
-        if app.config.get("SCHEDULER_ENABLED", True) and not app.config.get("TESTING", False):
+        # CLI commands (other than ``flask run``) never run periodic jobs
+        if (
+            app.config.get("SCHEDULER_ENABLED", True)
+            and not app.config.get("TESTING", False)
+            and not _running_cli_command()
+        ):
             from app.jobs.scheduler import init_scheduler
             init_scheduler(app)
 
@@ -197,6 +229,18 @@ def create_app(config_override: dict | None = None) -> Flask:
     return app
 
 
+def _running_cli_command() -> bool:
+    """True when the app is built for a ``flask`` CLI command other than ``run``.
+
+    The CLI loads the app inside the command's click context; servers
+    (gunicorn, ``python wsgi.py``) have none.
+    """
+    import click
+
+    ctx = click.get_current_context(silent=True)
+    return ctx is not None and ctx.info_name != "run"
+
+
 def _ensure_db_dir() -> None:
     """Create the parent directory for file-based SQLite databases."""
     from flask import current_app
@@ -267,6 +311,22 @@ def _register_socketio_handlers() -> None:
         if guild_id is not None:
             leave_room(f"guild_{guild_id}")
 
+    @socketio.on("join_admin_sync")
+    def handle_join_admin_sync(data=None):
+        """Subscribe to character-sync job progress (``sync_progress``)."""
+        if not current_user.is_authenticated:
+            return
+        from app.utils.permissions import has_permission
+        from app.utils.realtime import ADMIN_SYNC_ROOM
+        if not has_permission(None, "trigger_sync"):
+            return
+        join_room(ADMIN_SYNC_ROOM)
+
+    @socketio.on("leave_admin_sync")
+    def handle_leave_admin_sync(data=None):
+        from app.utils.realtime import ADMIN_SYNC_ROOM
+        leave_room(ADMIN_SYNC_ROOM)
+
     @socketio.on("connect")
     def handle_connect():
         """Auto-join the user's personal notification room on connect."""
@@ -367,6 +427,41 @@ def _register_commands(app: Flask) -> None:
         else:
             click.echo("User with that email or username already exists.")
 
+    @app.cli.command("rebuild-event-summaries")
+    def rebuild_event_summaries_command() -> None:
+        """Recompute the materialised signup counts for every event."""
+        from app.services import event_summary_service
+        count = event_summary_service.rebuild_all()
+        click.echo(f"Rebuilt summaries for {count} event(s).")
+
+    @app.cli.command("backfill-character-profiles")
+    def backfill_character_profiles_command() -> None:
+        """Move legacy character metadata JSON into the profile tables."""
+        from app.services import character_service
+        count = character_service.backfill_profiles()
+        click.echo(f"Backfilled profiles for {count} character(s).")
+
+    @app.cli.command("worker")
+    @click.option("--pool-size", type=int, default=None, help="Number of concurrent job handlers.")
+    def worker_command(pool_size: int | None) -> None:
+        """Run the job queue worker until interrupted."""
+        import signal
+
+        from app.jobs.worker import JobWorker, stop_background_worker
+
+        # This process is the consumer; don't run a second in-process one
+        stop_background_worker()
+        worker = JobWorker.from_config(app)
+        if pool_size:
+            worker.pool_size = max(1, pool_size)
+        signal.signal(signal.SIGTERM, lambda *_: worker.stop(wait=False))
+        click.echo(f"Job worker running with {worker.pool_size} handler(s). Ctrl+C to stop.")
+        try:
+            worker.run_forever()
+        except KeyboardInterrupt:
+            worker.stop(wait=False)
+        click.echo("Job worker stopped.")
+
     @app.cli.command("create-db")
     def create_db_command() -> None:
         """Create all database tables."""
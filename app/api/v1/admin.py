@@ -103,6 +103,9 @@ def dashboard_stats():
     except OSError:
         database_size_kb = None
 
+    from app.services.armory.cache import get_response_cache
+    from app.services.armory.registry import provider_health
+
     return jsonify({
         "total_users": total_users,
         "active_users": active_users,
@@ -118,6 +121,8 @@ def dashboard_stats():
         "done_jobs": done_jobs,
         "recent_queue": [j.to_dict() for j in recent_queue],
         "database_size_kb": database_size_kb,
+        "armory_cache": get_response_cache().stats(),
+        "armory_providers": provider_health(),
     }), 200
 
 
@@ -168,16 +173,59 @@ def delete_user(user_id: int):
     return jsonify({"message": _t("api.admin.userDeleted")}), 200
 
 
+def _queue_sync(guild_id: int | None):
+    """Queue a character sync job and answer 202 with its ID."""
+    from app.services import sync_job_service
+
+    job, created = sync_job_service.request_sync(guild_id)
+    return jsonify({
+        "message": _t("api.admin.syncQueued" if created else "api.admin.syncAlreadyRunning"),
+        "job_id": job.id,
+        "status": job.status,
+        "created": created,
+    }), 202
+
+
 @bp.post("/sync-characters")
 @login_required
 def trigger_sync():
-    """Manually trigger a sync of all characters."""
+    """Queue a sync of all characters (or of ``guild_id`` in the body)."""
+    err = _require_permission("trigger_sync")
+    if err:
+        return err
+    guild_id = get_json().get("guild_id")
+    if guild_id is not None and not isinstance(guild_id, int):
+        return jsonify({"error": _t("common.errors.badRequest")}), 400
+    return _queue_sync(guild_id)
+
+
+@bp.post("/guilds/<int:guild_id>/sync-characters")
+@login_required
+def trigger_guild_sync(guild_id: int):
+    """Queue a sync of one guild's characters."""
+    err = _require_permission("trigger_sync")
+    if err:
+        return err
+    from app.models.guild import Guild
+
+    if db.session.get(Guild, guild_id) is None:
+        return jsonify({"error": _t("api.guilds.notFound")}), 404
+    return _queue_sync(guild_id)
+
+
+@bp.get("/sync-jobs/<int:job_id>")
+@login_required
+def sync_job_status(job_id: int):
+    """Return a sync job's status and progress (done/total, failures, ETA)."""
     err = _require_permission("trigger_sync")
     if err:
         return err
-    from app.jobs.handlers import handle_sync_all_characters
-    handle_sync_all_characters({})
-    return jsonify({"message": _t("api.admin.syncCompleted")}), 200
+    from app.services import sync_job_service
+
+    status = sync_job_service.job_status(job_id)
+    if status is None:
+        return jsonify({"error": _t("api.admin.syncJobNotFound")}), 404
+    return jsonify(status), 200
 
 
 # ---------------------------------------------------------------------------
@@ -11,7 +11,7 @@ from app.services import auth_service
 from app.services import discord_service
 from app.utils.auth import login_required
 from app.utils.api_helpers import get_json
-from app.utils.rate_limit import rate_limit
+from app.utils.rate_limit import json_field, rate_limit
 from app.utils.email_validator import validate_email
 from app.i18n import _t
 
@@ -58,7 +58,8 @@ def register():
 
 
 @bp.post("/login")
-@rate_limit(limit=10, window=60)
+# Per account too, so a burst spread over many IPs cannot stuff one account
+@rate_limit(limit=10, window=60, account=json_field("email"), account_limit=10, account_window=300)
 def login():
     data = get_json()
     email = (data.get("email") or "").strip().lower()
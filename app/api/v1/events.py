@@ -8,11 +8,14 @@ from flask import Blueprint, jsonify, request
 from flask_login import current_user
 
 from app.services import event_service, attendance_service
+from app.services.change_counter_service import GLOBAL_KEY, GUILD_EVENTS
 from app.utils.auth import login_required
-from app.utils.api_helpers import get_json, get_event_or_404, validate_required
+from app.utils.api_helpers import get_json, get_event_or_404, get_fields, get_view, validate_required
+from app.utils.conditional import etag_for, not_modified, with_etag
 from app.utils.decorators import require_guild_permission
 from app.utils.dt import utc_iso
 from app.utils.realtime import emit_events_changed
+from app.utils.serialization import FULL, SUMMARY, pick_fields
 from app.utils import notify
 from app.i18n import _t
 
@@ -26,6 +29,13 @@ all_events_bp = Blueprint("all_events", __name__, url_prefix="/events")
 @login_required
 @require_guild_permission()
 def list_events(guild_id: int, membership):
+    view, err = get_view(SUMMARY)
+    if err:
+        return err
+    etag = etag_for((GUILD_EVENTS, guild_id), GLOBAL_KEY)
+    cached = not_modified(etag)
+    if cached is not None:
+        return cached
     start = request.args.get("start")
     end = request.args.get("end")
     if start and end:
@@ -37,7 +47,7 @@ def list_events(guild_id: int, membership):
         events = event_service.list_events_by_range(guild_id, start_dt, end_dt)
     else:
         events = event_service.list_events(guild_id)
-    return jsonify([e.to_dict() for e in events]), 200
+    return with_etag(jsonify(pick_fields([e.to_dict(view=view) for e in events], get_fields())), etag), 200
 
 
 @bp.post("")
@@ -64,7 +74,10 @@ def get_event(guild_id: int, event_id: int, membership):
     event, err = get_event_or_404(guild_id, event_id)
     if err:
         return err
-    return jsonify(event.to_dict()), 200
+    view, err = get_view(FULL)
+    if err:
+        return err
+    return jsonify(pick_fields(event.to_dict(view=view), get_fields())), 200
 
 
 @bp.put("/<int:event_id>")
@@ -180,9 +193,16 @@ def duplicate_event(guild_id: int, event_id: int, membership):
 @login_required
 def list_all_events():
     """Return events from all guilds the current user belongs to."""
-    from app.services import guild_service
+    from app.services import event_summary_service, guild_service
 
+    view, err = get_view(SUMMARY)
+    if err:
+        return err
     guild_ids = guild_service.get_user_guild_ids(current_user.id)
+    etag = etag_for(GLOBAL_KEY, *((GUILD_EVENTS, gid) for gid in guild_ids))
+    cached = not_modified(etag)
+    if cached is not None:
+        return cached
     start = request.args.get("start")
     end = request.args.get("end")
     include_signups = request.args.get("include_signup_count", "").lower() in ("1", "true")
@@ -192,22 +212,34 @@ def list_all_events():
             end_dt = datetime.fromisoformat(end)
         except ValueError:
             return jsonify({"error": _t("api.events.invalidDate")}), 400
-        events = event_service.list_events_for_guilds_by_range(guild_ids, start_dt, end_dt)
+        events = event_service.list_events_for_guilds_by_range(
+            guild_ids, start_dt, end_dt, include_summary=include_signups,
+        )
     else:
-        events = event_service.list_events_for_guilds(guild_ids)
-    return jsonify([e.to_dict(include_signup_count=include_signups) for e in events]), 200
+        events = event_service.list_events_for_guilds(guild_ids, include_summary=include_signups)
+    summaries = event_summary_service.summaries_for(events) if include_signups else {}
+    return with_etag(jsonify(pick_fields([
+        e.to_dict(include_signup_count=include_signups, summary=summaries.get(e.id), view=view)
+        for e in events
+    ], get_fields())), etag), 200
 
 
 @all_events_bp.get("/my-signups")
 @login_required
 def list_my_signups():
     """Return all signups for the current user across all their guilds."""
-    from app.services import signup_service
+    from app.services import lineup_service, signup_service
 
+    view, err = get_view(FULL)
+    if err:
+        return err
     signups = signup_service.list_user_signups(current_user.id)
+    status_map = lineup_service.build_lineup_status_map(
+        list({s.raid_event_id for s in signups})
+    )
     result = []
     for s in signups:
-        d = s.to_dict()
+        d = s.to_dict(lineup_status_map=status_map, view=view)
         if s.raid_event is not None:
             d["event_title"] = s.raid_event.title
             d["raid_type"] = s.raid_event.raid_type
@@ -215,7 +247,7 @@ def list_my_signups():
             d["event_status"] = s.raid_event.status
             d["starts_at_utc"] = utc_iso(s.raid_event.starts_at_utc)
         result.append(d)
-    return jsonify(result), 200
+    return jsonify(pick_fields(result, get_fields())), 200
 
 
 @all_events_bp.get("/my-replacement-requests")
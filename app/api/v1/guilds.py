@@ -15,6 +15,7 @@ from app.utils.api_helpers import get_json
 from app.utils.decorators import require_guild_permission
 from app.utils.permissions import get_membership, has_permission, can_grant_role, has_any_guild_permission
 from app.utils.realtime import emit_guild_changed, emit_guilds_changed
+from app.utils.serialization import LINEUP
 from app.utils import notify
 from app.i18n import _t
 
@@ -562,6 +563,29 @@ def list_member_characters(guild_id: int, user_id: int, membership):
     return jsonify([c.to_dict() for c in chars]), 200
 
 
+@bp.get("/<int:guild_id>/characters")
+@login_required
+@require_guild_permission("view_member_characters")
+def search_guild_characters(guild_id: int, membership):
+    """Filter guild characters by armory profile.
+
+    Query params: ``level``, ``min_level``, ``faction``, ``profession``,
+    ``min_skill``.  Requires view_member_characters permission.
+    """
+
+    from app.services import character_service
+
+    chars = character_service.search_characters(
+        guild_id,
+        level=request.args.get("level", type=int),
+        min_level=request.args.get("min_level", type=int),
+        faction=request.args.get("faction") or None,
+        profession=request.args.get("profession") or None,
+        min_skill=request.args.get("min_skill", type=int),
+    )
+    return jsonify([c.to_dict(view=LINEUP) for c in chars]), 200
+
+
 # ---------------------------------------------------------------------------
 # Warmane roster
 # ---------------------------------------------------------------------------
@@ -648,29 +672,24 @@ def send_guild_notification_all(guild_id: int, membership):
     if not message:
         return jsonify({"error": _t("api.guilds.messageRequired")}), 400
 
-    from app.services.notification_service import create_notification
-    from app.utils.notify import _push_to_user
+    from app.services.notification_service import create_notifications
+    from app.utils.notify import _push_to_users
 
     members = guild_service.list_members(guild_id)
-    count = 0
-    for m in members:
-        if m.user_id == current_user.id:
-            continue
-        create_notification(
-            user_id=m.user_id,
-            notification_type="admin_message",
-            title=f"📢 Message from admin — {guild.name}",
-            body=message,
-            guild_id=guild.id,
-            title_key="notify.adminMessage.title",
-            body_key="notify.adminMessage.body",
-            title_params={"guildName": guild.name},
-            body_params={"message": message},
-        )
-        _push_to_user(m.user_id)
-        count += 1
+    recipients = create_notifications(
+        [m.user_id for m in members if m.user_id != current_user.id],
+        notification_type="admin_message",
+        title=f"📢 Message from admin — {guild.name}",
+        body=message,
+        guild_id=guild.id,
+        title_key="notify.adminMessage.title",
+        body_key="notify.adminMessage.body",
+        title_params={"guildName": guild.name},
+        body_params={"message": message},
+    )
+    _push_to_users(recipients)
 
-    return jsonify({"message": "ok", "notified": count}), 200
+    return jsonify({"message": "ok", "notified": len(recipients)}), 200
 
 
 # ---------------------------------------------------------------------------
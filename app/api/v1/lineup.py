@@ -6,10 +6,13 @@ from flask import Blueprint, jsonify
 from flask_login import current_user
 
 from app.services import lineup_service
+from app.services.change_counter_service import EVENT, GLOBAL_KEY, GUILD_ROSTER
 from app.utils.auth import login_required
-from app.utils.api_helpers import get_json, get_event_or_404, build_guild_role_map
+from app.utils.api_helpers import get_json, get_event_or_404, get_fields, get_view, build_guild_role_map
+from app.utils.conditional import etag_for, not_modified, with_etag
 from app.utils.decorators import require_guild_permission
 from app.utils.realtime import emit_lineup_changed, emit_signups_changed
+from app.utils.serialization import LINEUP, pick_fields
 from app.utils import notify
 from app.i18n import _t
 
@@ -38,9 +41,21 @@ def get_lineup(guild_id: int, event_id: int, membership):
     event, err = get_event_or_404(guild_id, event_id)
     if err:
         return err
+    view, err = get_view(LINEUP)
+    if err:
+        return err
+    etag = etag_for((EVENT, event_id), (GUILD_ROSTER, guild_id), GLOBAL_KEY)
+    cached = not_modified(etag)
+    if cached is not None:
+        return cached
     role_map = _build_guild_role_map_for_event(guild_id, event_id)
-    grouped = lineup_service.get_lineup_grouped(event_id, guild_role_map=role_map)
-    return jsonify(grouped), 200
+    grouped = lineup_service.get_lineup_grouped(event_id, guild_role_map=role_map, view=view)
+    fields = get_fields()
+    if fields:
+        for key, value in grouped.items():
+            if isinstance(value, list):
+                grouped[key] = pick_fields(value, fields)
+    return with_etag(jsonify(grouped), etag), 200
 
 
 @bp.put("")
@@ -134,6 +149,8 @@ def reorder_bench(guild_id: int, event_id: int, membership):
             new_position=new_pos,
         )
 
-    emit_lineup_changed(event_id)
-    emit_signups_changed(event_id)
+    # Only the queue positions of the moved bench signups changed
+    moved = [signup for signup, _, _ in position_changes]
+    emit_lineup_changed(event_id, signups=moved)
+    emit_signups_changed(event_id, signups=moved)
     return jsonify(result), 200
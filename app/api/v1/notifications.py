@@ -6,7 +6,9 @@ from flask import Blueprint, jsonify, request
 from flask_login import current_user
 
 from app.services import notification_service
+from app.services.change_counter_service import NOTIFICATIONS
 from app.utils.auth import login_required
+from app.utils.conditional import etag_for, not_modified, with_etag
 from app.i18n import _t
 
 bp = Blueprint("notifications", __name__, url_prefix="/notifications")
@@ -46,8 +48,12 @@ def mark_all_read():
 @bp.get("/unread-count")
 @login_required
 def unread_count():
+    etag = etag_for((NOTIFICATIONS, current_user.id))
+    cached = not_modified(etag)
+    if cached is not None:
+        return cached
     count = notification_service.unread_count(current_user.id)
-    return jsonify({"count": count}), 200
+    return with_etag(jsonify({"count": count}), etag), 200
 
 
 @bp.delete("/<int:notification_id>")
@@ -13,9 +13,12 @@ from app.enums import MemberStatus
 from app.extensions import db
 from app.models.guild import GuildMembership
 from app.models.permission import SystemRole, Permission, RolePermission, RoleGrantRule
+from app.services import change_counter_service
 from app.utils.auth import login_required
 from app.utils.api_helpers import get_json
-from app.utils.permissions import get_membership, has_permission, get_user_permissions
+from app.utils.permissions import (
+    get_membership, has_permission, get_user_permissions, invalidate_permission_cache,
+)
 from app.i18n import _t
 
 bp = Blueprint("roles", __name__, url_prefix="/roles")
@@ -176,6 +179,7 @@ def create_role():
             db.session.add(RolePermission(role_id=role.id, permission_id=p.id))
 
     db.session.commit()
+    invalidate_permission_cache()
     # Refresh to load relationships
     db.session.refresh(role)
     return jsonify(role.to_dict()), 201
@@ -228,6 +232,7 @@ def update_role(role_id: int):
         db.session.execute(
             sa.delete(RolePermission).where(RolePermission.role_id == role.id)
         )
+        change_counter_service.touch(change_counter_service.PERMISSIONS, 0)
         # Add new
         if perm_codes:
             perm_query = sa.select(Permission).where(Permission.code.in_(perm_codes))
@@ -239,6 +244,7 @@ def update_role(role_id: int):
                 db.session.add(RolePermission(role_id=role.id, permission_id=p.id))
 
     db.session.commit()
+    invalidate_permission_cache()
     db.session.refresh(role)
     return jsonify(role.to_dict()), 200
 
@@ -259,6 +265,7 @@ def delete_role(role_id: int):
 
     db.session.delete(role)
     db.session.commit()
+    invalidate_permission_cache()
     return jsonify({"message": _t("api.roles.deleted", name=role.name)}), 200
 
 
@@ -340,6 +347,7 @@ def create_grant_rule():
     rule = RoleGrantRule(granter_role_id=granter_id, grantee_role_id=grantee_id)
     db.session.add(rule)
     db.session.commit()
+    invalidate_permission_cache()
     db.session.refresh(rule)
     return jsonify(rule.to_dict()), 201
 
@@ -370,4 +378,5 @@ def delete_grant_rule(rule_id: int):
 
     db.session.delete(rule)
     db.session.commit()
+    invalidate_permission_cache()
     return jsonify({"message": _t("api.roles.grantDeleted")}), 200
@@ -5,12 +5,15 @@ from __future__ import annotations
 from flask import Blueprint, jsonify
 from flask_login import current_user
 
-from app.services import event_service, signup_service
+from app.services import event_service, lineup_service, signup_service
+from app.services.change_counter_service import EVENT, GLOBAL_KEY, GUILD_ROSTER
 from app.utils.auth import login_required
-from app.utils.api_helpers import get_json, get_event_or_404, validate_required, build_guild_role_map
+from app.utils.api_helpers import get_json, get_event_or_404, get_fields, get_view, validate_required, build_guild_role_map
+from app.utils.conditional import etag_for, not_modified, with_etag
 from app.utils.decorators import require_guild_permission
 from app.utils.permissions import has_permission
 from app.utils.realtime import emit_signups_changed, emit_lineup_changed
+from app.utils.serialization import FULL, LINEUP, pick_fields
 from app.utils import notify
 from app.i18n import _t
 
@@ -24,9 +27,21 @@ def list_signups(guild_id: int, event_id: int, membership):
     event, err = get_event_or_404(guild_id, event_id)
     if err:
         return err
-    signups = signup_service.list_signups(event_id)
+    # Full by default: the signup list opens the character detail modal
+    view, err = get_view(FULL)
+    if err:
+        return err
+    etag = etag_for((EVENT, event_id), (GUILD_ROSTER, guild_id), GLOBAL_KEY)
+    cached = not_modified(etag)
+    if cached is not None:
+        return cached
+    signups = signup_service.list_signups(event_id, details=view == FULL)
     role_map = build_guild_role_map(guild_id, [s.user_id for s in signups])
-    return jsonify([s.to_dict(guild_role_map=role_map) for s in signups]), 200
+    status_map = lineup_service.build_lineup_status_map([event_id])
+    return with_etag(jsonify(pick_fields([
+        s.to_dict(guild_role_map=role_map, lineup_status_map=status_map, view=view)
+        for s in signups
+    ], get_fields())), etag), 200
 
 
 @bp.post("")
@@ -73,13 +88,12 @@ def create_signup(guild_id: int, event_id: int, membership):
         }), 409
     except Exception as exc:
         return jsonify({"error": str(exc)}), 400
-    emit_signups_changed(event_id)
-    emit_lineup_changed(event_id)
+    emit_signups_changed(event_id, signups=[signup])
+    emit_lineup_changed(event_id, signups=[signup])
 
     # Notify the signing-up player
     char_name = signup.character.name if signup.character else "Unknown"
     # Determine if the signup went to bench by checking LineupSlots
-    from app.services import lineup_service
     if lineup_service.has_role_slot(signup.id):
         notify.notify_signup_confirmed(signup, event)
     else:
@@ -111,8 +125,8 @@ def update_signup(guild_id: int, event_id: int, signup_id: int, membership):
     data = get_json()
     old_role = signup.chosen_role
     signup = signup_service.update_signup(signup, data)
-    emit_signups_changed(event_id)
-    emit_lineup_changed(event_id)
+    emit_signups_changed(event_id, signups=[signup])
+    emit_lineup_changed(event_id, signups=[signup])
 
     # Notify player if an officer changed their role
     if signup.user_id != current_user.id and event:
@@ -152,8 +166,8 @@ def delete_signup(guild_id: int, event_id: int, signup_id: int, membership):
     ban_reason = data.get("reason")
 
     signup_service.delete_signup(signup)
-    emit_signups_changed(event_id)
-    emit_lineup_changed(event_id)
+    emit_signups_changed(event_id, removed_ids=[signup_id])
+    emit_lineup_changed(event_id, removed_ids=[signup_id])
 
     if event:
         if is_officer_action and permanent:
@@ -198,8 +212,8 @@ def decline_signup(guild_id: int, event_id: int, signup_id: int, membership):
         return jsonify({"error": _t("common.errors.forbidden")}), 403
 
     signup = signup_service.decline_signup(signup)
-    emit_signups_changed(event_id)
-    emit_lineup_changed(event_id)
+    emit_signups_changed(event_id, signups=[signup])
+    emit_lineup_changed(event_id, signups=[signup])
 
     # Notify player if an officer declined them
     if signup.user_id != current_user.id and event:
@@ -254,7 +268,7 @@ def get_signup_user_characters(guild_id: int, event_id: int, signup_id: int, mem
     if signup is None or signup.raid_event_id != event_id:
         return jsonify({"error": _t("api.signups.signupNotFound")}), 404
     chars = signup_service.list_user_characters_for_event(signup.user_id, guild_id)
-    return jsonify([c.to_dict() for c in chars]), 200
+    return jsonify([c.to_dict(view=LINEUP) for c in chars]), 200
 
 
 @bp.post("/<int:signup_id>/replace-request")
@@ -11,18 +11,23 @@ Usage in API routes::
     return jsonify({"error": _t("common.errors.forbidden")}), 403
 
 The locale is determined per-request from ``current_user.language`` or the
-``Accept-Language`` header.
+``Accept-Language`` header, and cached in ``g`` for the rest of the request.
+
+At startup the nested JSON is compiled into one flat catalog keyed by
+``(locale, dotted_key)``.  English fallbacks for keys a locale is missing
+are filled in at compile time, and each string is pre-split into literal
+text and ``{placeholder}`` fields, so a lookup is a single dict access.
 """
 
 from __future__ import annotations
 
 import json
 import os
-from typing import Optional
+from string import Formatter
+from typing import Iterable, Optional
 
-from flask import has_request_context, request
+from flask import g, has_request_context, request
 
-_TRANSLATIONS: dict[str, dict] = {}
 _SUPPORTED_LOCALES = ("en", "pl")
 _DEFAULT_LOCALE = "en"
 _TRANSLATIONS_DIR = os.path.join(
@@ -31,17 +36,78 @@ _TRANSLATIONS_DIR = os.path.join(
 )
 
 
+class _Template:
+    """A translation string pre-parsed for ``{name}`` interpolation."""
+
+    __slots__ = ("text", "_parts", "_simple")
+
+    def __init__(self, text: str) -> None:
+        self.text = text
+        try:
+            parsed = list(Formatter().parse(text))
+        except ValueError:
+            # Unbalanced braces: never interpolated
+            parsed = [(text, None, None, None)]
+        self._parts = [(literal, field) for literal, field, _, _ in parsed]
+        # Plain {name} fields can be joined directly; anything fancier
+        # ({0}, {a.b}, {x:>4}, {x!r}) goes through str.format.
+        self._simple = all(
+            field is None or (field.isidentifier() and not spec and not conv)
+            for _, field, spec, conv in parsed
+        )
+
+    def render(self, params: dict) -> str:
+        if not params or len(self._parts) == 1 and self._parts[0][1] is None:
+            return self.text
+        try:
+            if self._simple:
+                return "".join(
+                    literal + (str(params[field]) if field is not None else "")
+                    for literal, field in self._parts
+                )
+            return self.text.format(**params)
+        except (KeyError, IndexError, ValueError):
+            return self.text  # Return unformatted if placeholders don't match
+
+
+_CATALOG: dict[tuple[str, str], _Template] = {}
+
+
+def _flatten(data: dict, prefix: str = ""):
+    for key, value in data.items():
+        path = f"{prefix}{key}"
+        if isinstance(value, dict):
+            yield from _flatten(value, f"{path}.")
+        elif isinstance(value, str):
+            yield path, value
+
+
 def _load_translations() -> None:
-    """Load all locale JSON files into memory (called once at startup)."""
-    global _TRANSLATIONS
+    """Compile all locale JSON files into the flat catalog (called once at startup)."""
+    flat: dict[str, dict[str, str]] = {}
     for locale in _SUPPORTED_LOCALES:
         path = os.path.join(_TRANSLATIONS_DIR, f"{locale}.json")
+        flat[locale] = {}
         if os.path.isfile(path):
             with open(path, "r", encoding="utf-8") as f:
-                _TRANSLATIONS[locale] = json.load(f)
+                flat[locale] = dict(_flatten(json.load(f)))
+
+    catalog: dict[tuple[str, str], _Template] = {}
+    compiled: dict[str, _Template] = {}
+    fallback = flat.get(_DEFAULT_LOCALE, {})
+    for locale in _SUPPORTED_LOCALES:
+        # Precompute the English fallback for keys this locale lacks
+        for key, text in {**fallback, **flat[locale]}.items():
+            template = compiled.get(text)
+            if template is None:
+                template = compiled[text] = _Template(text)
+            catalog[(locale, key)] = template
 
+    global _CATALOG
+    _CATALOG = catalog
 
-def _get_locale() -> str:
+
+def _resolve_locale() -> str:
     """Determine the locale for the current request."""
     # 1. Authenticated user's preference
     try:
@@ -61,16 +127,48 @@ def _get_locale() -> str:
     return _DEFAULT_LOCALE
 
 
-def _resolve(data: dict, key: str) -> Optional[str]:
-    """Resolve a dotted key path like 'common.errors.forbidden' from a dict."""
-    parts = key.split(".")
-    current = data
-    for part in parts:
-        if isinstance(current, dict) and part in current:
-            current = current[part]
-        else:
+_UNKNOWN = object()
+
+
+def _user_marker():
+    """Identity of the logged-in user (and their language) for the locale cache."""
+    user = g.get("_login_user")
+    try:
+        if user is None or not user.is_authenticated:
             return None
-    return current if isinstance(current, str) else None
+        return (user.get_id(), getattr(user, "language", None))
+    except Exception:
+        # e.g. an expired user object in a session that needs a rollback
+        return _UNKNOWN
+
+
+def _get_locale() -> str:
+    """Return the request's locale, resolving it at most once per request.
+
+    The cached value is keyed on the logged-in user, so a login or a
+    language change mid-request is still picked up.
+    """
+    if not has_request_context():
+        return _resolve_locale()
+    marker = _user_marker()
+    cached = g.get("_i18n_locale")
+    if cached is not None and marker is not _UNKNOWN and cached[0] == marker:
+        return cached[1]
+    locale = _resolve_locale()
+    marker = _user_marker()
+    if marker is not _UNKNOWN:
+        g._i18n_locale = (marker, locale)
+    return locale
+
+
+def translate(locale: str, key: str, **kwargs) -> str:
+    """Translate *key* into an explicit *locale* (English, then the raw key, as fallback)."""
+    if not _CATALOG:
+        _load_translations()
+    template = _CATALOG.get((locale, key)) or _CATALOG.get((_DEFAULT_LOCALE, key))
+    if template is None:
+        return key
+    return template.render(kwargs)
 
 
 def _t(key: str, **kwargs) -> str:
@@ -83,27 +181,28 @@ def _t(key: str, **kwargs) -> str:
 
     Falls back to English, then to the raw key.
     """
-    if not _TRANSLATIONS:
-        _load_translations()
+    return translate(_get_locale(), key, **kwargs)
 
-    locale = _get_locale()
-    # Try requested locale
-    result = _resolve(_TRANSLATIONS.get(locale, {}), key)
-    # Fallback to English
-    if result is None and locale != _DEFAULT_LOCALE:
-        result = _resolve(_TRANSLATIONS.get(_DEFAULT_LOCALE, {}), key)
-    # Fallback to raw key
-    if result is None:
-        return key
 
-    # Interpolate {name} placeholders
-    if kwargs:
-        try:
-            result = result.format(**kwargs)
-        except (KeyError, IndexError):
-            pass  # Return unformatted if placeholders don't match
+def render_many(
+    items: Iterable[tuple[str, Optional[dict]]],
+    locale: Optional[str] = None,
+) -> list[str]:
+    """Render many ``(key, params)`` pairs in one locale.
 
-    return result
+    For bulk work such as generating notification text for a batch of
+    recipients: the locale is resolved once (or passed explicitly) and each
+    item is a single catalog lookup.
+    """
+    if not _CATALOG:
+        _load_translations()
+    locale = locale or _get_locale()
+    catalog = _CATALOG
+    out = []
+    for key, params in items:
+        template = catalog.get((locale, key)) or catalog.get((_DEFAULT_LOCALE, key))
+        out.append(key if template is None else template.render(params or {}))
+    return out
 
 
 def get_supported_locales() -> tuple:
@@ -112,7 +211,7 @@ def get_supported_locales() -> tuple:
 
 
 def init_i18n(app) -> None:
-    """Initialize i18n by loading translations (call from app factory)."""
+    """Initialize i18n by compiling the translation catalog (call from app factory)."""
     _load_translations()
     app.config["SUPPORTED_LOCALES"] = _SUPPORTED_LOCALES
     app.config["DEFAULT_LOCALE"] = _DEFAULT_LOCALE
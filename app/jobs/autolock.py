@@ -0,0 +1,230 @@
+"""Exact-time event auto-lock.
+
+An open event locks when its signups close: at ``close_signups_at``, or
+:data:`FALLBACK_LOCK_BEFORE_START` before the start when no close time is
+set.  Rather than polling, the scheduler leader keeps a min-heap of the
+upcoming lock deadlines and arms one APScheduler date job for the earliest,
+so each lock lands at its deadline.
+
+* The heap is rebuilt from the ``(status, close_signups_at)`` index when
+  the process is elected leader, and dropped when it is demoted.
+* ``event_service.create_event`` / ``update_event`` call
+  :func:`track_event`, so changes made in the leader take effect at once;
+  open events changed in other processes are picked up by :func:`refresh`
+  on every leader heartbeat.
+* Stale entries (an event deleted, locked by hand or rescheduled) are
+  harmless: firing runs :func:`~app.jobs.handlers.auto_lock_upcoming_events`,
+  which locks whatever is due with one set-based UPDATE.
+"""
+
+from __future__ import annotations
+
+import heapq
+import logging
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Iterable
+
+import sqlalchemy as sa
+
+from app.extensions import db
+from app.models.raid import RaidEvent
+
+logger = logging.getLogger(__name__)
+
+LOCK_JOB_ID = "auto_lock_events"
+FALLBACK_LOCK_BEFORE_START = timedelta(hours=4)
+
+# Heartbeat refreshes re-read changes this far back, to absorb clock skew
+# between processes
+_REFRESH_OVERLAP = timedelta(seconds=60)
+_RETRY_DELAY = timedelta(seconds=30)
+
+
+def _utc(dt: datetime) -> datetime:
+    # SQLite hands back naive datetimes
+    return dt if dt.tzinfo is not None else dt.replace(tzinfo=timezone.utc)
+
+
+def lock_deadline(status: str, close_signups_at: datetime | None, starts_at_utc: datetime) -> datetime | None:
+    """Return when an event locks automatically, or None if it never will."""
+    if status != "open":
+        return None
+    if close_signups_at is not None:
+        return _utc(close_signups_at)
+    return _utc(starts_at_utc) - FALLBACK_LOCK_BEFORE_START
+
+
+class LockSchedule:
+    """Min-heap of ``(deadline, event_id)``, one live entry per event.
+
+    Changing or dropping an event's deadline leaves its old heap entry in
+    place; entries that no longer match are skipped when they surface.
+    """
+
+    def __init__(self) -> None:
+        self._heap: list[tuple[datetime, int]] = []
+        self._deadlines: dict[int, datetime] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._deadlines)
+
+    def reset(self, entries: Iterable[tuple[int, datetime]] = ()) -> None:
+        with self._lock:
+            self._deadlines = dict(entries)
+            self._heap = [(deadline, event_id) for event_id, deadline in self._deadlines.items()]
+            heapq.heapify(self._heap)
+
+    def set(self, event_id: int, deadline: datetime | None) -> None:
+        """Set (or with None, drop) the deadline of *event_id*."""
+        with self._lock:
+            if deadline is None:
+                self._deadlines.pop(event_id, None)
+                return
+            if self._deadlines.get(event_id) == deadline:
+                return
+            self._deadlines[event_id] = deadline
+            heapq.heappush(self._heap, (deadline, event_id))
+            if len(self._heap) > 2 * len(self._deadlines) + 64:
+                self._heap = [(d, i) for i, d in self._deadlines.items()]
+                heapq.heapify(self._heap)
+
+    def _drop_stale(self) -> None:
+        heap, deadlines = self._heap, self._deadlines
+        while heap and deadlines.get(heap[0][1]) != heap[0][0]:
+            heapq.heappop(heap)
+
+    def next_deadline(self) -> datetime | None:
+        with self._lock:
+            self._drop_stale()
+            return self._heap[0][0] if self._heap else None
+
+    def pop_due(self, now: datetime) -> list[int]:
+        """Remove and return the events whose deadline is at or before *now*."""
+        due = []
+        with self._lock:
+            self._drop_stale()
+            while self._heap and self._heap[0][0] <= now:
+                _, event_id = heapq.heappop(self._heap)
+                del self._deadlines[event_id]
+                due.append(event_id)
+                self._drop_stale()
+        return due
+
+
+_schedule = LockSchedule()
+_app_ref = None
+_active = False
+_armed_for: datetime | None = None
+_refreshed_at: datetime | None = None
+_arm_lock = threading.Lock()
+
+
+def get_schedule() -> LockSchedule:
+    return _schedule
+
+
+def _load(since: datetime | None = None) -> list[tuple[int, datetime]]:
+    query = sa.select(RaidEvent.id, RaidEvent.status, RaidEvent.close_signups_at, RaidEvent.starts_at_utc).where(
+        RaidEvent.status == "open"
+    )
+    if since is not None:
+        query = query.where(RaidEvent.updated_at >= since)
+    return [(row.id, lock_deadline(row.status, row.close_signups_at, row.starts_at_utc))
+            for row in db.session.execute(query)]
+
+
+def _arm() -> None:
+    """Point the lock job at the earliest deadline (scheduler leader only)."""
+    global _armed_for
+    from app.jobs.scheduler import scheduler
+
+    if not _active or not scheduler.running:
+        return
+    deadline = _schedule.next_deadline()
+    with _arm_lock:
+        if deadline == _armed_for:
+            return
+        _armed_for = deadline
+        if deadline is None:
+            try:
+                scheduler.remove_job(LOCK_JOB_ID)
+            except Exception:
+                pass
+            return
+        # Never skipped as a misfire: a lock that is late still has to happen
+        scheduler.add_job(
+            func=fire,
+            args=[_app_ref],
+            trigger="date",
+            run_date=deadline,
+            id=LOCK_JOB_ID,
+            replace_existing=True,
+            misfire_grace_time=None,
+        )
+
+
+def start(app) -> None:
+    """Rebuild the schedule from the database and arm it (on election)."""
+    global _app_ref, _active, _armed_for, _refreshed_at
+    _app_ref = app
+    _refreshed_at = datetime.now(timezone.utc)
+    _schedule.reset(_load())
+    _active = True
+    _armed_for = None
+    _arm()
+    logger.info("Auto-lock schedule rebuilt with %d open events", len(_schedule))
+
+
+def stop() -> None:
+    """Drop the schedule and its job (on demotion)."""
+    global _active, _armed_for
+    from app.jobs.scheduler import scheduler
+
+    _active = False
+    _armed_for = None
+    _schedule.reset()
+    try:
+        scheduler.remove_job(LOCK_JOB_ID)
+    except Exception:
+        pass
+
+
+def refresh() -> None:
+    """Leader heartbeat: pick up open events changed on other processes."""
+    global _refreshed_at
+    if not _active:
+        return
+    now = datetime.now(timezone.utc)
+    for event_id, deadline in _load(_refreshed_at - _REFRESH_OVERLAP):
+        _schedule.set(event_id, deadline)
+    _refreshed_at = now
+    _arm()
+
+
+def track_event(event: RaidEvent) -> None:
+    """Record *event*'s current lock deadline after it was created or updated."""
+    if not _active:
+        return
+    _schedule.set(event.id, lock_deadline(event.status, event.close_signups_at, event.starts_at_utc))
+    _arm()
+
+
+def fire(app) -> None:
+    """Scheduler job: lock every due event, then arm for the next deadline."""
+    global _armed_for
+    from app.jobs.handlers import auto_lock_upcoming_events
+
+    now = datetime.now(timezone.utc)
+    due = _schedule.pop_due(now)
+    try:
+        auto_lock_upcoming_events(app, now)
+    except Exception:
+        logger.exception("Auto-lock failed; retrying %d events", len(due))
+        for event_id in due:
+            _schedule.set(event_id, now + _RETRY_DELAY)
+    with _arm_lock:
+        # The date job has run; the next one must be added afresh
+        _armed_for = None
+    _arm()
@@ -25,129 +25,135 @@ def register_handler(job_type: str):
 
 @register_handler("send_notification")
 def handle_send_notification(payload: dict) -> None:
-    """Create a Notification record from a queued job payload."""
-    from app.services.notification_service import create_notification
-
-    create_notification(
-        user_id=payload["user_id"],
+    """Create Notification records from a queued job payload.
+
+    The payload carries either a single ``user_id`` or a batched
+    ``user_ids`` list; all rows are inserted in one statement and pushed
+    to the recipients in one Socket.IO emit.
+    """
+    from app.services.notification_service import create_notifications
+    from app.utils.notify import _push_to_users
+
+    user_ids = payload.get("user_ids") or [payload["user_id"]]
+    recipients = create_notifications(
+        user_ids,
         notification_type=payload["type"],
         title=payload["title"],
         body=payload.get("body"),
         guild_id=payload.get("guild_id"),
         raid_event_id=payload.get("raid_event_id"),
+        title_key=payload.get("title_key"),
+        body_key=payload.get("body_key"),
+        title_params=payload.get("title_params"),
+        body_params=payload.get("body_params"),
     )
-
-
-def auto_lock_upcoming_events(app: Flask) -> None:
-    """Auto-lock events that have reached their close_signups_at time,
-    or events starting within 4 hours if no close time is set."""
-    from datetime import datetime, timedelta, timezone as tz
+    # Rows are committed; a failed push must not fail (and re-run) the job
+    try:
+        _push_to_users(recipients)
+    except Exception:
+        logger.exception("Failed to push queued notifications")
+
+
+def auto_lock_upcoming_events(app: Flask, now=None) -> int:
+    """Auto-lock open events whose signups have closed: close_signups_at has
+    been reached, or the event starts within 4 hours if no close time is set.
+
+    Locks are applied with one set-based UPDATE; like a manual lock, each
+    guild gets an ``events_changed`` emit (once per guild, coalesced) and
+    signed-up players are notified.  Run at each deadline by
+    :mod:`app.jobs.autolock`.  Returns the number of events locked.
+    """
+    from datetime import datetime, timezone as tz
 
     import sqlalchemy as sa
 
     from app.extensions import db
+    from app.jobs.autolock import FALLBACK_LOCK_BEFORE_START
     from app.models.raid import RaidEvent
+    from app.services import change_counter_service
+    from app.utils import notify
+    from app.utils.realtime import coalescing, emit_events_changed
 
     with app.app_context():
-        now = datetime.now(tz.utc)
-        fallback_cutoff = now + timedelta(hours=4)
-
-        # Events with a specific close_signups_at that has been reached
-        events_with_close = db.session.execute(
-            sa.select(RaidEvent).where(
-                RaidEvent.status == "open",
-                RaidEvent.close_signups_at.isnot(None),
+        now = now or datetime.now(tz.utc)
+        due = sa.and_(
+            RaidEvent.status == "open",
+            sa.or_(
                 RaidEvent.close_signups_at <= now,
-            )
-        ).scalars().all()
-
-        # Events without close_signups_at, falling back to 4h before start
-        events_without_close = db.session.execute(
-            sa.select(RaidEvent).where(
-                RaidEvent.status == "open",
-                RaidEvent.close_signups_at.is_(None),
-                RaidEvent.starts_at_utc <= fallback_cutoff,
-            )
-        ).scalars().all()
-
-        locked = 0
-        for event in events_with_close + events_without_close:
-            event.status = "locked"
-            event.locked_at = now
-            locked += 1
-        if locked:
-            db.session.commit()
-            logger.info("Auto-locked %d events", locked)
+                sa.and_(
+                    RaidEvent.close_signups_at.is_(None),
+                    RaidEvent.starts_at_utc <= now + FALLBACK_LOCK_BEFORE_START,
+                ),
+            ),
+        )
+        lock = sa.update(RaidEvent).values(status="locked", locked_at=now)
+        if db.engine.dialect.update_returning:
+            events = db.session.execute(lock.where(due).returning(RaidEvent)).scalars().all()
+        else:
+            # No UPDATE ... RETURNING (MySQL): lock the due rows, then update them
+            ids = db.session.execute(sa.select(RaidEvent.id).where(due).with_for_update()).scalars().all()
+            events = []
+            if ids:
+                db.session.execute(
+                    lock.where(RaidEvent.id.in_(ids)).execution_options(synchronize_session="fetch")
+                )
+                events = db.session.execute(
+                    sa.select(RaidEvent).where(RaidEvent.id.in_(ids))
+                ).scalars().all()
+        if not events:
+            db.session.rollback()
+            return 0
+        # The bulk UPDATE bypasses the change-counter flush hook
+        change_counter_service.touch(change_counter_service.EVENT, *(e.id for e in events))
+        change_counter_service.touch(change_counter_service.GUILD_EVENTS, *{e.guild_id for e in events})
+        db.session.commit()
+        logger.info("Auto-locked %d events", len(events))
+
+        # Locks are committed; a failed emit or notification must not undo them
+        try:
+            with coalescing():
+                for guild_id in sorted({e.guild_id for e in events}):
+                    emit_events_changed(guild_id)
+                for event in events:
+                    notify.notify_event_locked(event)
+        except Exception:
+            logger.exception("Failed to announce auto-locked events")
+        return len(events)
 
 
 @register_handler("sync_all_characters")
-def handle_sync_all_characters(payload: dict) -> None:
-    """Sync all active characters from the Warmane armory."""
-    from datetime import datetime, timezone as tz
-
-    from app.extensions import db
-    from app.constants import normalize_spec_name
-    from app.services import character_service, warmane_service
-    from app.services.character_service import _default_role_for_class
-
-    guild_id = payload.get("guild_id")
-    import sqlalchemy as sa
-    from app.models.character import Character
-
-    stmt = sa.select(Character).where(Character.is_active.is_(True))
-    if guild_id:
-        stmt = stmt.where(Character.guild_id == guild_id)
-
-    chars = list(db.session.execute(stmt).scalars().all())
-    synced = 0
-    batch_size = 20
-    for char in chars:
-        try:
-            data = warmane_service.fetch_character(char.realm_name, char.name)
-            if data is None or (isinstance(data, dict) and "error" in data):
-                logger.warning("Skipping sync for %s/%s: no data from Warmane", char.realm_name, char.name)
-                continue
-            char_data = warmane_service.build_character_dict(data, char.realm_name)
-            if char_data.get("class_name"):
-                char.class_name = char_data["class_name"]
-                # Auto-populate default_role if not already set
-                if not char.default_role:
-                    default_role = _default_role_for_class(char_data["class_name"])
-                    if default_role:
-                        char.default_role = default_role
-            char.armory_url = char_data["armory_url"]
-            talents = char_data.get("talents", [])
-            cls_name = char.class_name
-            if talents:
-                char.primary_spec = normalize_spec_name(talents[0].get("tree"), cls_name)
-                if len(talents) > 1:
-                    char.secondary_spec = normalize_spec_name(talents[1].get("tree"), cls_name)
-            meta = char.char_metadata or {}
-            meta["level"] = char_data.get("level")
-            meta["race"] = char_data.get("race")
-            meta["gender"] = char_data.get("gender")
-            meta["faction"] = char_data.get("faction")
-            meta["guild"] = char_data.get("guild")
-            meta["achievement_points"] = char_data.get("achievement_points")
-            meta["honorable_kills"] = char_data.get("honorable_kills")
-            meta["professions"] = char_data.get("professions", [])
-            meta["talents"] = char_data.get("talents", [])
-            meta["equipment"] = char_data.get("equipment", [])
-            meta["last_synced"] = datetime.now(tz.utc).isoformat()
-            char.char_metadata = meta
-            synced += 1
-            # Commit in batches to avoid accumulating dirty objects
-            if synced % batch_size == 0:
-                db.session.commit()
-        except Exception as exc:
-            logger.warning("Failed to sync character %s: %s", char.name, exc)
-    db.session.commit()
-    logger.info("Synced %d/%d characters", synced, len(chars))
+def handle_sync_all_characters(payload: dict) -> dict:
+    """Sync active characters from the Warmane armory.
+
+    Fetches run in parallel; see :mod:`app.services.armory_sync_service`.
+    With ``incremental`` in the payload only due characters are synced,
+    within the per-tick budget.  Run as a queued job, progress is recorded
+    and streamed by :class:`~app.services.sync_job_service.SyncProgress`.
+    Returns the run's metrics.
+    """
+    from app.jobs.worker import current_job_id
+    from app.services import armory_sync_service, sync_job_service
+
+    job_id = current_job_id()
+    tracker = sync_job_service.SyncProgress(job_id, payload.get("guild_id")) if job_id else None
+    try:
+        stats = armory_sync_service.sync_characters(
+            guild_id=payload.get("guild_id"),
+            incremental=bool(payload.get("incremental")),
+            progress=tracker,
+        )
+    except Exception as exc:
+        if tracker is not None:
+            tracker.fail(exc)
+        raise
+    if tracker is not None:
+        tracker.finish(stats)
+    return stats.to_dict()
 
 
 def process_job_queue(app: Flask) -> None:
-    """Entry point called by the scheduler to drain queued jobs."""
-    from app.jobs.worker import claim_next_job, complete_job, fail_job
+    """Drain queued jobs synchronously (one batch, in the caller's thread)."""
+    from app.jobs.worker import claim_next_job, run_job
 
     max_batch = 50  # prevent unbounded loop from blocking the DB
 
@@ -157,16 +163,5 @@ def process_job_queue(app: Flask) -> None:
             job = claim_next_job()
             if job is None:
                 break
-            handler = _HANDLERS.get(job.type)
-            if handler is None:
-                fail_job(job, f"No handler registered for job type: {job.type!r}")
-                logger.warning("No handler for job type %r (id=%s)", job.type, job.id)
-                continue
-            try:
-                handler(job.payload)
-                complete_job(job)
-                logger.debug("Completed job %s (type=%r)", job.id, job.type)
-            except Exception as exc:
-                fail_job(job, str(exc))
-                logger.exception("Job %s (type=%r) failed: %s", job.id, job.type, exc)
+            run_job(job)
             processed += 1
@@ -0,0 +1,180 @@
+"""Leader lease: pick the one process that runs the periodic scheduler jobs.
+
+Every web process runs a :class:`LeaderElector`.  Each heartbeat it tries to
+take or renew the ``scheduler`` row in ``scheduler_leases``: the UPDATE only
+succeeds for the current holder or once the lease has expired, and the
+first INSERT wins a race on the primary key, so at most one process holds
+the lease at a time.  The holder resumes the APScheduler jobs; everyone
+else keeps them paused.  When the leader dies its lease expires after
+``SCHEDULER_LEASE_SECONDS`` and the next heartbeat elsewhere takes over.
+
+A leader that cannot renew (database error, lost race after a stall)
+steps down immediately, before its lease could be taken over.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import socket
+import threading
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Callable
+
+import sqlalchemy as sa
+
+from app.extensions import db
+from app.models.scheduler_lease import SchedulerLease
+
+logger = logging.getLogger(__name__)
+
+SCHEDULER_LEASE = "scheduler"
+
+
+def holder_id() -> str:
+    """Return a holder name unique to this process (host, pid, random)."""
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+
+def try_acquire(name: str, holder: str, ttl: float) -> bool:
+    """Take or renew lease *name* for *holder*; return True if it is held."""
+    now = datetime.now(timezone.utc)
+    expires = now + timedelta(seconds=ttl)
+    renewed = db.session.execute(
+        sa.update(SchedulerLease)
+        .where(
+            SchedulerLease.name == name,
+            sa.or_(SchedulerLease.holder == holder, SchedulerLease.expires_at < now),
+        )
+        .values(
+            holder=holder,
+            heartbeat_at=now,
+            expires_at=expires,
+            acquired_at=sa.case((SchedulerLease.holder == holder, SchedulerLease.acquired_at), else_=now),
+        )
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    if renewed:
+        db.session.commit()
+        return True
+    try:
+        db.session.add(SchedulerLease(
+            name=name, holder=holder, acquired_at=now, heartbeat_at=now, expires_at=expires,
+        ))
+        db.session.commit()
+        return True
+    except sa.exc.IntegrityError:
+        # Held by someone else
+        db.session.rollback()
+        return False
+
+
+def release(name: str, holder: str) -> None:
+    """Give up lease *name* if *holder* has it, so another process can take over now."""
+    db.session.execute(
+        sa.delete(SchedulerLease)
+        .where(SchedulerLease.name == name, SchedulerLease.holder == holder)
+        .execution_options(synchronize_session=False)
+    )
+    db.session.commit()
+
+
+def current_holder(name: str) -> str | None:
+    """Return the holder of an unexpired lease *name*, or None."""
+    return db.session.execute(
+        sa.select(SchedulerLease.holder).where(
+            SchedulerLease.name == name,
+            SchedulerLease.expires_at >= datetime.now(timezone.utc),
+        )
+    ).scalar()
+
+
+class LeaderElector:
+    """Heartbeat loop that keeps this process's leadership state current.
+
+    *on_elected* runs when the lease is won, *on_demoted* when it is lost or
+    released, and *on_heartbeat* after every renewal while leading.
+    """
+
+    def __init__(
+        self,
+        app,
+        name: str = SCHEDULER_LEASE,
+        ttl: float = 15.0,
+        heartbeat: float = 5.0,
+        on_elected: Callable[[], None] | None = None,
+        on_demoted: Callable[[], None] | None = None,
+        on_heartbeat: Callable[[], None] | None = None,
+    ) -> None:
+        self.app = app
+        self.name = name
+        self.ttl = ttl
+        self.heartbeat = min(heartbeat, ttl / 2)
+        self.holder = holder_id()
+        self.on_elected = on_elected
+        self.on_demoted = on_demoted
+        self.on_heartbeat = on_heartbeat
+        self.is_leader = False
+        self._stopping = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    @classmethod
+    def from_config(cls, app, **callbacks) -> LeaderElector:
+        return cls(
+            app,
+            ttl=app.config.get("SCHEDULER_LEASE_SECONDS", 15),
+            heartbeat=app.config.get("SCHEDULER_HEARTBEAT_SECONDS", 5),
+            **callbacks,
+        )
+
+    def _set_leader(self, leader: bool) -> None:
+        if leader == self.is_leader:
+            return
+        self.is_leader = leader
+        callback = self.on_elected if leader else self.on_demoted
+        logger.info("Scheduler lease %s by %s", "acquired" if leader else "lost", self.holder)
+        if callback is not None:
+            callback()
+
+    def step(self) -> bool:
+        """Run one heartbeat; return whether this process now leads."""
+        with self.app.app_context():
+            try:
+                held = try_acquire(self.name, self.holder, self.ttl)
+            except Exception:
+                logger.exception("Scheduler lease heartbeat failed")
+                db.session.rollback()
+                held = False
+            self._set_leader(held)
+            if held and self.on_heartbeat is not None:
+                try:
+                    self.on_heartbeat()
+                except Exception:
+                    logger.exception("Scheduler leader heartbeat hook failed")
+        return held
+
+    def run_forever(self) -> None:
+        while not self._stopping.is_set():
+            self.step()
+            self._stopping.wait(self.heartbeat)
+
+    def start(self) -> None:
+        """Run the heartbeat loop in a background daemon thread."""
+        self._thread = threading.Thread(
+            target=self.run_forever, name="scheduler-leader", daemon=True,
+        )
+        self._thread.start()
+
+    def stop(self, wait: bool = True) -> None:
+        """Stop heartbeating and release the lease if held."""
+        self._stopping.set()
+        if wait and self._thread is not None:
+            self._thread.join()
+        if self.is_leader:
+            with self.app.app_context():
+                try:
+                    release(self.name, self.holder)
+                except Exception:
+                    logger.exception("Failed to release the scheduler lease")
+            self._set_leader(False)
@@ -1,10 +1,22 @@
-"""APScheduler setup."""
+"""APScheduler setup.
+
+Every server process registers the periodic jobs but keeps the scheduler
+paused; only the process holding the leader lease (:mod:`app.jobs.leader`)
+resumes it, so each job runs once however many workers are up.  The leader
+also keeps the event auto-lock schedule (:mod:`app.jobs.autolock`).  The
+job queue worker is not periodic and runs in every server process.
+"""
 
 from __future__ import annotations
 
+import atexit
+import logging
+
 from apscheduler.schedulers.background import BackgroundScheduler
 from apscheduler.jobstores.memory import MemoryJobStore
 
+logger = logging.getLogger(__name__)
+
 scheduler = BackgroundScheduler(
     jobstores={"default": MemoryJobStore()},
     job_defaults={"coalesce": True, "max_instances": 1},
@@ -16,6 +28,8 @@ _DEFAULT_AUTOSYNC = {
 }
 
 _app_ref = None
+_elector = None
+_applied_autosync: dict | None = None
 
 
 def _load_autosync_config() -> dict:
@@ -47,11 +61,13 @@ def _run_autosync(app) -> None:
     from app.jobs.handlers import handle_sync_all_characters
 
     with app.app_context():
-        handle_sync_all_characters({})
+        handle_sync_all_characters({"incremental": True})
 
 
 def _apply_autosync_schedule(config: dict) -> None:
     """Add or remove the auto-sync job based on config."""
+    global _applied_autosync
+    _applied_autosync = dict(config)
     job_id = "autosync_characters"
     try:
         scheduler.remove_job(job_id)
@@ -69,40 +85,83 @@ def _apply_autosync_schedule(config: dict) -> None:
         )
 
 
+def _refresh_autosync_schedule() -> None:
+    """Leader heartbeat: pick up autosync settings saved on another process."""
+    config = _load_autosync_config()
+    if config != _applied_autosync:
+        _apply_autosync_schedule(config)
+
+
+def _on_elected() -> None:
+    from app.jobs import autolock
+
+    _refresh_autosync_schedule()
+    try:
+        autolock.start(_app_ref)
+    except Exception:
+        logger.exception("Failed to build the auto-lock schedule")
+    scheduler.resume()
+
+
+def _on_demoted() -> None:
+    from app.jobs import autolock
+
+    scheduler.pause()
+    autolock.stop()
+
+
+def _on_heartbeat() -> None:
+    from app.jobs import autolock
+
+    _refresh_autosync_schedule()
+    autolock.refresh()
+
+
 def init_scheduler(app) -> None:
-    """Register jobs and start the scheduler (only when enabled in config)."""
-    global _app_ref
+    """Register jobs, start the job worker and join the scheduler leader election.
+
+    The scheduler starts paused and only runs while this process holds the
+    leader lease.
+    """
+    global _app_ref, _elector
     _app_ref = app
 
     if not app.config.get("SCHEDULER_ENABLED", True):
         return
 
-    from app.jobs.handlers import process_job_queue, auto_lock_upcoming_events
+    from app.jobs.leader import LeaderElector
+    from app.jobs.worker import start_background_worker
 
     scheduler.configure(timezone=app.config.get("SCHEDULER_TIMEZONE", "UTC"))
 
-    # Poll the job queue every 30 seconds
-    scheduler.add_job(
-        func=process_job_queue,
-        args=[app],
-        trigger="interval",
-        seconds=30,
-        id="process_job_queue",
-        replace_existing=True,
-    )
-
-    # Auto-lock events starting within 4 hours (runs every 5 minutes)
-    scheduler.add_job(
-        func=auto_lock_upcoming_events,
-        args=[app],
-        trigger="interval",
-        minutes=5,
-        id="auto_lock_upcoming_events",
-        replace_existing=True,
-    )
+    # Consume the job queue in-process; wakes immediately on enqueue
+    start_background_worker(app)
 
     # Apply auto-sync schedule if enabled
     autosync_config = _load_autosync_config()
     _apply_autosync_schedule(autosync_config)
 
-    scheduler.start()
+    scheduler.start(paused=True)
+    _elector = LeaderElector.from_config(
+        app,
+        on_elected=_on_elected,
+        on_demoted=_on_demoted,
+        on_heartbeat=_on_heartbeat,
+    )
+    _elector.start()
+    atexit.register(shutdown_scheduler)
+
+
+def is_scheduler_leader() -> bool:
+    """Return True if this process currently runs the periodic jobs."""
+    return _elector is not None and _elector.is_leader
+
+
+def shutdown_scheduler() -> None:
+    """Stop the scheduler and hand the leader lease to another process."""
+    global _elector
+    if _elector is not None:
+        _elector.stop()
+        _elector = None
+    if scheduler.running:
+        scheduler.shutdown(wait=False)
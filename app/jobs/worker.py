@@ -1,45 +1,433 @@
-"""Job queue worker: claim and execute pending jobs."""
+"""Job queue worker: enqueue, claim and execute pending jobs.
+
+:class:`JobWorker` is the long-running consumer.  A dispatcher loop claims
+queued jobs and runs their handlers on a pool of threads (greenlets when
+gevent has monkey-patched ``threading``), honouring per-job-type
+concurrency limits.  The dispatcher wakes as soon as a job is enqueued in
+the same process and otherwise polls every ``poll_interval`` seconds, which
+also picks up jobs enqueued by other processes.
+
+Several workers (threads or processes) can share one queue: jobs are
+claimed atomically in batches, each claim is a lease that the owning
+worker renews while the handler runs, and RUNNING jobs whose lease has
+expired (crashed worker) are re-queued.  A claim is identified by the
+job's ``attempts`` value, which every claim bumps: once a stalled worker's
+job has been re-queued and claimed again, that worker's renewals and its
+final result match no row and are discarded.  Failed attempts are retried with
+exponential backoff through ``available_at`` up to ``JOB_MAX_ATTEMPTS``.
+
+The web process runs one worker in the background (started by the
+scheduler); ``flask worker`` runs one in the foreground.
+"""
 
 from __future__ import annotations
 
-from datetime import datetime, timezone
+import logging
+import threading
+import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import ContextVar
+from datetime import datetime, timedelta, timezone
+from typing import Collection, Mapping
+
+from flask import current_app
 
 import sqlalchemy as sa
 
 from app.enums import JobStatus
 from app.extensions import db
 from app.models.notification import JobQueue
+from app.utils import realtime
 
+logger = logging.getLogger(__name__)
 
-def claim_next_job() -> JobQueue | None:
-    """Atomically claim the next queued job that is available."""
+# Live workers in this process, woken by enqueue_job()
+_workers: weakref.WeakSet[JobWorker] = weakref.WeakSet()
+_background_worker: JobWorker | None = None
+# ID of the job whose handler is running in this context
+_current_job_id: ContextVar[int | None] = ContextVar("current_job_id", default=None)
+
+
+def current_job_id() -> int | None:
+    """Return the ID of the job being handled, or None outside a job handler."""
+    return _current_job_id.get()
+
+
+def enqueue_job(
+    job_type: str, payload: dict, available_at: datetime | None = None,
+) -> JobQueue:
+    """Add a job to the queue, commit it and wake local workers."""
+    job = JobQueue(type=job_type, status=JobStatus.QUEUED.value)
+    job.payload = payload
+    if available_at is not None:
+        job.available_at = available_at
+    db.session.add(job)
+    db.session.commit()
+    wake_workers()
+    return job
+
+
+def wake_workers() -> None:
+    """Wake every job worker running in this process."""
+    for worker in list(_workers):
+        worker.wake()
+
+
+def claim_jobs(limit: int = 1, exclude_types: Collection[str] = ()) -> list[JobQueue]:
+    """Atomically claim up to *limit* available jobs in one round trip.
+
+    Uses ``UPDATE … WHERE id IN (SELECT … FOR UPDATE SKIP LOCKED) RETURNING``
+    where the database supports it (PostgreSQL, SQLite ≥ 3.35), so
+    concurrent workers never claim the same job.  Other databases fall back
+    to a conditional per-row UPDATE that only succeeds for the worker that
+    flips the row out of QUEUED.  Job types listed in *exclude_types* (e.g.
+    those at their concurrency limit) are skipped.
+    """
     now = datetime.now(timezone.utc)
-    job = db.session.execute(
-        sa.select(JobQueue)
+    candidates = (
+        sa.select(JobQueue.id)
         .where(
             JobQueue.status == JobStatus.QUEUED.value,
             JobQueue.available_at <= now,
         )
-        .order_by(JobQueue.available_at.asc())
-        .limit(1)
-    ).scalar_one_or_none()
+        .order_by(JobQueue.available_at.asc(), JobQueue.id.asc())
+        .limit(limit)
+    )
+    if exclude_types:
+        candidates = candidates.where(JobQueue.type.notin_(list(exclude_types)))
+    claim = (
+        sa.update(JobQueue)
+        .where(JobQueue.status == JobStatus.QUEUED.value)
+        .values(
+            status=JobStatus.RUNNING.value,
+            locked_at=now,
+            attempts=JobQueue.attempts + 1,
+            updated_at=now,
+        )
+        .execution_options(synchronize_session=False)
+    )
+
+    if db.engine.dialect.update_returning:
+        candidates = candidates.with_for_update(skip_locked=True)
+        ids = list(db.session.execute(
+            claim.where(JobQueue.id.in_(candidates.scalar_subquery())).returning(JobQueue.id)
+        ).scalars().all())
+    else:
+        ids = []
+        for job_id in db.session.execute(candidates).scalars().all():
+            if db.session.execute(claim.where(JobQueue.id == job_id)).rowcount == 1:
+                ids.append(job_id)
+    db.session.commit()
+
+    if not ids:
+        return []
+    return list(db.session.execute(
+        sa.select(JobQueue)
+        .where(JobQueue.id.in_(ids))
+        .order_by(JobQueue.available_at.asc(), JobQueue.id.asc())
+        .execution_options(populate_existing=True)
+    ).scalars().all())
+
+
+def claim_next_job(exclude_types: Collection[str] = ()) -> JobQueue | None:
+    """Atomically claim the next queued job that is available."""
+    jobs = claim_jobs(1, exclude_types)
+    return jobs[0] if jobs else None
 
-    if job is None:
-        return None
 
-    job.status = JobStatus.RUNNING.value
-    job.locked_at = now
-    job.attempts += 1
+def _held(job_id: int, attempt: int):
+    """Match job *job_id* only while claim number *attempt* still holds it."""
+    return sa.and_(
+        JobQueue.id == job_id,
+        JobQueue.status == JobStatus.RUNNING.value,
+        JobQueue.attempts == attempt,
+    )
+
+
+def _finish(job: JobQueue, attempt: int, **values) -> bool:
+    updated = db.session.execute(
+        sa.update(JobQueue)
+        .where(_held(job.id, attempt))
+        .values(locked_at=None, **values)
+        .execution_options(synchronize_session=False)
+    ).rowcount
     db.session.commit()
-    return job
+    if not updated:
+        logger.warning("Lease on job %s (attempt %d) was lost; result discarded", job.id, attempt)
+    return bool(updated)
+
+
+def complete_job(job: JobQueue, attempt: int | None = None) -> bool:
+    """Mark the job DONE if claim *attempt* (default: the current one) still holds it."""
+    if attempt is None:
+        attempt = job.attempts
+    return _finish(job, attempt, status=JobStatus.DONE.value)
+
+
+def retry_delay(attempts: int) -> timedelta:
+    """Exponential backoff before attempt ``attempts + 1``."""
+    base = current_app.config.get("JOB_RETRY_BASE_SECONDS", 10)
+    cap = current_app.config.get("JOB_RETRY_MAX_SECONDS", 3600)
+    return timedelta(seconds=min(base * 2 ** max(attempts - 1, 0), cap))
+
 
+def fail_job(job: JobQueue, error: str, retry: bool = True, attempt: int | None = None) -> bool:
+    """Record a failed attempt.
 
-def complete_job(job: JobQueue) -> None:
-    job.status = JobStatus.DONE.value
+    The job is re-queued with exponential backoff (via ``available_at``)
+    until it has used ``JOB_MAX_ATTEMPTS`` attempts, then marked FAILED.
+    Pass ``retry=False`` for errors that cannot succeed on a retry.  Like
+    :func:`complete_job`, nothing is recorded once claim *attempt* has lost
+    its lease.
+    """
+    if attempt is None:
+        attempt = job.attempts
+    max_attempts = current_app.config.get("JOB_MAX_ATTEMPTS", 5)
+    if retry and attempt < max_attempts:
+        return _finish(
+            job, attempt, last_error=error, status=JobStatus.QUEUED.value,
+            available_at=datetime.now(timezone.utc) + retry_delay(attempt),
+        )
+    return _finish(job, attempt, last_error=error, status=JobStatus.FAILED.value)
+
+
+def renew_leases(leases: Mapping[int, int]) -> None:
+    """Extend the leases this worker still holds (job ID -> claim attempt)."""
+    if not leases:
+        return
+    db.session.execute(
+        sa.update(JobQueue)
+        .where(
+            sa.tuple_(JobQueue.id, JobQueue.attempts).in_(list(leases.items())),
+            JobQueue.status == JobStatus.RUNNING.value,
+        )
+        .values(locked_at=datetime.now(timezone.utc))
+        .execution_options(synchronize_session=False)
+    )
     db.session.commit()
 
 
-def fail_job(job: JobQueue, error: str) -> None:
-    job.status = JobStatus.FAILED.value
-    job.last_error = error
+def requeue_stale_jobs() -> int:
+    """Recover RUNNING jobs whose lease expired (e.g. their worker crashed).
+
+    Jobs with attempts left go back to QUEUED; the rest are marked FAILED.
+    Returns the number of jobs recovered.
+    """
+    now = datetime.now(timezone.utc)
+    cutoff = now - timedelta(seconds=current_app.config.get("JOB_LEASE_SECONDS", 300))
+    max_attempts = current_app.config.get("JOB_MAX_ATTEMPTS", 5)
+    stale = sa.and_(
+        JobQueue.status == JobStatus.RUNNING.value,
+        JobQueue.locked_at < cutoff,
+    )
+    requeued = db.session.execute(
+        sa.update(JobQueue)
+        .where(stale, JobQueue.attempts < max_attempts)
+        .values(
+            status=JobStatus.QUEUED.value,
+            locked_at=None,
+            available_at=now,
+            last_error="Lease expired",
+        )
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    failed = db.session.execute(
+        sa.update(JobQueue)
+        .where(stale)
+        .values(status=JobStatus.FAILED.value, locked_at=None, last_error="Lease expired")
+        .execution_options(synchronize_session=False)
+    ).rowcount
     db.session.commit()
+    if requeued or failed:
+        logger.warning("Recovered stale jobs: %d re-queued, %d failed", requeued, failed)
+    return requeued + failed
+
+
+def run_job(job: JobQueue) -> None:
+    """Execute a claimed job with its registered handler and record the outcome."""
+    from app.jobs.handlers import _HANDLERS
+
+    # The claim this run holds; the row may be re-claimed while it runs
+    attempt = job.attempts
+    handler = _HANDLERS.get(job.type)
+    if handler is None:
+        fail_job(job, f"No handler registered for job type: {job.type!r}", retry=False, attempt=attempt)
+        logger.warning("No handler for job type %r (id=%s)", job.type, job.id)
+        return
+    token = _current_job_id.set(job.id)
+    try:
+        # Realtime emits of one job go out once, after it succeeds
+        with realtime.coalescing():
+            handler(job.payload)
+        complete_job(job, attempt)
+        logger.debug("Completed job %s (type=%r)", job.id, job.type)
+    except Exception as exc:
+        # Discard the handler's partial work before recording the failure
+        db.session.rollback()
+        fail_job(job, str(exc), attempt=attempt)
+        logger.exception("Job %s (type=%r) failed: %s", job.id, job.type, exc)
+    finally:
+        _current_job_id.reset(token)
+
+
+# ---------------------------------------------------------------------------
+# Long-running worker
+# ---------------------------------------------------------------------------
+
+class JobWorker:
+    """Event-driven job consumer with a bounded handler pool."""
+
+    def __init__(
+        self,
+        app,
+        pool_size: int = 4,
+        poll_interval: float = 5.0,
+        concurrency: dict[str, int] | None = None,
+    ) -> None:
+        self.app = app
+        self.pool_size = max(1, pool_size)
+        self.poll_interval = poll_interval
+        self.concurrency = dict(concurrency or {})
+        self._wakeup = threading.Event()
+        self._stopping = threading.Event()
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._running: dict[str, int] = {}
+        # Job ID -> claim attempt of the jobs this worker is running
+        self._leases: dict[int, int] = {}
+        self._last_maintenance = float("-inf")
+        self._executor: ThreadPoolExecutor | None = None
+        self._thread: threading.Thread | None = None
+
+    @classmethod
+    def from_config(cls, app) -> JobWorker:
+        return cls(
+            app,
+            pool_size=app.config.get("JOB_WORKER_POOL_SIZE", 4),
+            poll_interval=app.config.get("JOB_WORKER_POLL_SECONDS", 5.0),
+            concurrency=app.config.get("JOB_WORKER_CONCURRENCY"),
+        )
+
+    def wake(self) -> None:
+        self._wakeup.set()
+
+    def _claim_plan(self) -> tuple[int, set[str]]:
+        """Return (batch size, saturated types) for the next claim.
+
+        The batch never exceeds the free pool slots nor the remaining
+        headroom of any limited type, so one claim cannot overshoot a
+        per-type limit.
+        """
+        with self._lock:
+            batch = self.pool_size - self._in_flight
+            saturated = set()
+            for job_type, limit in self.concurrency.items():
+                headroom = limit - self._running.get(job_type, 0)
+                if headroom <= 0:
+                    saturated.add(job_type)
+                else:
+                    batch = min(batch, headroom)
+        return batch, saturated
+
+    def drain(self) -> int:
+        """Dispatch jobs until the pool is full or nothing is claimable."""
+        dispatched = 0
+        with self.app.app_context():
+            while not self._stopping.is_set():
+                batch, saturated = self._claim_plan()
+                if batch <= 0:
+                    break
+                jobs = claim_jobs(batch, exclude_types=saturated)
+                for job in jobs:
+                    with self._lock:
+                        self._in_flight += 1
+                        self._running[job.type] = self._running.get(job.type, 0) + 1
+                        self._leases[job.id] = job.attempts
+                    self._executor.submit(self._execute, job.id, job.type, job.attempts)
+                dispatched += len(jobs)
+                if len(jobs) < batch:
+                    break
+        return dispatched
+
+    def maintain(self) -> None:
+        """Renew leases of in-flight jobs and recover other workers' stale ones."""
+        now = time.monotonic()
+        if now - self._last_maintenance < self.poll_interval:
+            return
+        self._last_maintenance = now
+        with self._lock:
+            leases = dict(self._leases)
+        with self.app.app_context():
+            renew_leases(leases)
+            requeue_stale_jobs()
+
+    def _execute(self, job_id: int, job_type: str, attempt: int) -> None:
+        try:
+            with self.app.app_context():
+                job = db.session.get(JobQueue, job_id)
+                # Skip a claim that lost its lease before it got a thread
+                if job is not None and job.status == JobStatus.RUNNING.value and job.attempts == attempt:
+                    run_job(job)
+        except Exception:
+            logger.exception("Job %s (type=%r) crashed the worker task", job_id, job_type)
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+                self._running[job_type] -= 1
+                self._leases.pop(job_id, None)
+            # A slot is free again: let the dispatcher claim more
+            self._wakeup.set()
+
+    def run_forever(self) -> None:
+        """Consume jobs until :meth:`stop` is called."""
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.pool_size, thread_name_prefix="job-worker",
+        )
+        _workers.add(self)
+        logger.info(
+            "Job worker started (pool=%d, poll=%ss, limits=%s)",
+            self.pool_size, self.poll_interval, self.concurrency or "none",
+        )
+        try:
+            while not self._stopping.is_set():
+                self._wakeup.clear()
+                try:
+                    self.maintain()
+                    self.drain()
+                except Exception:
+                    logger.exception("Job dispatch failed")
+                self._wakeup.wait(self.poll_interval)
+        finally:
+            _workers.discard(self)
+            self._executor.shutdown(wait=True)
+            logger.info("Job worker stopped")
+
+    def start(self) -> None:
+        """Run the worker in a background daemon thread."""
+        self._thread = threading.Thread(
+            target=self.run_forever, name="job-worker-dispatcher", daemon=True,
+        )
+        self._thread.start()
+
+    def stop(self, wait: bool = True) -> None:
+        self._stopping.set()
+        self._wakeup.set()
+        if wait and self._thread is not None:
+            self._thread.join()
+
+
+def start_background_worker(app) -> JobWorker:
+    """Start the in-process worker used by the web server."""
+    global _background_worker
+    if _background_worker is None:
+        _background_worker = JobWorker.from_config(app)
+        _background_worker.start()
+    return _background_worker
+
+
+def stop_background_worker() -> None:
+    global _background_worker
+    if _background_worker is not None:
+        _background_worker.stop()
+        _background_worker = None
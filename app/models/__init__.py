@@ -2,31 +2,40 @@
 
 from app.models.user import User
 from app.models.guild import Guild, GuildMembership
-from app.models.character import Character
-from app.models.raid import RaidDefinition, RaidTemplate, EventSeries, RaidEvent
+from app.models.character import Character, CharacterProfession, CharacterProfile, CharacterSyncState
+from app.models.raid import RaidDefinition, RaidTemplate, EventSeries, RaidEvent, EventSummary
 from app.models.signup import Signup, LineupSlot, RaidBan
 from app.models.attendance import AttendanceRecord
-from app.models.notification import Notification, JobQueue
+from app.models.notification import Notification, JobQueue, JobProgress
 from app.models.permission import SystemRole, Permission, RolePermission, RoleGrantRule
 from app.models.system_setting import SystemSetting
 from app.models.armory_config import ArmoryConfig
 from app.models.guild_feature import GuildFeature
+from app.models.change_counter import ChangeCounter
+from app.models.realtime_message import RealtimeMessage
+from app.models.scheduler_lease import SchedulerLease
+from app.models.rate_limit import RateLimitBucket
 
 __all__ = [
     "User",
     "Guild",
     "GuildMembership",
     "Character",
+    "CharacterSyncState",
+    "CharacterProfile",
+    "CharacterProfession",
     "RaidDefinition",
     "RaidTemplate",
     "EventSeries",
     "RaidEvent",
+    "EventSummary",
     "Signup",
     "LineupSlot",
     "RaidBan",
     "AttendanceRecord",
     "Notification",
     "JobQueue",
+    "JobProgress",
     "SystemRole",
     "Permission",
     "RolePermission",
@@ -34,4 +43,8 @@ __all__ = [
     "SystemSetting",
     "ArmoryConfig",
     "GuildFeature",
+    "ChangeCounter",
+    "RealtimeMessage",
+    "SchedulerLease",
+    "RateLimitBucket",
 ]
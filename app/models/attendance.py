@@ -9,6 +9,7 @@ from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.enums import AttendanceOutcome
 from app.utils.dt import utc_iso
+from app.utils.serialization import LINEUP
 from app.extensions import db
 
 
@@ -56,7 +57,7 @@ class AttendanceRecord(db.Model):
             "recorded_at": utc_iso(self.recorded_at),
         }
         if self.character is not None:
-            result["character"] = self.character.to_dict()
+            result["character"] = self.character.to_dict(view=LINEUP)
         return result
 
     def __repr__(self) -> str:
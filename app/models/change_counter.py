@@ -0,0 +1,25 @@
+"""ChangeCounter model: monotonically increasing version per cached scope."""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.extensions import db
+
+
+class ChangeCounter(db.Model):
+    """Version number bumped whenever data behind a read endpoint changes.
+
+    Maintained by :mod:`app.services.change_counter_service`; the HTTP layer
+    turns the versions into weak ETags for conditional GETs.
+    """
+
+    __tablename__ = "change_counters"
+
+    scope: Mapped[str] = mapped_column(sa.String(32), primary_key=True)
+    scope_id: Mapped[int] = mapped_column(sa.Integer, primary_key=True)
+    version: Mapped[int] = mapped_column(sa.Integer, nullable=False, default=0)
+
+    def __repr__(self) -> str:
+        return f"<ChangeCounter {self.scope}:{self.scope_id} v{self.version}>"
@@ -9,11 +9,44 @@ import sqlalchemy as sa
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.utils.dt import utc_iso
+from app.utils.serialization import FULL, SUMMARY
 
 from app.enums import Role, WowClass
 from app.extensions import db
 
 
+def _as_int(value) -> int | None:
+    """Armory numbers arrive as strings ("80"); store them as integers."""
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _as_datetime(value) -> datetime | None:
+    if isinstance(value, datetime):
+        return value
+    try:
+        return datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _profession_list(value) -> list[dict]:
+    if not isinstance(value, list):
+        return []
+    return [p for p in value if isinstance(p, dict) and p.get("name")]
+
+
+def _loads(text: str | None, default):
+    if not text:
+        return default
+    try:
+        return json.loads(text)
+    except (json.JSONDecodeError, TypeError):
+        return default
+
+
 class Character(db.Model):
     __tablename__ = "characters"
     __table_args__ = (
@@ -59,9 +92,38 @@ class Character(db.Model):
     # Relationships
     user = relationship("User", foreign_keys=[user_id], lazy="select")
     guild = relationship("Guild", foreign_keys=[guild_id], lazy="select")
+    profile: Mapped[CharacterProfile | None] = relationship(
+        "CharacterProfile", uselist=False, lazy="joined",
+        cascade="all, delete-orphan", passive_deletes=True,
+    )
+    professions: Mapped[list[CharacterProfession]] = relationship(
+        "CharacterProfession", lazy="select",
+        cascade="all, delete-orphan", passive_deletes=True,
+    )
 
     @property
     def char_metadata(self) -> dict:
+        if self.profile is not None:
+            return self.profile.to_metadata()
+        return self._legacy_metadata()
+
+    @char_metadata.setter
+    def char_metadata(self, value: dict) -> None:
+        value = dict(value or {})
+        if self.profile is None:
+            self.profile = CharacterProfile()
+        previous = self.profile.professions_json
+        self.profile.apply_metadata(value)
+        if self.profile.professions_json != previous:
+            self.professions = [
+                CharacterProfession(name=p["name"], skill=_as_int(p.get("skill")))
+                for p in _profession_list(value.get("professions"))
+            ]
+        # The blob is superseded by the profile tables
+        self.metadata_json = None
+
+    def _legacy_metadata(self) -> dict:
+        """Metadata of a character not yet moved to the profile tables."""
         if self.metadata_json:
             try:
                 return json.loads(self.metadata_json)
@@ -69,11 +131,31 @@ class Character(db.Model):
                 return {}
         return {}
 
-    @char_metadata.setter
-    def char_metadata(self, value: dict) -> None:
-        self.metadata_json = json.dumps(value)
+    def to_dict(self, view: str = FULL) -> dict:
+        """Serialise the character for the given view (see :mod:`app.utils.serialization`).
 
-    def to_dict(self) -> dict:
+        ``lineup`` leaves talents, equipment and other free-form metadata
+        out, so the deferred profile columns are never loaded; ``summary``
+        keeps only identity, roles and level.
+        """
+        if self.profile is not None:
+            metadata = self.profile.to_metadata(include_details=view == FULL)
+        else:
+            metadata = self._legacy_metadata()
+        if view == SUMMARY:
+            return {
+                "id": self.id,
+                "user_id": self.user_id,
+                "realm_name": self.realm_name,
+                "name": self.name,
+                "class_name": self.class_name,
+                "primary_spec": self.primary_spec,
+                "secondary_spec": self.secondary_spec,
+                "default_role": self.default_role,
+                "off_role": self.off_role,
+                "is_main": self.is_main,
+                "metadata": {"level": metadata.get("level")},
+            }
         return {
             "id": self.id,
             "user_id": self.user_id,
@@ -87,7 +169,7 @@ class Character(db.Model):
             "off_role": self.off_role,
             "is_main": self.is_main,
             "is_active": self.is_active,
-            "metadata": self.char_metadata,
+            "metadata": metadata,
             "armory_url": self.armory_url,
             "created_at": utc_iso(self.created_at),
             "updated_at": utc_iso(self.updated_at),
@@ -95,3 +177,131 @@ class Character(db.Model):
 
     def __repr__(self) -> str:
         return f"<Character id={self.id} name={self.name!r} class={self.class_name}>"
+
+
+class CharacterSyncState(db.Model):
+    """Armory sync bookkeeping for one character.
+
+    Maintained by :mod:`app.services.armory_sync_service`: content hashes let
+    a sync skip characters whose armory data did not change, and
+    ``next_due_at`` drives incremental autosync scheduling.
+    """
+
+    __tablename__ = "character_sync_states"
+    __table_args__ = (
+        sa.Index("ix_character_sync_states_next_due", "next_due_at"),
+    )
+
+    character_id: Mapped[int] = mapped_column(
+        sa.Integer, sa.ForeignKey("characters.id", ondelete="CASCADE"), primary_key=True
+    )
+    # sha256 of the normalised full character payload / guild roster entry
+    content_hash: Mapped[str | None] = mapped_column(sa.String(64), nullable=True)
+    roster_hash: Mapped[str | None] = mapped_column(sa.String(64), nullable=True)
+    last_synced_at: Mapped[datetime | None] = mapped_column(sa.DateTime(timezone=True), nullable=True)
+    details_synced_at: Mapped[datetime | None] = mapped_column(sa.DateTime(timezone=True), nullable=True)
+    last_changed_at: Mapped[datetime | None] = mapped_column(sa.DateTime(timezone=True), nullable=True)
+    next_due_at: Mapped[datetime | None] = mapped_column(sa.DateTime(timezone=True), nullable=True)
+    unchanged_streak: Mapped[int] = mapped_column(sa.Integer, nullable=False, default=0)
+
+    def __repr__(self) -> str:
+        return f"<CharacterSyncState character_id={self.character_id} next_due_at={self.next_due_at}>"
+
+
+class CharacterProfile(db.Model):
+    """Armory-derived profile of a character, one row per character.
+
+    Replaces the ``Character.metadata_json`` blob.  The scalars list views
+    and filters need are real, indexed columns; talents, equipment and any
+    other free-form keys live in the deferred ``details`` group and are
+    only read for the full character payload.
+    """
+
+    __tablename__ = "character_profiles"
+    __table_args__ = (
+        sa.Index("ix_character_profiles_level", "level"),
+        sa.Index("ix_character_profiles_faction", "faction"),
+        sa.Index("ix_character_profiles_achievement_points", "achievement_points"),
+        sa.Index("ix_character_profiles_last_synced", "last_synced_at"),
+    )
+
+    character_id: Mapped[int] = mapped_column(
+        sa.Integer, sa.ForeignKey("characters.id", ondelete="CASCADE"), primary_key=True
+    )
+    level: Mapped[int | None] = mapped_column(sa.Integer, nullable=True)
+    race: Mapped[str | None] = mapped_column(sa.String(32), nullable=True)
+    gender: Mapped[str | None] = mapped_column(sa.String(16), nullable=True)
+    faction: Mapped[str | None] = mapped_column(sa.String(16), nullable=True)
+    guild_name: Mapped[str | None] = mapped_column(sa.String(100), nullable=True)
+    achievement_points: Mapped[int | None] = mapped_column(sa.Integer, nullable=True)
+    honorable_kills: Mapped[int | None] = mapped_column(sa.Integer, nullable=True)
+    last_synced_at: Mapped[datetime | None] = mapped_column(sa.DateTime(timezone=True), nullable=True)
+    # Small list as received from the armory; CharacterProfession is the queryable copy
+    professions_json: Mapped[str | None] = mapped_column(sa.Text, nullable=True)
+    talents_json: Mapped[str | None] = mapped_column(
+        sa.Text, nullable=True, deferred=True, deferred_group="details"
+    )
+    equipment_json: Mapped[str | None] = mapped_column(
+        sa.Text, nullable=True, deferred=True, deferred_group="details"
+    )
+    extra_json: Mapped[str | None] = mapped_column(
+        sa.Text, nullable=True, deferred=True, deferred_group="details"
+    )
+
+    # metadata key -> (column, coercion)
+    SCALARS = {
+        "level": ("level", _as_int),
+        "race": ("race", None),
+        "gender": ("gender", None),
+        "faction": ("faction", None),
+        "guild": ("guild_name", None),
+        "achievement_points": ("achievement_points", _as_int),
+        "honorable_kills": ("honorable_kills", _as_int),
+    }
+    KNOWN_KEYS = frozenset(SCALARS) | {"professions", "talents", "equipment", "last_synced"}
+
+    def apply_metadata(self, meta: dict) -> None:
+        """Replace the profile with the contents of a metadata dict."""
+        for key, (column, coerce) in self.SCALARS.items():
+            value = meta.get(key)
+            setattr(self, column, coerce(value) if coerce else value)
+        self.last_synced_at = _as_datetime(meta.get("last_synced"))
+        self.professions_json = json.dumps(meta.get("professions") or [])
+        self.talents_json = json.dumps(meta.get("talents") or [])
+        self.equipment_json = json.dumps(meta.get("equipment") or [])
+        extra = {k: v for k, v in meta.items() if k not in self.KNOWN_KEYS}
+        self.extra_json = json.dumps(extra) if extra else None
+
+    def to_metadata(self, include_details: bool = True) -> dict:
+        """Rebuild the metadata dict served under ``Character.to_dict()["metadata"]``."""
+        meta = {key: getattr(self, column) for key, (column, _) in self.SCALARS.items()}
+        meta["professions"] = _loads(self.professions_json, [])
+        meta["last_synced"] = utc_iso(self.last_synced_at)
+        if include_details:
+            meta.update(_loads(self.extra_json, {}))
+            meta["talents"] = _loads(self.talents_json, [])
+            meta["equipment"] = _loads(self.equipment_json, [])
+        return meta
+
+    def __repr__(self) -> str:
+        return f"<CharacterProfile character_id={self.character_id} level={self.level}>"
+
+
+class CharacterProfession(db.Model):
+    """One profession of a character, for "level 80 with Alchemy 450+" queries."""
+
+    __tablename__ = "character_professions"
+    __table_args__ = (
+        sa.Index("ix_character_professions_character", "character_id"),
+        sa.Index("ix_character_professions_name_skill", "name", "skill"),
+    )
+
+    id: Mapped[int] = mapped_column(sa.Integer, primary_key=True)
+    character_id: Mapped[int] = mapped_column(
+        sa.Integer, sa.ForeignKey("characters.id", ondelete="CASCADE"), nullable=False
+    )
+    name: Mapped[str] = mapped_column(sa.String(64), nullable=False)
+    skill: Mapped[int | None] = mapped_column(sa.Integer, nullable=True)
+
+    def __repr__(self) -> str:
+        return f"<CharacterProfession character_id={self.character_id} {self.name} {self.skill}>"
@@ -1,4 +1,4 @@
-"""Notification and JobQueue models."""
+"""Notification, JobQueue and JobProgress models."""
 
 from __future__ import annotations
 
@@ -141,3 +141,53 @@ class JobQueue(db.Model):
 
     def __repr__(self) -> str:
         return f"<JobQueue id={self.id} type={self.type!r} status={self.status}>"
+
+
+class JobProgress(db.Model):
+    """Progress of a long-running job (e.g. a character sync), one row per job."""
+
+    __tablename__ = "job_progress"
+
+    job_id: Mapped[int] = mapped_column(
+        sa.Integer, sa.ForeignKey("job_queue.id", ondelete="CASCADE"), primary_key=True
+    )
+    done: Mapped[int] = mapped_column(sa.Integer, nullable=False, default=0)
+    total: Mapped[int] = mapped_column(sa.Integer, nullable=False, default=0)
+    failed: Mapped[int] = mapped_column(sa.Integer, nullable=False, default=0)
+    result_json: Mapped[str | None] = mapped_column(sa.Text, nullable=True)
+    started_at: Mapped[datetime] = mapped_column(
+        sa.DateTime(timezone=True),
+        nullable=False,
+        default=lambda: datetime.now(timezone.utc),
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        sa.DateTime(timezone=True),
+        nullable=False,
+        default=lambda: datetime.now(timezone.utc),
+        onupdate=lambda: datetime.now(timezone.utc),
+    )
+
+    @property
+    def eta_seconds(self) -> float | None:
+        """Estimated seconds left, extrapolated from the rate so far."""
+        if not self.done or self.done >= self.total:
+            return None
+        started = self.started_at
+        if started.tzinfo is None:
+            started = started.replace(tzinfo=timezone.utc)
+        elapsed = (datetime.now(timezone.utc) - started).total_seconds()
+        return round(elapsed / self.done * (self.total - self.done), 1)
+
+    def to_dict(self) -> dict:
+        return {
+            "done": self.done,
+            "total": self.total,
+            "failed": self.failed,
+            "eta_seconds": self.eta_seconds,
+            "started_at": utc_iso(self.started_at),
+            "updated_at": utc_iso(self.updated_at),
+            "result": json.loads(self.result_json) if self.result_json else None,
+        }
+
+    def __repr__(self) -> str:
+        return f"<JobProgress job={self.job_id} {self.done}/{self.total}>"
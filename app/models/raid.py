@@ -1,4 +1,4 @@
-"""Raid-related models: RaidDefinition, RaidTemplate, EventSeries, RaidEvent."""
+"""Raid-related models: RaidDefinition, RaidTemplate, EventSeries, RaidEvent, EventSummary."""
 
 from __future__ import annotations
 
@@ -10,6 +10,7 @@ import sqlalchemy as sa
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.utils.dt import utc_iso
+from app.utils.serialization import FULL, SUMMARY
 
 from app.enums import EventStatus
 from app.extensions import db
@@ -216,6 +217,8 @@ class RaidEvent(db.Model):
     __tablename__ = "raid_events"
     __table_args__ = (
         sa.Index("ix_raid_events_guild_starts", "guild_id", "starts_at_utc"),
+        # Open events by lock deadline (app.jobs.autolock)
+        sa.Index("ix_raid_events_status_close", "status", "close_signups_at"),
     )
 
     id: Mapped[int] = mapped_column(sa.Integer, primary_key=True)
@@ -268,20 +271,26 @@ class RaidEvent(db.Model):
     creator = relationship("User", foreign_keys=[created_by], lazy="select")
     signups = relationship("Signup", back_populates="raid_event", lazy="select", cascade="all, delete-orphan")
     lineup_slots = relationship("LineupSlot", back_populates="raid_event", lazy="select", cascade="all, delete-orphan")
+    summary: Mapped[EventSummary | None] = relationship(
+        "EventSummary", back_populates="raid_event", uselist=False, lazy="select",
+        cascade="all, delete-orphan",
+    )
 
-    def to_dict(self, include_signup_count: bool = False) -> dict:
-        # Pull slot data from raid_definition if available
-        rd = self.raid_definition
-        melee_dps_slots = rd.melee_dps_slots if rd and rd.melee_dps_slots is not None else 0
-        main_tank_slots = rd.main_tank_slots if rd and rd.main_tank_slots is not None else 1
-        off_tank_slots = rd.off_tank_slots if rd and rd.off_tank_slots is not None else 1
-        healer_slots = rd.healer_slots if rd and rd.healer_slots is not None else 5
-        range_dps_slots = rd.range_dps_slots if rd and rd.range_dps_slots is not None else 18
+    def to_dict(
+        self,
+        include_signup_count: bool = False,
+        summary: dict | None = None,
+        view: str = FULL,
+    ) -> dict:
+        """Serialise the event.
+
+        ``summary`` is what a calendar cell needs; ``lineup`` adds the role
+        slot counts; ``full`` adds instructions, series/template links and
+        audit timestamps.
+        """
         result = {
             "id": self.id,
             "guild_id": self.guild_id,
-            "series_id": self.series_id,
-            "template_id": self.template_id,
             "raid_definition_id": self.raid_definition_id,
             "title": self.title,
             "realm_name": self.realm_name,
@@ -292,33 +301,84 @@ class RaidEvent(db.Model):
             "difficulty": self.difficulty,
             "status": self.status,
             "raid_type": self.raid_type,
-            "instructions": self.instructions,
             "close_signups_at": utc_iso(self.close_signups_at),
-            "melee_dps_slots": melee_dps_slots,
-            "main_tank_slots": main_tank_slots,
-            "off_tank_slots": off_tank_slots,
-            "healer_slots": healer_slots,
-            "range_dps_slots": range_dps_slots,
-            "created_by": self.created_by,
-            "locked_at": utc_iso(self.locked_at),
-            "created_at": utc_iso(self.created_at),
-            "updated_at": utc_iso(self.updated_at),
         }
+        if view != SUMMARY:
+            # Pull slot data from raid_definition if available
+            rd = self.raid_definition
+            result.update({
+                "melee_dps_slots": rd.melee_dps_slots if rd and rd.melee_dps_slots is not None else 0,
+                "main_tank_slots": rd.main_tank_slots if rd and rd.main_tank_slots is not None else 1,
+                "off_tank_slots": rd.off_tank_slots if rd and rd.off_tank_slots is not None else 1,
+                "healer_slots": rd.healer_slots if rd and rd.healer_slots is not None else 5,
+                "range_dps_slots": rd.range_dps_slots if rd and rd.range_dps_slots is not None else 18,
+                "locked_at": utc_iso(self.locked_at),
+            })
+        if view == FULL:
+            result.update({
+                "series_id": self.series_id,
+                "template_id": self.template_id,
+                "instructions": self.instructions,
+                "created_by": self.created_by,
+                "created_at": utc_iso(self.created_at),
+                "updated_at": utc_iso(self.updated_at),
+            })
         if include_signup_count:
-            from app.models.signup import LineupSlot
-            signup_ids = [s.id for s in (self.signups or [])]
-            if signup_ids:
-                active_ids = set(
-                    db.session.execute(
-                        sa.select(LineupSlot.signup_id).where(
-                            LineupSlot.signup_id.in_(signup_ids)
-                        ).distinct()
-                    ).scalars().all()
-                )
-                result["signup_count"] = len(active_ids)
-            else:
-                result["signup_count"] = 0
+            # Counts come from the materialised event_summaries row; callers
+            # listing many events pass a pre-resolved *summary* dict.
+            if summary is None:
+                from app.services import event_summary_service
+                summary = event_summary_service.get_summary(self)
+            result.update(summary)
         return result
 
     def __repr__(self) -> str:
         return f"<RaidEvent id={self.id} title={self.title!r} status={self.status}>"
+
+
+class EventSummary(db.Model):
+    """Materialised per-event signup counts for the calendar feed.
+
+    Kept current by :mod:`app.services.event_summary_service` whenever the
+    signup/lineup services change LineupSlots for the event.
+    """
+
+    __tablename__ = "event_summaries"
+
+    raid_event_id: Mapped[int] = mapped_column(
+        sa.Integer, sa.ForeignKey("raid_events.id", ondelete="CASCADE"), primary_key=True
+    )
+    signup_count: Mapped[int] = mapped_column(sa.Integer, nullable=False, default=0)
+    going_count: Mapped[int] = mapped_column(sa.Integer, nullable=False, default=0)
+    bench_count: Mapped[int] = mapped_column(sa.Integer, nullable=False, default=0)
+    role_counts_json: Mapped[str | None] = mapped_column(sa.Text, nullable=True)
+    updated_at: Mapped[datetime] = mapped_column(
+        sa.DateTime(timezone=True),
+        nullable=False,
+        default=lambda: datetime.now(timezone.utc),
+        onupdate=lambda: datetime.now(timezone.utc),
+    )
+
+    # Relationships
+    raid_event: Mapped[RaidEvent] = relationship("RaidEvent", back_populates="summary")
+
+    @property
+    def role_counts(self) -> dict:
+        if self.role_counts_json:
+            return json.loads(self.role_counts_json)
+        return {}
+
+    @role_counts.setter
+    def role_counts(self, value: dict) -> None:
+        self.role_counts_json = json.dumps(value)
+
+    def to_dict(self) -> dict:
+        return {
+            "signup_count": self.signup_count,
+            "going_count": self.going_count,
+            "bench_count": self.bench_count,
+            "role_counts": self.role_counts,
+        }
+
+    def __repr__(self) -> str:
+        return f"<EventSummary event={self.raid_event_id} signups={self.signup_count}>"
@@ -0,0 +1,25 @@
+"""RateLimitBucket model: shared rate-limiter state per key."""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.extensions import db
+
+
+class RateLimitBucket(db.Model):
+    """Theoretical arrival time (epoch seconds) of the next request for a key.
+
+    Used by :class:`app.utils.rate_limit.DatabaseStore` when
+    ``RATE_LIMIT_BACKEND=database``; rows whose TAT has passed carry no
+    state and are pruned.
+    """
+
+    __tablename__ = "rate_limit_buckets"
+
+    key: Mapped[str] = mapped_column(sa.String(255), primary_key=True)
+    tat: Mapped[float] = mapped_column(sa.Float, nullable=False, index=True)
+
+    def __repr__(self) -> str:
+        return f"<RateLimitBucket {self.key} tat={self.tat}>"
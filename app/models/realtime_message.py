@@ -0,0 +1,32 @@
+"""RealtimeMessage model: Socket.IO messages relayed between processes."""
+
+from __future__ import annotations
+
+from datetime import datetime, timezone
+
+import sqlalchemy as sa
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.extensions import db
+
+
+class RealtimeMessage(db.Model):
+    """One published Socket.IO queue message (emit, room change, ...).
+
+    Written and polled by :class:`app.utils.socketio_queue.DatabaseQueueManager`
+    when ``SOCKETIO_MESSAGE_QUEUE=database``; rows are pruned after a short
+    retention window.
+    """
+
+    __tablename__ = "realtime_messages"
+
+    id: Mapped[int] = mapped_column(sa.Integer, primary_key=True, autoincrement=True)
+    channel: Mapped[str] = mapped_column(sa.String(64), nullable=False)
+    payload: Mapped[str] = mapped_column(sa.Text, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(
+        sa.DateTime(timezone=True), nullable=False, index=True,
+        default=lambda: datetime.now(timezone.utc),
+    )
+
+    def __repr__(self) -> str:
+        return f"<RealtimeMessage {self.id} on {self.channel}>"
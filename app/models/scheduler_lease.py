@@ -0,0 +1,29 @@
+"""SchedulerLease model: leader lease for process-wide periodic work."""
+
+from __future__ import annotations
+
+from datetime import datetime
+
+import sqlalchemy as sa
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.extensions import db
+
+
+class SchedulerLease(db.Model):
+    """Named lease held by at most one process until ``expires_at``.
+
+    Managed by :mod:`app.jobs.leader`; the holder renews it on every
+    heartbeat and any process may take it over once it has expired.
+    """
+
+    __tablename__ = "scheduler_leases"
+
+    name: Mapped[str] = mapped_column(sa.String(64), primary_key=True)
+    holder: Mapped[str] = mapped_column(sa.String(128), nullable=False)
+    acquired_at: Mapped[datetime] = mapped_column(sa.DateTime(timezone=True), nullable=False)
+    heartbeat_at: Mapped[datetime] = mapped_column(sa.DateTime(timezone=True), nullable=False)
+    expires_at: Mapped[datetime] = mapped_column(sa.DateTime(timezone=True), nullable=False)
+
+    def __repr__(self) -> str:
+        return f"<SchedulerLease {self.name} held by {self.holder}>"
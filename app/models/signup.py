@@ -9,6 +9,7 @@ from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.enums import Role, SlotGroup
 from app.utils.dt import utc_iso
+from app.utils.serialization import FULL, LINEUP, SUMMARY
 from app.extensions import db
 
 
@@ -52,18 +53,26 @@ class Signup(db.Model):
     user = relationship("User", foreign_keys=[user_id], lazy="select")
     character = relationship("Character", foreign_keys=[character_id], lazy="select")
 
-    def to_dict(self, guild_role_map: dict | None = None) -> dict:
-        from app.services import lineup_service
-
-        # Determine lineup status from LineupSlots (no stored status field)
-        has_role = lineup_service.has_role_slot(self.id)
-        bench_info = lineup_service.get_bench_info(self.id)
-        if has_role:
-            lineup_status = "going"
-        elif bench_info is not None:
-            lineup_status = "bench"
+    def to_dict(
+        self,
+        guild_role_map: dict | None = None,
+        lineup_status_map: dict | None = None,
+        view: str = FULL,
+    ) -> dict:
+        """Serialise the signup; *view* also selects the embedded character's view."""
+        # Determine lineup status from LineupSlots (no stored status field).
+        # Callers serialising many signups pass a pre-built map from
+        # lineup_service.build_lineup_status_map to avoid per-row queries.
+        if lineup_status_map is None:
+            from app.services import lineup_service
+            lineup_status_map = lineup_service.build_lineup_status_map([self.raid_event_id])
+        status_info = lineup_status_map.get(self.id)
+        if status_info is not None:
+            lineup_status = status_info["lineup_status"]
+            bench_info = status_info["bench_info"]
         else:
             lineup_status = "declined"
+            bench_info = None
 
         result = {
             "id": self.id,
@@ -74,13 +83,16 @@ class Signup(db.Model):
             "chosen_role": self.chosen_role,
             "lineup_status": lineup_status,
             "bench_info": bench_info,
-            "note": self.note,
-            "gear_score_note": self.gear_score_note,
-            "created_at": utc_iso(self.created_at),
-            "updated_at": utc_iso(self.updated_at),
         }
+        if view != SUMMARY:
+            result.update({
+                "note": self.note,
+                "gear_score_note": self.gear_score_note,
+                "created_at": utc_iso(self.created_at),
+                "updated_at": utc_iso(self.updated_at),
+            })
         if self.character is not None:
-            result["character"] = self.character.to_dict()
+            result["character"] = self.character.to_dict(view=view)
         # Inject guild role info if a pre-loaded map is provided
         if guild_role_map and self.user_id in guild_role_map:
             role_info = guild_role_map[self.user_id]
@@ -126,7 +138,8 @@ class LineupSlot(db.Model):
     character = relationship("Character", foreign_keys=[character_id], lazy="select")
     confirmer = relationship("User", foreign_keys=[confirmed_by], lazy="select")
 
-    def to_dict(self) -> dict:
+    def to_dict(self, view: str = LINEUP) -> dict:
+        """Serialise the slot; ``summary`` omits the character and signup."""
         result = {
             "id": self.id,
             "raid_event_id": self.raid_event_id,
@@ -137,8 +150,10 @@ class LineupSlot(db.Model):
             "confirmed_by": self.confirmed_by,
             "confirmed_at": utc_iso(self.confirmed_at),
         }
+        if view == SUMMARY:
+            return result
         if self.character is not None:
-            result["character"] = self.character.to_dict()
+            result["character"] = self.character.to_dict(view=view)
         if self.signup is not None:
             # Shallow signup dict to avoid duplicating the character data
             result["signup"] = {
@@ -194,7 +209,7 @@ class RaidBan(db.Model):
             "banned_by": self.banned_by,
             "reason": self.reason,
             "created_at": utc_iso(self.created_at),
-            "character": self.character.to_dict() if self.character else None,
+            "character": self.character.to_dict(view=LINEUP) if self.character else None,
         }
 
 
@@ -249,7 +264,7 @@ class CharacterReplacement(db.Model):
             "status": self.status,
             "created_at": utc_iso(self.created_at),
             "resolved_at": utc_iso(self.resolved_at),
-            "old_character": self.old_character.to_dict() if self.old_character else None,
-            "new_character": self.new_character.to_dict() if self.new_character else None,
+            "old_character": self.old_character.to_dict(view=LINEUP) if self.old_character else None,
+            "new_character": self.new_character.to_dict(view=LINEUP) if self.new_character else None,
             "requester_name": self.requester.username if self.requester else None,
         }
@@ -9,13 +9,25 @@ Quick-start::
 """
 
 from app.services.armory.base import ArmoryProvider
-from app.services.armory.registry import get_provider, list_providers, register_provider
+from app.services.armory.registry import (
+    clear_provider_cache,
+    get_breaker_state,
+    get_provider,
+    list_providers,
+    provider_health,
+    register_provider,
+)
+from app.services.armory.resilience import ArmoryUnavailable
 from app.services.armory.warmane import WarmaneProvider
 
 __all__ = [
     "ArmoryProvider",
+    "ArmoryUnavailable",
     "WarmaneProvider",
+    "clear_provider_cache",
+    "get_breaker_state",
     "get_provider",
     "list_providers",
+    "provider_health",
     "register_provider",
 ]
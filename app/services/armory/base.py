@@ -3,11 +3,107 @@
 from __future__ import annotations
 
 import abc
+import threading
 from typing import Optional
 
+import requests
+
+from app.services.armory.resilience import (
+    ArmoryUnavailable,
+    CircuitBreaker,
+    TokenBucket,
+    get_settings,
+)
+
 
 class ArmoryProvider(abc.ABC):
-    """Base class that every armory provider must implement."""
+    """Base class that every armory provider must implement.
+
+    Each instance lazily creates one pooled :class:`requests.Session`
+    (see :mod:`app.services.armory.http`), shared by all threads using the
+    provider.  Lookups should go through :meth:`cached_fetch` so they share
+    the response cache.
+    """
+
+    #: Default headers sent with every request made through :attr:`session`.
+    http_headers: dict[str, str] = {}
+
+    _session: requests.Session | None = None
+    _governor: TokenBucket | None = None
+    _breaker: CircuitBreaker | None = None
+    _session_lock = threading.Lock()
+
+    @property
+    def session(self) -> requests.Session:
+        """Pooled keep-alive HTTP session owned by this provider."""
+        if self._session is None:
+            with self._session_lock:
+                if self._session is None:
+                    from app.services.armory.http import build_session
+                    self._session = build_session(self.http_headers)
+        return self._session
+
+    @property
+    def governor(self) -> TokenBucket:
+        """Token bucket capping this provider's upstream call rate."""
+        if self._governor is None:
+            with self._session_lock:
+                if self._governor is None:
+                    settings = get_settings()
+                    self._governor = TokenBucket(settings.rate, settings.burst)
+        return self._governor
+
+    @property
+    def breaker(self) -> CircuitBreaker:
+        """Circuit breaker tracking this provider's upstream failure streak."""
+        if self._breaker is None:
+            with self._session_lock:
+                if self._breaker is None:
+                    settings = get_settings()
+                    self._breaker = CircuitBreaker(
+                        settings.failure_threshold, settings.reset_timeout, settings.half_open_max,
+                    )
+        return self._breaker
+
+    def http_get(self, url: str, **kwargs) -> requests.Response:
+        """GET *url* through the governor, breaker and pooled session.
+
+        Raises :class:`ArmoryUnavailable` without calling the upstream when
+        the breaker is open or no rate token frees up in time.  Connection
+        errors, 429 and 5xx count as breaker failures.
+        """
+        # Fail fast before queueing for a token, then claim the slot for real
+        if self.breaker.state == CircuitBreaker.OPEN:
+            raise ArmoryUnavailable(f"{self.provider_name} circuit open")
+        if not self.governor.acquire(get_settings().max_wait):
+            raise ArmoryUnavailable(f"{self.provider_name} rate limit wait exceeded")
+        if not self.breaker.allow():
+            raise ArmoryUnavailable(f"{self.provider_name} circuit open")
+        try:
+            resp = self.session.get(url, **kwargs)
+        except requests.RequestException:
+            self.breaker.record_failure()
+            raise
+        if resp.status_code == 429 or resp.status_code >= 500:
+            self.breaker.record_failure()
+        else:
+            self.breaker.record_success()
+        return resp
+
+    def cached_fetch(self, endpoint: str, key: str, loader) -> Optional[dict]:
+        """Serve *key* from the shared armory response cache.
+
+        *endpoint* selects the TTL; *loader* performs the upstream request
+        (see :meth:`app.services.armory.cache.ResponseCache.get_or_load`).
+        """
+        from app.services.armory.cache import get_response_cache
+        return get_response_cache().get_or_load(endpoint, f"{self.provider_name}:{key}", loader)
+
+    def close(self) -> None:
+        """Close the provider's pooled connections."""
+        session, self._session = self._session, None
+        if session is not None:
+            session.close()
 
     @property
     @abc.abstractmethod
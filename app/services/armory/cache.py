@@ -0,0 +1,334 @@
+"""Response cache for armory provider lookups.
+
+Sits between :class:`ArmoryProvider` implementations and the upstream API:
+
+* **TTL per endpoint** (``character``, ``guild``), with negative caching
+  of "not found" answers for a shorter TTL.  Transient errors (timeouts,
+  5xx) are never cached; a stale entry is served instead when one exists.
+* **Conditional revalidation** — expired entries are kept (until evicted)
+  with the upstream ``ETag`` / ``Last-Modified`` validators, so the refresh
+  can be a cheap ``304 Not Modified``.
+* **LRU eviction** once ``max_entries`` is reached.
+* **Single-flight** — concurrent lookups for the same key share one
+  upstream request.
+
+Storage is pluggable: :class:`MemoryStore` (default, per process) or
+:class:`SQLiteStore` (shared by every process on the host, survives
+restarts).  Configured from the app config by :func:`init_armory_cache`.
+"""
+
+from __future__ import annotations
+
+import abc
+import json
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TTLS = {"character": 300, "guild": 600}
+DEFAULT_NEGATIVE_TTL = 60
+_FLIGHT_TIMEOUT = 60  # seconds a follower waits for the leader's fetch
+
+
+@dataclass
+class CacheEntry:
+    """A cached upstream answer; ``value is None`` marks a negative entry."""
+
+    value: Optional[dict]
+    expires_at: float
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+
+    @property
+    def fresh(self) -> bool:
+        return time.time() < self.expires_at
+
+
+@dataclass
+class Fetched:
+    """Result of an upstream fetch handed back to the cache by a loader.
+
+    ``cacheable=False`` marks a transient failure that must not be cached.
+    """
+
+    value: Optional[dict]
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    cacheable: bool = True
+
+
+#: Returned by a loader when the upstream answered ``304 Not Modified``.
+NOT_MODIFIED = object()
+
+Loader = Callable[[Optional[CacheEntry]], Any]
+
+
+# ---------------------------------------------------------------------------
+# Stores
+# ---------------------------------------------------------------------------
+
+class CacheStore(abc.ABC):
+    """Storage backend for :class:`ResponseCache`."""
+
+    @abc.abstractmethod
+    def get(self, key: str) -> Optional[CacheEntry]:
+        """Return the entry for *key* (fresh or stale) and mark it recently used."""
+
+    @abc.abstractmethod
+    def set(self, key: str, entry: CacheEntry) -> int:
+        """Store *entry*; return the number of entries evicted to make room."""
+
+    @abc.abstractmethod
+    def clear(self) -> None:
+        """Remove every entry."""
+
+    @abc.abstractmethod
+    def __len__(self) -> int:
+        ...
+
+
+class MemoryStore(CacheStore):
+    """In-process LRU store."""
+
+    def __init__(self, max_entries: int = 2048) -> None:
+        self.max_entries = max(1, max_entries)
+        self._data: OrderedDict[str, CacheEntry] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                self._data.move_to_end(key)
+            return entry
+
+    def set(self, key: str, entry: CacheEntry) -> int:
+        evicted = 0
+        with self._lock:
+            self._data[key] = entry
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+                evicted += 1
+        return evicted
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class SQLiteStore(CacheStore):
+    """LRU store in a standalone SQLite file, shared across processes."""
+
+    def __init__(self, path: str, max_entries: int = 10000) -> None:
+        self.max_entries = max(1, max_entries)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS armory_cache ("
+            " key TEXT PRIMARY KEY, value TEXT, etag TEXT, last_modified TEXT,"
+            " expires_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS ix_armory_cache_accessed ON armory_cache (accessed_at)"
+        )
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at, etag, last_modified FROM armory_cache WHERE key = ?",
+                (key,),
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute(
+                "UPDATE armory_cache SET accessed_at = ? WHERE key = ?", (time.time(), key)
+            )
+        value = json.loads(row[0]) if row[0] is not None else None
+        return CacheEntry(value=value, expires_at=row[1], etag=row[2], last_modified=row[3])
+
+    def set(self, key: str, entry: CacheEntry) -> int:
+        value = json.dumps(entry.value) if entry.value is not None else None
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO armory_cache"
+                " (key, value, etag, last_modified, expires_at, accessed_at)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                (key, value, entry.etag, entry.last_modified, entry.expires_at, time.time()),
+            )
+            (count,) = self._conn.execute("SELECT COUNT(*) FROM armory_cache").fetchone()
+            excess = count - self.max_entries
+            if excess > 0:
+                self._conn.execute(
+                    "DELETE FROM armory_cache WHERE key IN ("
+                    " SELECT key FROM armory_cache ORDER BY accessed_at LIMIT ?)",
+                    (excess,),
+                )
+        return max(0, excess)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM armory_cache")
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM armory_cache").fetchone()[0]
+
+
+# ---------------------------------------------------------------------------
+# Cache
+# ---------------------------------------------------------------------------
+
+class _Flight:
+    __slots__ = ("done", "result")
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Optional[dict] = None
+
+
+class ResponseCache:
+    """TTL/LRU response cache with negative caching and single-flight."""
+
+    def __init__(
+        self,
+        store: CacheStore | None = None,
+        ttls: dict[str, int] | None = None,
+        negative_ttl: int = DEFAULT_NEGATIVE_TTL,
+        enabled: bool = True,
+    ) -> None:
+        self.store = store if store is not None else MemoryStore()
+        self.ttls = {**DEFAULT_TTLS, **(ttls or {})}
+        self.negative_ttl = negative_ttl
+        self.enabled = enabled
+        self._inflight: dict[str, _Flight] = {}
+        self._lock = threading.Lock()
+        self._stats = dict.fromkeys(
+            ("hits", "negative_hits", "misses", "revalidated", "coalesced",
+             "stale_served", "errors", "evictions"),
+            0,
+        )
+
+    def _count(self, name: str, n: int = 1) -> None:
+        with self._lock:
+            self._stats[name] += n
+
+    def get_or_load(self, endpoint: str, key: str, loader: Loader) -> Optional[dict]:
+        """Return the cached answer for *key*, calling *loader* on a miss.
+
+        *loader* receives the stale entry (or ``None``) so it can send
+        conditional request headers, and returns a :class:`Fetched` or
+        :data:`NOT_MODIFIED`.
+        """
+        if not self.enabled:
+            result = loader(None)
+            return None if result is NOT_MODIFIED else result.value
+
+        entry = self.store.get(key)
+        if entry is not None and entry.fresh:
+            self._count("hits" if entry.value is not None else "negative_hits")
+            return entry.value
+
+        with self._lock:
+            flight = self._inflight.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._inflight[key] = _Flight()
+            else:
+                self._stats["coalesced"] += 1
+        if not leader:
+            if flight.done.wait(_FLIGHT_TIMEOUT):
+                return flight.result
+            return self._load(endpoint, key, entry, loader)
+
+        try:
+            flight.result = self._load(endpoint, key, entry, loader)
+            return flight.result
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+            flight.done.set()
+
+    def _load(self, endpoint: str, key: str, stale: Optional[CacheEntry], loader: Loader):
+        self._count("misses")
+        try:
+            result = loader(stale)
+        except Exception:
+            result = Fetched(None, cacheable=False)
+            logger.exception("Armory cache loader failed for %s", key)
+
+        if result is NOT_MODIFIED and stale is not None:
+            self._count("revalidated")
+            stale.expires_at = time.time() + self.ttls.get(endpoint, 0)
+            self._count("evictions", self.store.set(key, stale))
+            return stale.value
+        if result is NOT_MODIFIED or not result.cacheable:
+            self._count("errors")
+            if stale is not None and stale.value is not None:
+                self._count("stale_served")
+                return stale.value
+            return None
+
+        ttl = self.ttls.get(endpoint, 0) if result.value is not None else self.negative_ttl
+        if ttl > 0:
+            fresh = CacheEntry(
+                value=result.value,
+                expires_at=time.time() + ttl,
+                etag=result.etag,
+                last_modified=result.last_modified,
+            )
+            self._count("evictions", self.store.set(key, fresh))
+        return result.value
+
+    def stats(self) -> dict:
+        """Return hit/miss counters, hit rate and current size."""
+        with self._lock:
+            stats = dict(self._stats)
+        lookups = stats["hits"] + stats["negative_hits"] + stats["misses"]
+        stats["hit_rate"] = round((stats["hits"] + stats["negative_hits"]) / lookups, 3) if lookups else 0.0
+        stats["size"] = len(self.store)
+        stats["backend"] = type(self.store).__name__
+        stats["enabled"] = self.enabled
+        return stats
+
+    def clear(self) -> None:
+        """Drop every entry and reset the counters."""
+        self.store.clear()
+        with self._lock:
+            for name in self._stats:
+                self._stats[name] = 0
+
+
+_cache = ResponseCache()
+
+
+def get_response_cache() -> ResponseCache:
+    return _cache
+
+
+def init_armory_cache(app) -> ResponseCache:
+    """Build the process-wide cache from *app* config."""
+    global _cache
+    cfg = app.config
+    max_entries = cfg.get("ARMORY_CACHE_MAX_ENTRIES", 2048)
+    if cfg.get("ARMORY_CACHE_BACKEND", "memory") == "sqlite":
+        store: CacheStore = SQLiteStore(cfg["ARMORY_CACHE_SQLITE_PATH"], max_entries)
+    else:
+        store = MemoryStore(max_entries)
+    _cache = ResponseCache(
+        store=store,
+        ttls=cfg.get("ARMORY_CACHE_TTLS"),
+        negative_ttl=cfg.get("ARMORY_CACHE_NEGATIVE_TTL", DEFAULT_NEGATIVE_TTL),
+        enabled=cfg.get("ARMORY_CACHE_ENABLED", True),
+    )
+    return _cache
@@ -0,0 +1,78 @@
+"""Pooled HTTP sessions for armory providers.
+
+Each provider owns one :class:`requests.Session` with a pooled adapter, so
+consecutive armory calls reuse keep-alive connections instead of paying a
+TCP/TLS handshake per request.  Transient failures (connection errors,
+429 and 5xx responses) are retried by the adapter with exponential backoff,
+honouring ``Retry-After``.
+
+Pool settings are process-wide and taken from the app config by
+:func:`init_armory_http`; sessions created before it runs use the defaults.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, replace
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+@dataclass(frozen=True)
+class HttpSettings:
+    pool_size: int = 10
+    keepalive: bool = True
+    retries: int = 1
+    backoff: float = 1.0
+
+
+_settings = HttpSettings()
+
+_RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+def init_armory_http(app) -> None:
+    """Load pool / retry settings from *app* config."""
+    global _settings
+    cfg = app.config
+    _settings = replace(
+        _settings,
+        pool_size=cfg.get("ARMORY_HTTP_POOL_SIZE", _settings.pool_size),
+        keepalive=cfg.get("ARMORY_HTTP_KEEPALIVE", _settings.keepalive),
+        retries=cfg.get("ARMORY_HTTP_RETRIES", _settings.retries),
+        backoff=cfg.get("ARMORY_HTTP_BACKOFF", _settings.backoff),
+    )
+
+
+def get_settings() -> HttpSettings:
+    return _settings
+
+
+def build_session(headers: dict | None = None) -> requests.Session:
+    """Return a new session with a pooled, retrying adapter mounted."""
+    settings = _settings
+    retry = Retry(
+        total=settings.retries,
+        connect=settings.retries,
+        read=settings.retries,
+        status=settings.retries,
+        backoff_factor=settings.backoff,
+        status_forcelist=_RETRY_STATUSES,
+        allowed_methods=frozenset({"GET", "HEAD"}),
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(
+        pool_connections=settings.pool_size,
+        pool_maxsize=settings.pool_size,
+        max_retries=retry,
+    )
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    if headers:
+        session.headers.update(headers)
+    if not settings.keepalive:
+        session.headers["Connection"] = "close"
+    return session
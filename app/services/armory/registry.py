@@ -2,21 +2,32 @@
 
 Providers are registered by name and can be looked up at runtime so that
 different guilds / configurations can use different armory APIs.
+
+Instances are cached per ``(name, api_base_url)`` so every lookup for the
+same backend shares one provider and therefore one pooled HTTP session,
+rate governor and circuit breaker.
 """
 
 from __future__ import annotations
 
+import threading
 from typing import Type
 
 from app.services.armory.base import ArmoryProvider
 
 _registry: dict[str, Type[ArmoryProvider]] = {}
 _builtins_registered = False
+_instances: dict[tuple, ArmoryProvider] = {}
+_instances_lock = threading.Lock()
 
 
 def register_provider(name: str, cls: Type[ArmoryProvider]) -> None:
     """Register *cls* under *name* (case-insensitive)."""
-    _registry[name.lower()] = cls
+    name = name.lower()
+    _registry[name] = cls
+    with _instances_lock:
+        for key in [k for k in _instances if k[0] == name]:
+            _instances.pop(key).close()
 
 
 def _ensure_builtins() -> None:
@@ -29,16 +40,57 @@ def _ensure_builtins() -> None:
 
 
 def get_provider(name: str, **kwargs) -> ArmoryProvider:
-    """Return an instance of the provider registered under *name*.
+    """Return the shared instance of the provider registered under *name*.
 
-    Extra *kwargs* are forwarded to the provider constructor.
+    Extra *kwargs* (typically ``api_base_url``) are forwarded to the
+    provider constructor and form part of the cache key.
     Raises ``KeyError`` if the name is not registered.
     """
     _ensure_builtins()
-    cls = _registry.get(name.lower())
+    name = name.lower()
+    cls = _registry.get(name)
     if cls is None:
         raise KeyError(f"Unknown armory provider: {name!r}")
-    return cls(**kwargs)
+    base_url = kwargs.get("api_base_url")
+    if base_url:
+        kwargs["api_base_url"] = base_url = base_url.rstrip("/")
+    extra = tuple(sorted((k, v) for k, v in kwargs.items() if k != "api_base_url"))
+    key = (name, base_url or None, extra)
+    with _instances_lock:
+        provider = _instances.get(key)
+        if provider is None:
+            provider = _instances[key] = cls(**kwargs)
+    return provider
+
+
+def provider_health() -> list[dict]:
+    """Breaker and rate-governor state of every provider instance in use."""
+    with _instances_lock:
+        providers = list(_instances.values())
+    return [
+        {
+            "provider": p.provider_name,
+            "api_base_url": p.api_base_url,
+            "breaker": p.breaker.snapshot(),
+            "governor": p.governor.snapshot(),
+        }
+        for p in providers
+    ]
+
+
+def get_breaker_state(name: str, api_base_url: str | None = None) -> dict:
+    """Breaker snapshot for the provider registered under *name*."""
+    kwargs = {"api_base_url": api_base_url} if api_base_url else {}
+    return get_provider(name, **kwargs).breaker.snapshot()
+
+
+def clear_provider_cache() -> None:
+    """Drop cached provider instances and close their connections."""
+    with _instances_lock:
+        providers = list(_instances.values())
+        _instances.clear()
+    for provider in providers:
+        provider.close()
 
 
 def list_providers() -> list[str]:
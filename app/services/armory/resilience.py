@@ -0,0 +1,178 @@
+"""Upstream protection for armory providers: rate governor + circuit breaker.
+
+Every provider instance owns one :class:`TokenBucket` and one
+:class:`CircuitBreaker`.  Providers are shared through the registry, so the
+proxy endpoints and the sync job draw from the same budget and see the same
+failure streak.
+
+* The **token bucket** caps calls per second to the upstream (with a small
+  burst).  Callers wait for a token up to ``max_wait`` seconds, then give up.
+* The **circuit breaker** opens after ``failure_threshold`` consecutive
+  failures and fails fast for ``reset_timeout`` seconds.  It then goes
+  half-open and lets a limited number of probe requests through; a
+  successful probe closes it, a failed one re-opens it.
+
+Settings come from the app config via :func:`init_armory_resilience`.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass, replace
+
+
+class ArmoryUnavailable(Exception):
+    """Raised instead of calling the upstream when the breaker is open or
+    the rate governor has no token in time."""
+
+
+@dataclass(frozen=True)
+class ResilienceSettings:
+    rate: float = 5.0
+    burst: int = 10
+    max_wait: float = 10.0
+    failure_threshold: int = 5
+    reset_timeout: float = 30.0
+    half_open_max: int = 1
+
+
+_settings = ResilienceSettings()
+
+
+def init_armory_resilience(app) -> None:
+    """Load governor / breaker settings from *app* config."""
+    global _settings
+    cfg = app.config
+    _settings = replace(
+        _settings,
+        rate=cfg.get("ARMORY_RATE_LIMIT_PER_SECOND", _settings.rate),
+        burst=cfg.get("ARMORY_RATE_LIMIT_BURST", _settings.burst),
+        max_wait=cfg.get("ARMORY_RATE_LIMIT_MAX_WAIT", _settings.max_wait),
+        failure_threshold=cfg.get("ARMORY_BREAKER_FAILURES", _settings.failure_threshold),
+        reset_timeout=cfg.get("ARMORY_BREAKER_RESET_SECONDS", _settings.reset_timeout),
+    )
+
+
+def get_settings() -> ResilienceSettings:
+    return _settings
+
+
+class TokenBucket:
+    """Thread-safe token bucket refilled at *rate* tokens per second."""
+
+    def __init__(self, rate: float, burst: int, clock=time.monotonic) -> None:
+        self.rate = max(rate, 0.001)
+        self.burst = max(1, burst)
+        self._clock = clock
+        self._tokens = float(self.burst)
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def try_acquire(self) -> float:
+        """Take a token if one is available; otherwise return the wait time."""
+        with self._lock:
+            self._refill()
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0.0
+            return (1 - self._tokens) / self.rate
+
+    def acquire(self, timeout: float) -> bool:
+        """Block until a token is taken or *timeout* seconds have passed."""
+        deadline = self._clock() + timeout
+        while True:
+            wait = self.try_acquire()
+            if wait == 0.0:
+                return True
+            remaining = deadline - self._clock()
+            if remaining <= 0:
+                return False
+            time.sleep(min(wait, remaining))
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            self._refill()
+            return {"rate": self.rate, "burst": self.burst, "tokens": round(self._tokens, 2)}
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker with half-open probing."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        failure_threshold: int,
+        reset_timeout: float,
+        half_open_max: int = 1,
+        clock=time.monotonic,
+    ) -> None:
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_timeout = reset_timeout
+        self.half_open_max = max(1, half_open_max)
+        self._clock = clock
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probes = 0
+        self._rejected = 0
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._current_state()
+
+    def _current_state(self) -> str:
+        if self._state == self.OPEN and self._clock() - self._opened_at >= self.reset_timeout:
+            self._state = self.HALF_OPEN
+            self._probes = 0
+        return self._state
+
+    def allow(self) -> bool:
+        """Whether a request may go upstream now (claims a probe slot when half-open)."""
+        with self._lock:
+            state = self._current_state()
+            if state == self.CLOSED:
+                return True
+            if state == self.HALF_OPEN and self._probes < self.half_open_max:
+                self._probes += 1
+                return True
+            self._rejected += 1
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._state = self.CLOSED
+            self._failures = 0
+            self._probes = 0
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            state = self._current_state()
+            if state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                self._state = self.OPEN
+                self._opened_at = self._clock()
+                self._probes = 0
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            state = self._current_state()
+            retry_in = None
+            if state == self.OPEN:
+                retry_in = round(max(0.0, self.reset_timeout - (self._clock() - self._opened_at)), 1)
+            return {
+                "state": state,
+                "consecutive_failures": self._failures,
+                "rejected": self._rejected,
+                "retry_in_seconds": retry_in,
+            }
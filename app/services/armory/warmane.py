@@ -7,13 +7,14 @@ subclass so it can be used through the pluggable provider system.
 from __future__ import annotations
 
 import logging
-import time
 from typing import Optional
 from urllib.parse import quote
 
 import requests
 
 from app.services.armory.base import ArmoryProvider
+from app.services.armory.cache import NOT_MODIFIED, CacheEntry, Fetched
+from app.services.armory.resilience import ArmoryUnavailable
 
 logger = logging.getLogger(__name__)
 
@@ -22,8 +23,6 @@ REQUEST_TIMEOUT = 15  # seconds
 _HEADERS = {
     "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
 }
-_MAX_RETRIES = 2
-_RETRY_DELAY = 2  # seconds
 
 _VALID_CLASSES = {
     "Death Knight", "Druid", "Hunter", "Mage", "Paladin",
@@ -92,6 +91,8 @@ def _parse_equipment(equipment: list) -> list[dict]:
 class WarmaneProvider(ArmoryProvider):
     """Armory provider backed by the Warmane public API."""
 
+    http_headers = _HEADERS
+
     def __init__(self, api_base_url: str | None = None) -> None:
         self._api_base_url = api_base_url or WARMANE_API_BASE
 
@@ -103,61 +104,62 @@ class WarmaneProvider(ArmoryProvider):
     def api_base_url(self) -> str:
         return self._api_base_url
 
+    def _get_json(self, endpoint: str, url: str, what: str) -> Optional[dict]:
+        """GET *url* through the response cache; None if not found / API error."""
+        return self.cached_fetch(endpoint, url, lambda stale: self._request(url, what, stale))
+
+    def _request(self, url: str, what: str, stale: Optional[CacheEntry]):
+        """Fetch *url* upstream, revalidating *stale* when it has validators.
+
+        Connection errors, 429 and 5xx responses are retried by the
+        session's adapter before giving up.  Goes through the provider's
+        rate governor and circuit breaker (see :meth:`http_get`).
+        """
+        headers = {}
+        if stale is not None and stale.value is not None:
+            if stale.etag:
+                headers["If-None-Match"] = stale.etag
+            if stale.last_modified:
+                headers["If-Modified-Since"] = stale.last_modified
+        try:
+            resp = self.http_get(url, timeout=REQUEST_TIMEOUT, headers=headers)
+            if resp.status_code == 304:
+                return NOT_MODIFIED
+            if resp.status_code == 404:
+                return Fetched(None)
+            if resp.status_code != 200:
+                logger.warning("Warmane API returned %s for %s", resp.status_code, what)
+                return Fetched(None, cacheable=False)
+            data = resp.json()
+        except ArmoryUnavailable as exc:
+            logger.info("Skipping Warmane request for %s: %s", what, exc)
+            return Fetched(None, cacheable=False)
+        except (requests.RequestException, ValueError) as exc:
+            logger.warning("Warmane API error for %s: %s", what, exc)
+            return Fetched(None, cacheable=False)
+        if "error" in data:
+            return Fetched(None)
+        return Fetched(
+            data,
+            etag=resp.headers.get("ETag"),
+            last_modified=resp.headers.get("Last-Modified"),
+        )
+
     def fetch_character(self, realm: str, name: str) -> Optional[dict]:
         """Fetch character summary from the Warmane armory API.
 
         Returns full character data or None if not found / API error.
-        Retries up to _MAX_RETRIES times on transient failures.
         """
         url = f"{self._api_base_url}/character/{quote(name, safe='')}/{quote(realm, safe='')}/summary"
-        for attempt in range(_MAX_RETRIES):
-            try:
-                resp = requests.get(url, timeout=REQUEST_TIMEOUT, headers=_HEADERS)
-                if resp.status_code != 200:
-                    logger.warning("Warmane API returned %s for %s/%s (attempt %d)", resp.status_code, realm, name, attempt + 1)
-                    if attempt < _MAX_RETRIES - 1:
-                        time.sleep(_RETRY_DELAY)
-                        continue
-                    return None
-                data = resp.json()
-                if "error" in data:
-                    return None
-                return data
-            except (requests.RequestException, ValueError) as exc:
-                logger.warning("Warmane API error for character %s/%s: %s (attempt %d)", realm, name, exc, attempt + 1)
-                if attempt < _MAX_RETRIES - 1:
-                    time.sleep(_RETRY_DELAY)
-                    continue
-                return None
-        return None
+        return self._get_json("character", url, f"character {realm}/{name}")
 
     def fetch_guild(self, realm: str, guild_name: str) -> Optional[dict]:
         """Fetch guild summary + roster from the Warmane armory API.
 
         Returns a dict with guild data or None if not found / API error.
-        Retries up to _MAX_RETRIES times on transient failures.
         """
         url = f"{self._api_base_url}/guild/{quote(guild_name, safe='')}/{quote(realm, safe='')}/summary"
-        for attempt in range(_MAX_RETRIES):
-            try:
-                resp = requests.get(url, timeout=REQUEST_TIMEOUT, headers=_HEADERS)
-                if resp.status_code != 200:
-                    logger.warning("Warmane API returned %s for guild %s/%s (attempt %d)", resp.status_code, realm, guild_name, attempt + 1)
-                    if attempt < _MAX_RETRIES - 1:
-                        time.sleep(_RETRY_DELAY)
-                        continue
-                    return None
-                data = resp.json()
-                if "error" in data:
-                    return None
-                return data
-            except (requests.RequestException, ValueError) as exc:
-                logger.warning("Warmane API error for guild %s/%s: %s (attempt %d)", realm, guild_name, exc, attempt + 1)
-                if attempt < _MAX_RETRIES - 1:
-                    time.sleep(_RETRY_DELAY)
-                    continue
-                return None
-        return None
+        return self._get_json("guild", url, f"guild {realm}/{guild_name}")
 
     def build_character_dict(self, data: dict, realm: str) -> dict:
         """Transform a Warmane API character/roster response into our format."""
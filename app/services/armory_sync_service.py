@@ -0,0 +1,497 @@
+"""Armory sync service: bulk-refresh characters from the armory API.
+
+Fetches run concurrently on a bounded thread pool (greenlets under gevent)
+with a per-host concurrency cap, so a large roster no longer syncs one
+HTTP round trip at a time.  Fetch workers only do HTTP; results are
+streamed back to the calling thread, which applies them to Character rows
+and commits in batches.  Characters sharing a realm/name (the same toon
+registered in several guilds) are fetched once.
+
+In ``roster`` mode (the default, ``ARMORY_SYNC_MODE``) each distinct guild
+roster is fetched once and every listed character is updated from it.
+Per-character fetches are a separate pass, for characters missing from the
+rosters or whose talents/equipment — which rosters lack — are older than
+``ARMORY_SYNC_DETAIL_MAX_AGE_HOURS``.  That pass is capped at
+``ARMORY_SYNC_TICK_BUDGET`` fetches per run (off-roster, then signed-up,
+then oldest details first); the rest wait for a later run.  A run thus
+costs one call per guild plus at most the budget, and details of a large
+roster are refreshed over several runs.
+
+Each character has a :class:`~app.models.character.CharacterSyncState`
+holding a content hash of the last applied payload: unchanged characters
+skip the Character write entirely.  The state also schedules the next
+check — backing off while a character keeps coming back unchanged, and
+staying at the minimum interval while it is signed up for an upcoming
+event.  Incremental runs (autosync) only take the most overdue characters,
+up to ``ARMORY_SYNC_TICK_BUDGET`` per tick.
+
+Every run returns a :class:`SyncStats` with throughput and failure counts,
+which is also logged and kept as :func:`last_run_stats`.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Optional
+from urllib.parse import urlparse
+
+from flask import current_app
+
+import sqlalchemy as sa
+
+from app.constants import normalize_spec_name
+from app.extensions import db
+from app.models.character import Character, CharacterSyncState
+from app.models.guild import Guild
+from app.models.raid import RaidEvent
+from app.models.signup import Signup
+
+logger = logging.getLogger(__name__)
+
+_host_limits: dict[str, threading.BoundedSemaphore] = {}
+_host_limits_lock = threading.Lock()
+_last_run: SyncStats | None = None
+
+
+@dataclass
+class SyncStats:
+    """Throughput and failure metrics for one sync run."""
+
+    mode: str = "character"
+    characters: int = 0
+    processed: int = 0
+    fetches: int = 0
+    roster_fetches: int = 0
+    from_roster: int = 0
+    synced: int = 0
+    unchanged: int = 0
+    not_found: int = 0
+    failed: int = 0
+    deferred: int = 0
+    batches: int = 0
+    elapsed_seconds: float = 0.0
+    started_at: str = field(default_factory=lambda: datetime.now(timezone.utc).isoformat())
+
+    @property
+    def fetches_per_second(self) -> float:
+        if self.elapsed_seconds <= 0:
+            return 0.0
+        return round(self.fetches / self.elapsed_seconds, 2)
+
+    def to_dict(self) -> dict:
+        d = asdict(self)
+        d["elapsed_seconds"] = round(self.elapsed_seconds, 2)
+        d["fetches_per_second"] = self.fetches_per_second
+        return d
+
+
+def last_run_stats() -> dict | None:
+    """Return the metrics of the most recent sync run in this process."""
+    return _last_run.to_dict() if _last_run else None
+
+
+def _host_semaphore(host: str) -> threading.BoundedSemaphore:
+    with _host_limits_lock:
+        sem = _host_limits.get(host)
+        if sem is None:
+            limit = current_app.config.get("ARMORY_MAX_CONCURRENCY_PER_HOST", 4)
+            sem = threading.BoundedSemaphore(max(1, limit))
+            _host_limits[host] = sem
+        return sem
+
+
+# Metadata keys a guild roster entry carries; talents/equipment need a
+# per-character fetch.
+_ROSTER_META_KEYS = (
+    "level", "race", "gender", "faction", "guild",
+    "achievement_points", "honorable_kills", "professions",
+)
+
+
+def _set_class(char: Character, class_name: str | None) -> None:
+    from app.services.character_service import _default_role_for_class
+
+    if class_name:
+        char.class_name = class_name
+        # Auto-populate default_role if not already set
+        if not char.default_role:
+            default_role = _default_role_for_class(class_name)
+            if default_role:
+                char.default_role = default_role
+
+
+def apply_roster_data(char: Character, member: dict) -> None:
+    """Copy the fields a guild roster entry provides onto *char*.
+
+    Keys the roster leaves empty keep their previous value.
+    """
+    _set_class(char, member.get("class_name"))
+    char.armory_url = member["armory_url"]
+    meta = char.char_metadata or {}
+    for key in _ROSTER_META_KEYS:
+        if member.get(key) not in (None, []):
+            meta[key] = member[key]
+    meta["last_synced"] = datetime.now(timezone.utc).isoformat()
+    char.char_metadata = meta
+
+
+def apply_character_data(char: Character, char_data: dict) -> None:
+    """Copy normalised armory data onto *char* (does not commit)."""
+    _set_class(char, char_data.get("class_name"))
+    char.armory_url = char_data["armory_url"]
+    talents = char_data.get("talents", [])
+    cls_name = char.class_name
+    if talents:
+        char.primary_spec = normalize_spec_name(talents[0].get("tree"), cls_name)
+        if len(talents) > 1:
+            char.secondary_spec = normalize_spec_name(talents[1].get("tree"), cls_name)
+    meta = char.char_metadata or {}
+    meta["level"] = char_data.get("level")
+    meta["race"] = char_data.get("race")
+    meta["gender"] = char_data.get("gender")
+    meta["faction"] = char_data.get("faction")
+    meta["guild"] = char_data.get("guild")
+    meta["achievement_points"] = char_data.get("achievement_points")
+    meta["honorable_kills"] = char_data.get("honorable_kills")
+    meta["professions"] = char_data.get("professions", [])
+    meta["talents"] = char_data.get("talents", [])
+    meta["equipment"] = char_data.get("equipment", [])
+    meta["last_synced"] = datetime.now(timezone.utc).isoformat()
+    char.char_metadata = meta
+
+
+def _content_hash(data: dict, keys=None) -> str:
+    """Stable hash of the normalised payload (volatile keys excluded)."""
+    if keys is not None:
+        data = {k: data.get(k) for k in keys}
+    else:
+        data = {k: v for k, v in data.items() if k != "online"}
+    raw = json.dumps(data, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+_ROSTER_HASH_KEYS = ("class_name", "armory_url") + _ROSTER_META_KEYS
+
+
+def _as_utc(dt: datetime | None) -> datetime | None:
+    # SQLite hands back naive datetimes; they are stored as UTC
+    if dt is not None and dt.tzinfo is None:
+        return dt.replace(tzinfo=timezone.utc)
+    return dt
+
+
+class _Schedule:
+    """Next-due computation for :class:`CharacterSyncState`."""
+
+    def __init__(self, config, now: datetime) -> None:
+        self.now = now
+        self.min_interval = timedelta(minutes=config.get("ARMORY_SYNC_MIN_INTERVAL_MINUTES", 60))
+        self.max_interval = timedelta(minutes=config.get("ARMORY_SYNC_MAX_INTERVAL_MINUTES", 1440))
+
+    def next_due(self, streak: int, priority: bool) -> datetime:
+        if priority:
+            return self.now + self.min_interval
+        # Double the interval for every consecutive unchanged check
+        interval = self.min_interval * (2 ** min(streak, 16))
+        return self.now + min(interval, self.max_interval)
+
+    def retry(self) -> datetime:
+        """Next check after a failed apply."""
+        return self.now + self.min_interval
+
+
+def _upcoming_signup_clause(now: datetime, days: int):
+    return (
+        sa.select(Signup.id)
+        .join(RaidEvent, RaidEvent.id == Signup.raid_event_id)
+        .where(
+            Signup.character_id == Character.id,
+            RaidEvent.starts_at_utc >= now,
+            RaidEvent.starts_at_utc <= now + timedelta(days=days),
+            RaidEvent.status != "cancelled",
+        )
+        .exists()
+    )
+
+
+def sync_characters(
+    guild_id: Optional[int] = None,
+    *,
+    mode: str | None = None,
+    incremental: bool = False,
+    budget: int | None = None,
+    fetch: Callable[[str, str], Optional[dict]] | None = None,
+    fetch_guild: Callable[[str, str], Optional[dict]] | None = None,
+    max_workers: int | None = None,
+    batch_size: int | None = None,
+    progress: Callable[[SyncStats], None] | None = None,
+) -> SyncStats:
+    """Sync active characters (optionally of one guild) from the armory.
+
+    *mode* is ``"roster"`` or ``"character"`` (default ``ARMORY_SYNC_MODE``).
+    With *incremental*, only characters whose ``next_due_at`` has passed are
+    synced — signed-up and most overdue first — up to *budget* characters
+    (default ``ARMORY_SYNC_TICK_BUDGET``).  In roster mode *budget* also caps
+    the per-character detail fetches of every run.
+    *fetch* / *fetch_guild* default to ``warmane_service.fetch_character`` /
+    ``fetch_guild`` and are the seams tests use to stub the network.
+    *progress* is called with the stats once the targets are known and again
+    after every committed batch (``stats.processed`` of ``stats.characters``).
+    """
+    global _last_run
+    from app.services import warmane_service
+
+    fetch = fetch or warmane_service.fetch_character
+    fetch_guild = fetch_guild or warmane_service.fetch_guild
+    config = current_app.config
+    mode = mode or config.get("ARMORY_SYNC_MODE", "roster")
+    max_workers = max(1, max_workers or config.get("ARMORY_SYNC_WORKERS", 8))
+    batch_size = batch_size or config.get("ARMORY_SYNC_BATCH_SIZE", 50)
+    now = datetime.now(timezone.utc)
+    schedule = _Schedule(config, now)
+    detail_cutoff = now - timedelta(hours=config.get("ARMORY_SYNC_DETAIL_MAX_AGE_HOURS", 24))
+    host = urlparse(warmane_service._provider.api_base_url).netloc or "default"
+    host_sem = _host_semaphore(host)
+
+    upcoming = _upcoming_signup_clause(now, config.get("ARMORY_SYNC_UPCOMING_DAYS", 7))
+    stmt = (
+        sa.select(
+            Character.id, Character.realm_name, Character.name,
+            Guild.realm_name, Guild.name,
+            CharacterSyncState.details_synced_at, upcoming.label("priority"),
+        )
+        .join(Guild, Guild.id == Character.guild_id)
+        .outerjoin(CharacterSyncState, CharacterSyncState.character_id == Character.id)
+        .where(Character.is_active.is_(True))
+    )
+    if guild_id:
+        stmt = stmt.where(Character.guild_id == guild_id)
+    if incremental:
+        stmt = (
+            stmt.where(sa.or_(
+                CharacterSyncState.next_due_at.is_(None),
+                CharacterSyncState.next_due_at <= now,
+            ))
+            .order_by(
+                # Never synced, then signed up for an upcoming event, then most overdue
+                sa.case((CharacterSyncState.next_due_at.is_(None), 0), else_=1),
+                upcoming.desc(),
+                CharacterSyncState.next_due_at,
+                Character.id,
+            )
+            .limit(budget or config.get("ARMORY_SYNC_TICK_BUDGET", 200))
+        )
+
+    # One fetch per distinct realm/name
+    targets: dict[tuple[str, str], list[int]] = {}
+    # Stale realm/name -> details_synced_at (None: never)
+    stale: dict[tuple[str, str], datetime | None] = {}
+    priority_keys: set[tuple[str, str]] = set()
+    rosters: set[tuple[str, str]] = set()
+    priority_ids: set[int] = set()
+    for char_id, realm, name, guild_realm, guild_name, details_at, priority in db.session.execute(stmt).all():
+        targets.setdefault((realm, name), []).append(char_id)
+        details_at = _as_utc(details_at)
+        if details_at is None or details_at < detail_cutoff:
+            stale[(realm, name)] = details_at
+        rosters.add((guild_realm, guild_name))
+        if priority:
+            priority_ids.add(char_id)
+            priority_keys.add((realm, name))
+
+    stats = SyncStats(mode=mode, characters=sum(len(ids) for ids in targets.values()))
+    started = time.monotonic()
+    if progress is not None:
+        progress(stats)
+
+    def _guarded(call, *args):
+        with host_sem:
+            return call(*args)
+
+    def _fetch(realm: str, name: str):
+        data = _guarded(fetch, realm, name)
+        if data is None or (isinstance(data, dict) and "error" in data):
+            return None
+        return warmane_service.build_character_dict(data, realm)
+
+    def _fetch_roster(realm: str, guild_name: str) -> dict[tuple[str, str], dict]:
+        data = _guarded(fetch_guild, realm, guild_name)
+        if not data or "error" in data:
+            return {}
+        members = {}
+        for raw in data.get("roster") or []:
+            member = warmane_service.build_character_dict(raw, realm)
+            if member.get("name"):
+                members[(realm.lower(), member["name"].lower())] = member
+        return members
+
+    # char_id -> (payload, full) ; payload None = nothing fetched
+    pending: dict[int, tuple[Optional[dict], bool]] = {}
+
+    def _flush() -> None:
+        if not pending:
+            return
+        ids = list(pending)
+        states = {
+            s.character_id: s
+            for s in db.session.execute(
+                sa.select(CharacterSyncState).where(CharacterSyncState.character_id.in_(ids))
+            ).scalars()
+        }
+        changed: dict[int, str] = {}
+        for char_id in ids:
+            state = states.get(char_id)
+            if state is None:
+                state = CharacterSyncState(character_id=char_id, unchanged_streak=0)
+                db.session.add(state)
+                states[char_id] = state
+            char_data, full = pending[char_id]
+            if char_data is None:
+                state.unchanged_streak = (state.unchanged_streak or 0) + 1
+            else:
+                digest = _content_hash(char_data) if full else _content_hash(char_data, _ROSTER_HASH_KEYS)
+                previous = state.content_hash if full else state.roster_hash
+                if digest == previous:
+                    state.last_synced_at = now
+                    if full:
+                        state.details_synced_at = now
+                    state.unchanged_streak = (state.unchanged_streak or 0) + 1
+                    stats.unchanged += 1
+                else:
+                    # Recorded once the apply has succeeded
+                    changed[char_id] = digest
+            state.next_due_at = schedule.next_due(state.unchanged_streak, char_id in priority_ids)
+
+        if changed:
+            chars = db.session.execute(
+                sa.select(Character)
+                .where(Character.id.in_(list(changed)))
+                .options(
+                    sa.orm.joinedload(Character.profile).undefer_group("details"),
+                    sa.orm.selectinload(Character.professions),
+                )
+            ).scalars().all()
+            for char in chars:
+                char_data, full = pending[char.id]
+                state = states[char.id]
+                try:
+                    # A failed apply is rolled back on its own, not half-committed
+                    with db.session.begin_nested():
+                        if full:
+                            apply_character_data(char, char_data)
+                        else:
+                            apply_roster_data(char, char_data)
+                except Exception as exc:
+                    stats.failed += 1
+                    logger.warning("Failed to sync character %s: %s", char.name, exc)
+                    # The previous hashes stay, so the next check applies again
+                    state.next_due_at = schedule.retry()
+                    continue
+                stats.synced += 1
+                state.last_synced_at = now
+                state.last_changed_at = now
+                state.unchanged_streak = 0
+                if full:
+                    state.details_synced_at = now
+                    state.content_hash = changed[char.id]
+                # A roster update leaves talents/equipment untouched, so the
+                # full hash stays valid; a full update refreshes both.
+                state.roster_hash = _content_hash(char_data, _ROSTER_HASH_KEYS)
+                state.next_due_at = schedule.next_due(0, char.id in priority_ids)
+        db.session.commit()
+        stats.batches += 1
+        stats.processed += len(ids)
+        pending.clear()
+        if progress is not None:
+            progress(stats)
+
+    def _queue(char_ids: list[int], char_data: Optional[dict], full: bool) -> None:
+        for char_id in char_ids:
+            pending[char_id] = (char_data, full)
+        if len(pending) >= batch_size:
+            _flush()
+
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="armory-sync") as pool:
+        to_fetch = list(targets)
+        fallback: dict[tuple[str, str], dict] = {}
+        if mode == "roster" and targets:
+            roster_members: dict[tuple[str, str], dict] = {}
+            stats.roster_fetches = len(rosters)
+            roster_futures = {pool.submit(_fetch_roster, *key): key for key in rosters}
+            for future in as_completed(roster_futures):
+                try:
+                    roster_members.update(future.result())
+                except Exception as exc:
+                    logger.warning("Failed to fetch guild roster %s/%s: %s", *roster_futures[future], exc)
+
+            detail_keys = []
+            for key, char_ids in targets.items():
+                member = roster_members.get((key[0].lower(), key[1].lower()))
+                if member is not None:
+                    fallback[key] = member
+                if member is None or key in stale:
+                    # Not on a roster, or talents/equipment due for refresh
+                    detail_keys.append(key)
+                else:
+                    stats.from_roster += len(char_ids)
+                    _queue(char_ids, member, full=False)
+
+            # Detail pass: bounded, most needed first
+            epoch = datetime.min.replace(tzinfo=timezone.utc)
+            detail_keys.sort(key=lambda k: (
+                k in fallback, k not in priority_keys, stale.get(k) or epoch,
+            ))
+            detail_budget = budget or config.get("ARMORY_SYNC_TICK_BUDGET", 200)
+            to_fetch = detail_keys[:detail_budget]
+            for key in detail_keys[detail_budget:]:
+                stats.deferred += len(targets[key])
+                if key in fallback:
+                    stats.from_roster += len(targets[key])
+                    _queue(targets[key], fallback[key], full=False)
+                # Off-roster characters are left as they are, due next run
+            _flush()
+
+        stats.fetches = stats.roster_fetches + len(to_fetch)
+        futures = {pool.submit(_fetch, realm, name): (realm, name) for realm, name in to_fetch}
+        for future in as_completed(futures):
+            realm, name = futures[future]
+            char_ids = targets[(realm, name)]
+            try:
+                char_data = future.result()
+            except Exception as exc:
+                char_data = exc
+            if isinstance(char_data, dict):
+                _queue(char_ids, char_data, full=True)
+            elif (realm, name) in fallback:
+                # Keep the roster fields fresh even if the detail fetch failed
+                stats.from_roster += len(char_ids)
+                _queue(char_ids, fallback[(realm, name)], full=False)
+            else:
+                if char_data is None:
+                    stats.not_found += len(char_ids)
+                    logger.warning("Skipping sync for %s/%s: no data from armory", realm, name)
+                else:
+                    stats.failed += len(char_ids)
+                    logger.warning("Failed to fetch character %s/%s: %s", realm, name, char_data)
+                # Back off before trying again
+                _queue(char_ids, None, full=False)
+    _flush()
+
+    stats.elapsed_seconds = time.monotonic() - started
+    _last_run = stats
+    logger.info(
+        "Armory sync (%s%s): %d/%d characters updated (%d unchanged, %d from rosters, "
+        "%d not found, %d failed, %d details deferred) from %d fetches (%d rosters) "
+        "in %.1fs (%.2f fetches/s)",
+        stats.mode, ", incremental" if incremental else "", stats.synced, stats.characters,
+        stats.unchanged, stats.from_roster, stats.not_found, stats.failed, stats.deferred, stats.fetches,
+        stats.roster_fetches, stats.elapsed_seconds, stats.fetches_per_second,
+    )
+    return stats
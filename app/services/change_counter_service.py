@@ -0,0 +1,168 @@
+"""Change counter service: version numbers behind conditional GETs.
+
+Read-heavy endpoints (the calendar, signups, lineup, unread count) answer
+``If-None-Match`` from a handful of counters instead of re-serialising
+their payload.  A counter is identified by ``(scope, scope_id)``:
+
+* ``event``         — signups, lineup slots and bans of one raid event
+* ``guild_events``  — the event list (and stored signup counts) of a guild
+* ``guild_roster``  — characters, profiles and memberships of a guild
+* ``notifications`` — one user's notifications
+* ``global``        — raid definitions and role names shared by all guilds
+* ``permissions``   — roles, permissions and grant rules; versions the
+  permission snapshot every worker process keeps
+
+ORM changes are picked up automatically by an ``after_flush`` hook.  Bulk
+``UPDATE`` / ``DELETE`` / ``INSERT`` statements bypass the unit of work, so
+the services issuing them call :func:`touch` next to the statement.  Bumps
+run in the same transaction as the change they describe.
+"""
+
+from __future__ import annotations
+
+from typing import Iterable
+
+import sqlalchemy as sa
+from sqlalchemy import event as sa_event
+
+from app.extensions import db
+from app.models.change_counter import ChangeCounter
+from app.models.character import Character, CharacterProfession, CharacterProfile
+from app.models.guild import GuildMembership
+from app.models.notification import Notification
+from app.models.permission import Permission, RoleGrantRule, RolePermission, SystemRole
+from app.models.raid import EventSummary, RaidDefinition, RaidEvent
+from app.models.signup import LineupSlot, RaidBan, Signup
+
+EVENT = "event"
+GUILD_EVENTS = "guild_events"
+GUILD_ROSTER = "guild_roster"
+NOTIFICATIONS = "notifications"
+GLOBAL = "global"
+PERMISSIONS = "permissions"
+
+Key = tuple[str, int]
+
+# There is only one "global" counter
+GLOBAL_KEY: Key = (GLOBAL, 0)
+PERMISSIONS_KEY: Key = (PERMISSIONS, 0)
+
+
+def touch(scope: str, *scope_ids: int | None) -> None:
+    """Bump the counters for *scope_ids* in the current transaction."""
+    _bump(db.session.connection(), {(scope, sid) for sid in scope_ids})
+
+
+def versions(keys: Iterable[Key]) -> dict[Key, int]:
+    """Return the current version of each key (0 if never bumped) in one query."""
+    keys = set(keys)
+    result = dict.fromkeys(keys, 0)
+    if not keys:
+        return result
+    table = ChangeCounter.__table__
+    rows = db.session.execute(
+        sa.select(table.c.scope, table.c.scope_id, table.c.version).where(
+            sa.tuple_(table.c.scope, table.c.scope_id).in_(list(keys))
+        )
+    ).all()
+    for scope, scope_id, version in rows:
+        result[(scope, scope_id)] = version
+    return result
+
+
+def _bump(connection, keys: set) -> None:
+    keys = sorted(k for k in keys if k[1] is not None)
+    if not keys:
+        return
+    table = ChangeCounter.__table__
+    rows = [{"scope": scope, "scope_id": scope_id, "version": 1} for scope, scope_id in keys]
+    dialect = connection.dialect.name
+    # Keys are sorted so concurrent transactions lock rows in the same order
+    if dialect in ("sqlite", "postgresql"):
+        if dialect == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert
+        else:
+            from sqlalchemy.dialects.postgresql import insert
+        stmt = insert(table).on_conflict_do_update(
+            index_elements=[table.c.scope, table.c.scope_id],
+            set_={"version": table.c.version + 1},
+        )
+        connection.execute(stmt, rows)
+    elif dialect in ("mysql", "mariadb"):
+        from sqlalchemy.dialects.mysql import insert
+        stmt = insert(table)
+        connection.execute(stmt.on_duplicate_key_update(version=table.c.version + 1), rows)
+    else:
+        in_keys = sa.tuple_(table.c.scope, table.c.scope_id).in_(keys)
+        connection.execute(sa.update(table).where(in_keys).values(version=table.c.version + 1))
+        existing = set(connection.execute(sa.select(table.c.scope, table.c.scope_id).where(in_keys)).all())
+        missing = [row for row in rows if (row["scope"], row["scope_id"]) not in existing]
+        if missing:
+            connection.execute(sa.insert(table), missing)
+
+
+def _collect_keys(objects) -> tuple[set, set, set]:
+    """Map changed ORM objects to counter keys.
+
+    Returns ``(keys, event_ids, character_ids)``; the last two still need
+    their guild looked up.
+    """
+    keys: set = set()
+    event_ids: set = set()
+    character_ids: set = set()
+    for obj in objects:
+        # Read loaded values only: deleted rows can no longer be refreshed
+        values = sa.inspect(obj).dict
+        if isinstance(obj, (Signup, LineupSlot, RaidBan)):
+            keys.add((EVENT, values.get("raid_event_id")))
+        elif isinstance(obj, RaidEvent):
+            keys.add((EVENT, values.get("id")))
+            keys.add((GUILD_EVENTS, values.get("guild_id")))
+        elif isinstance(obj, EventSummary):
+            event_ids.add(values.get("raid_event_id"))
+        elif isinstance(obj, (Character, GuildMembership)):
+            keys.add((GUILD_ROSTER, values.get("guild_id")))
+        elif isinstance(obj, (CharacterProfile, CharacterProfession)):
+            character_ids.add(values.get("character_id"))
+        elif isinstance(obj, Notification):
+            keys.add((NOTIFICATIONS, values.get("user_id")))
+        elif isinstance(obj, RaidDefinition):
+            keys.add(GLOBAL_KEY)
+        elif isinstance(obj, SystemRole):
+            keys.update((GLOBAL_KEY, PERMISSIONS_KEY))
+        elif isinstance(obj, (Permission, RolePermission, RoleGrantRule)):
+            keys.add(PERMISSIONS_KEY)
+    event_ids.discard(None)
+    character_ids.discard(None)
+    return keys, event_ids, character_ids
+
+
+# ---------------------------------------------------------------------------
+# Session hooks
+# ---------------------------------------------------------------------------
+
+@sa_event.listens_for(db.session, "after_flush")
+def _bump_flushed(session, flush_context) -> None:
+    changed = [
+        obj for obj in session.dirty
+        if session.is_modified(obj, include_collections=False)
+    ]
+    keys, event_ids, character_ids = _collect_keys([*session.new, *changed, *session.deleted])
+    if not (keys or event_ids or character_ids):
+        return
+    connection = session.connection()
+    if event_ids:
+        keys.update(
+            (GUILD_EVENTS, guild_id)
+            for guild_id in connection.execute(
+                sa.select(RaidEvent.guild_id).where(RaidEvent.id.in_(event_ids)).distinct()
+            ).scalars()
+        )
+    if character_ids:
+        keys.update(
+            (GUILD_ROSTER, guild_id)
+            for guild_id in connection.execute(
+                sa.select(Character.guild_id).where(Character.id.in_(character_ids)).distinct()
+            ).scalars()
+        )
+    _bump(connection, keys)
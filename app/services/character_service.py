@@ -9,7 +9,7 @@ import sqlalchemy as sa
 from app.constants import CLASS_ROLES
 from app.enums import WowClass
 from app.extensions import db
-from app.models.character import Character
+from app.models.character import Character, CharacterProfession, CharacterProfile
 
 
 def _default_role_for_class(class_name: str) -> str | None:
@@ -77,8 +77,35 @@ def delete_character(character: Character) -> None:
     """Delete a character and all related records (signups, lineup slots, bans, replacements)."""
     from app.models.signup import Signup, LineupSlot, RaidBan, CharacterReplacement
 
+    from app.services import change_counter_service, event_summary_service
+
     char_id = character.id
 
+    # Summaries of every event this character was slotted in must be refreshed
+    affected_event_ids = db.session.execute(
+        sa.select(LineupSlot.raid_event_id)
+        .outerjoin(Signup, Signup.id == LineupSlot.signup_id)
+        .where(sa.or_(
+            LineupSlot.character_id == char_id,
+            Signup.character_id == char_id,
+        ))
+        .distinct()
+    ).scalars().all()
+    for raid_event_id in affected_event_ids:
+        event_summary_service.mark_dirty(raid_event_id)
+
+    # The bulk deletes below bypass the ORM, so bump the events' change
+    # counters for every event the character has a slot, signup or ban in
+    listed_event_ids = db.session.execute(
+        sa.union(
+            sa.select(Signup.raid_event_id).where(Signup.character_id == char_id),
+            sa.select(RaidBan.raid_event_id).where(RaidBan.character_id == char_id),
+        )
+    ).scalars().all()
+    change_counter_service.touch(
+        change_counter_service.EVENT, *set(affected_event_ids) | set(listed_event_ids)
+    )
+
     # Remove lineup slots referencing this character
     db.session.execute(
         sa.delete(LineupSlot).where(LineupSlot.character_id == char_id)
@@ -149,9 +176,63 @@ def list_characters(
         stmt = stmt.where(Character.guild_id == guild_id)
     if not include_archived:
         stmt = stmt.where(Character.is_active.is_(True))
+    stmt = stmt.options(sa.orm.joinedload(Character.profile).undefer_group("details"))
     return list(db.session.execute(stmt).scalars().all())
 
 
+def search_characters(
+    guild_id: int,
+    *,
+    level: Optional[int] = None,
+    min_level: Optional[int] = None,
+    faction: Optional[str] = None,
+    profession: Optional[str] = None,
+    min_skill: Optional[int] = None,
+    include_archived: bool = False,
+) -> list[Character]:
+    """Filter a guild's characters on the indexed armory profile columns.
+
+    e.g. ``search_characters(gid, level=80, profession="Alchemy", min_skill=450)``.
+    Characters that were never synced have no profile and never match.
+    """
+    stmt = (
+        sa.select(Character)
+        .join(CharacterProfile, CharacterProfile.character_id == Character.id)
+        .where(Character.guild_id == guild_id)
+    )
+    if not include_archived:
+        stmt = stmt.where(Character.is_active.is_(True))
+    if level is not None:
+        stmt = stmt.where(CharacterProfile.level == level)
+    if min_level is not None:
+        stmt = stmt.where(CharacterProfile.level >= min_level)
+    if faction:
+        stmt = stmt.where(CharacterProfile.faction == faction)
+    if profession:
+        has_profession = sa.select(CharacterProfession.id).where(
+            CharacterProfession.character_id == Character.id,
+            CharacterProfession.name == profession,
+        )
+        if min_skill is not None:
+            has_profession = has_profession.where(CharacterProfession.skill >= min_skill)
+        stmt = stmt.where(has_profession.exists())
+    return list(db.session.execute(stmt.order_by(Character.name)).scalars().all())
+
+
+def backfill_profiles() -> int:
+    """Move legacy ``metadata_json`` blobs into the profile tables.
+
+    Returns the number of characters converted.
+    """
+    chars = db.session.execute(
+        sa.select(Character).where(Character.metadata_json.is_not(None))
+    ).scalars().all()
+    for char in chars:
+        char.char_metadata = char._legacy_metadata()
+    db.session.commit()
+    return len(chars)
+
+
 def find_existing(guild_id: int, realm_name: str, name: str) -> Optional[Character]:
     """Find an existing character by realm + name + guild (dedup check)."""
     return db.session.execute(
@@ -8,6 +8,7 @@ from typing import Optional
 import sqlalchemy as sa
 
 from app.extensions import db
+from app.jobs import autolock
 from app.models.guild import Guild
 from app.models.raid import EventSeries, RaidEvent, RaidTemplate
 
@@ -228,6 +229,8 @@ def generate_events_from_series(series: EventSeries, count: int = 4) -> list[Rai
         events.append(event)
 
     db.session.commit()
+    for event in events:
+        autolock.track_event(event)
     return events
 
 
@@ -280,6 +283,7 @@ def create_event(guild_id: int, created_by: int, data: dict) -> RaidEvent:
         event.close_signups_at = close_at
     db.session.add(event)
     db.session.commit()
+    autolock.track_event(event)
     return event
 
 
@@ -308,6 +312,7 @@ def update_event(event: RaidEvent, data: dict) -> RaidEvent:
     if close_at and start_at and close_at >= start_at:
         raise ValueError("close_signups_at must be before the event start time")
     db.session.commit()
+    autolock.track_event(event)
     return event
 
 
@@ -327,6 +332,7 @@ def unlock_event(event: RaidEvent) -> RaidEvent:
     event.status = "open"
     event.locked_at = None
     db.session.commit()
+    autolock.track_event(event)
     return event
 
 
@@ -353,8 +359,19 @@ def list_events(guild_id: int) -> list[RaidEvent]:
     )
 
 
-def list_events_for_guilds(guild_ids: list[int]) -> list[RaidEvent]:
-    """Return events for multiple guilds (realm/guild agnostic view)."""
+def _event_list_options(include_summary: bool) -> list:
+    options = [sa.orm.joinedload(RaidEvent.raid_definition)]
+    if include_summary:
+        options.append(sa.orm.joinedload(RaidEvent.summary))
+    return options
+
+
+def list_events_for_guilds(guild_ids: list[int], include_summary: bool = False) -> list[RaidEvent]:
+    """Return events for multiple guilds (realm/guild agnostic view).
+
+    With *include_summary* the materialised EventSummary rows are loaded in
+    the same query.
+    """
     if not guild_ids:
         return []
     return list(
@@ -362,14 +379,15 @@ def list_events_for_guilds(guild_ids: list[int]) -> list[RaidEvent]:
             sa.select(RaidEvent).where(
                 RaidEvent.guild_id.in_(guild_ids)
             )
-            .options(sa.orm.joinedload(RaidEvent.raid_definition))
+            .options(*_event_list_options(include_summary))
             .order_by(RaidEvent.starts_at_utc)
         ).unique().scalars().all()
     )
 
 
 def list_events_for_guilds_by_range(
-    guild_ids: list[int], start: datetime, end: datetime
+    guild_ids: list[int], start: datetime, end: datetime,
+    include_summary: bool = False,
 ) -> list[RaidEvent]:
     """Return events for multiple guilds within a date range."""
     if not guild_ids:
@@ -381,7 +399,7 @@ def list_events_for_guilds_by_range(
                 RaidEvent.starts_at_utc >= start,
                 RaidEvent.starts_at_utc <= end,
             )
-            .options(sa.orm.joinedload(RaidEvent.raid_definition))
+            .options(*_event_list_options(include_summary))
             .order_by(RaidEvent.starts_at_utc)
         ).unique().scalars().all()
     )
@@ -424,4 +442,5 @@ def duplicate_event(event: RaidEvent, created_by: int, new_starts_at: Optional[d
     )
     db.session.add(new_event)
     db.session.commit()
+    autolock.track_event(new_event)
     return new_event
@@ -0,0 +1,168 @@
+"""Event summary service: materialised signup counts per raid event.
+
+The calendar feed needs signup and per-role fill counts for every event in
+the visible range.  Rather than aggregating LineupSlots on each request,
+the counts live in the ``event_summaries`` table and are refreshed when the
+signup/lineup services change slots.
+
+Services call :func:`mark_dirty` for every event whose slots they touch;
+the affected summaries are recomputed in a single pass just before the
+session commits, so the summary is always written in the same transaction
+as the slot change.
+"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+from sqlalchemy import event as sa_event
+
+from app.extensions import db
+from app.models.raid import EventSummary, RaidEvent
+from app.models.signup import LineupSlot
+
+_DIRTY_KEY = "event_summary_dirty"
+
+
+def _empty_summary() -> dict:
+    return {"signup_count": 0, "going_count": 0, "bench_count": 0, "role_counts": {}}
+
+
+def mark_dirty(raid_event_id: int | None) -> None:
+    """Schedule the summary for *raid_event_id* to be refreshed on commit."""
+    if raid_event_id is None:
+        return
+    db.session.info.setdefault(_DIRTY_KEY, set()).add(raid_event_id)
+
+
+def compute_summaries(raid_event_ids: list[int]) -> dict[int, dict]:
+    """Aggregate LineupSlots for *raid_event_ids* in two grouped queries."""
+    if not raid_event_ids:
+        return {}
+    filled = sa.and_(
+        LineupSlot.raid_event_id.in_(raid_event_ids),
+        LineupSlot.signup_id.isnot(None),
+    )
+    role_rows = db.session.execute(
+        sa.select(
+            LineupSlot.raid_event_id,
+            LineupSlot.slot_group,
+            sa.func.count(sa.distinct(LineupSlot.signup_id)),
+        )
+        .where(filled, LineupSlot.slot_group != "bench")
+        .group_by(LineupSlot.raid_event_id, LineupSlot.slot_group)
+    ).all()
+
+    # A signup can hold a role slot and a bench slot at once; like
+    # lineup_service.build_lineup_status_map, the role slot wins.
+    role_slot = sa.orm.aliased(LineupSlot)
+    has_role_slot = (
+        sa.select(role_slot.id)
+        .where(
+            role_slot.signup_id == LineupSlot.signup_id,
+            role_slot.slot_group != "bench",
+        )
+        .exists()
+    )
+    bench_only = sa.case(
+        (sa.and_(LineupSlot.slot_group == "bench", ~has_role_slot), LineupSlot.signup_id),
+    )
+    count_rows = db.session.execute(
+        sa.select(
+            LineupSlot.raid_event_id,
+            sa.func.count(sa.distinct(LineupSlot.signup_id)),
+            sa.func.count(sa.distinct(bench_only)),
+        )
+        .where(filled)
+        .group_by(LineupSlot.raid_event_id)
+    ).all()
+
+    result = {eid: _empty_summary() for eid in raid_event_ids}
+    for raid_event_id, slot_group, count in role_rows:
+        group = slot_group.value if hasattr(slot_group, "value") else str(slot_group)
+        result[raid_event_id]["role_counts"][group] = count
+    for raid_event_id, signup_count, bench_count in count_rows:
+        summary = result[raid_event_id]
+        summary["signup_count"] = signup_count
+        summary["bench_count"] = bench_count
+        summary["going_count"] = signup_count - bench_count
+    return result
+
+
+def refresh_summaries(raid_event_ids) -> None:
+    """Recompute and upsert summary rows (does not commit)."""
+    ids = list(raid_event_ids)
+    if not ids:
+        return
+    # Skip events deleted in the same transaction
+    existing_ids = set(
+        db.session.execute(
+            sa.select(RaidEvent.id).where(RaidEvent.id.in_(ids))
+        ).scalars().all()
+    )
+    if not existing_ids:
+        return
+    computed = compute_summaries(sorted(existing_ids))
+    rows = {
+        row.raid_event_id: row
+        for row in db.session.execute(
+            sa.select(EventSummary).where(EventSummary.raid_event_id.in_(existing_ids))
+        ).scalars().all()
+    }
+    for raid_event_id, data in computed.items():
+        row = rows.get(raid_event_id)
+        if row is None:
+            row = EventSummary(raid_event_id=raid_event_id)
+            db.session.add(row)
+        row.signup_count = data["signup_count"]
+        row.going_count = data["going_count"]
+        row.bench_count = data["bench_count"]
+        row.role_counts = data["role_counts"]
+
+
+def get_summary(event: RaidEvent) -> dict:
+    """Return the summary dict for a single event."""
+    return summaries_for([event])[event.id]
+
+
+def summaries_for(events: list[RaidEvent]) -> dict[int, dict]:
+    """Return event_id → summary dict for *events*.
+
+    Uses the stored summary rows (eager-loaded by the list queries when
+    requested) and aggregates any events that have no row yet in a single
+    fallback query.
+    """
+    result: dict[int, dict] = {}
+    missing: list[int] = []
+    for event in events:
+        row = event.summary
+        if row is None:
+            missing.append(event.id)
+        else:
+            result[event.id] = row.to_dict()
+    if missing:
+        result.update(compute_summaries(missing))
+    return result
+
+
+def rebuild_all() -> int:
+    """Recompute summaries for every event. Returns the number of events."""
+    ids = list(db.session.execute(sa.select(RaidEvent.id)).scalars().all())
+    refresh_summaries(ids)
+    db.session.commit()
+    return len(ids)
+
+
+# ---------------------------------------------------------------------------
+# Session hooks
+# ---------------------------------------------------------------------------
+
+@sa_event.listens_for(db.session, "before_commit")
+def _refresh_dirty_summaries(session) -> None:
+    dirty = session.info.pop(_DIRTY_KEY, None)
+    if dirty:
+        refresh_summaries(dirty)
+
+
+@sa_event.listens_for(db.session, "after_rollback")
+def _discard_dirty_summaries(session) -> None:
+    session.info.pop(_DIRTY_KEY, None)
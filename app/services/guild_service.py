@@ -9,6 +9,7 @@ import sqlalchemy as sa
 from app.enums import MemberStatus
 from app.extensions import db
 from app.models.guild import Guild, GuildMembership
+from app.utils import request_cache
 
 
 def create_guild(
@@ -102,13 +103,20 @@ def list_all_guilds() -> list[Guild]:
 
 
 def get_user_guild_ids(user_id: int) -> list[int]:
-    """Return a list of guild IDs the user is an active member of."""
-    rows = db.session.execute(
-        sa.select(GuildMembership.guild_id).where(
-            GuildMembership.user_id == user_id,
-            GuildMembership.status == MemberStatus.ACTIVE.value,
-        )
-    ).scalars().all()
+    """Return a list of guild IDs the user is an active member of.
+
+    Memoized for the current request / Socket.IO event.
+    """
+    rows = request_cache.cached(
+        request_cache.NS_USER_GUILDS,
+        user_id,
+        lambda: tuple(db.session.execute(
+            sa.select(GuildMembership.guild_id).where(
+                GuildMembership.user_id == user_id,
+                GuildMembership.status == MemberStatus.ACTIVE.value,
+            )
+        ).scalars().all()),
+    )
     return list(rows)
 
 
@@ -10,7 +10,9 @@ import sqlalchemy as sa
 from app.constants import CLASS_ROLES
 from app.extensions import db
 from app.models.signup import LineupSlot, Signup
+from app.services import change_counter_service, event_summary_service
 from app.utils.class_roles import validate_class_role
+from app.utils.serialization import LINEUP
 
 
 def get_lineup(raid_event_id: int) -> list[LineupSlot]:
@@ -27,29 +29,69 @@ def get_lineup(raid_event_id: int) -> list[LineupSlot]:
     )
 
 
-def _lineup_version(grouped: dict) -> str:
+_GROUP_KEYS = {"main_tank": "main_tanks", "off_tank": "off_tanks", "melee_dps": "melee_dps", "healer": "healers", "range_dps": "range_dps"}
+_ORDER_KEYS = ("main_tanks", "off_tanks", "melee_dps", "healers", "range_dps", "bench_queue")
+
+
+def lineup_version(order: dict[str, list[int]]) -> str:
     """Compute a fingerprint from lineup signup IDs for conflict detection."""
     parts = []
-    for key in ("main_tanks", "off_tanks", "melee_dps", "healers", "range_dps", "bench_queue"):
-        ids = ",".join(str(s["id"]) for s in grouped.get(key, []))
+    for key in _ORDER_KEYS:
+        ids = ",".join(str(signup_id) for signup_id in order.get(key, []))
         parts.append(f"{key}:{ids}")
     return "|".join(parts)
 
 
-def get_lineup_grouped(raid_event_id: int, guild_role_map: dict | None = None) -> dict:
-    """Return lineup grouped by role with full signup data for the frontend."""
+def _lineup_version(grouped: dict) -> str:
+    return lineup_version({key: [s["id"] for s in grouped.get(key, [])] for key in _ORDER_KEYS})
+
+
+def get_lineup_order(raid_event_id: int) -> dict[str, list[int]]:
+    """Return signup IDs per lineup group in slot order, without serialising.
+
+    The keys match :func:`get_lineup_grouped`, so
+    ``lineup_version(get_lineup_order(id))`` equals its ``version``.
+    """
+    rows = db.session.execute(
+        sa.select(LineupSlot.slot_group, LineupSlot.signup_id)
+        .where(
+            LineupSlot.raid_event_id == raid_event_id,
+            LineupSlot.signup_id.isnot(None),
+        )
+        .order_by(LineupSlot.slot_group, LineupSlot.slot_index)
+    ).all()
+    order: dict[str, list[int]] = {key: [] for key in _ORDER_KEYS}
+    for slot_group, signup_id in rows:
+        key = "bench_queue" if slot_group == "bench" else _GROUP_KEYS.get(slot_group, "range_dps")
+        order[key].append(signup_id)
+    return order
+
+
+def get_lineup_grouped(
+    raid_event_id: int,
+    guild_role_map: dict | None = None,
+    view: str = LINEUP,
+) -> dict:
+    """Return lineup grouped by role with signup data for the frontend.
+
+    Signups are serialised with *view* — by default the ``lineup`` profile,
+    which leaves every character's talents and equipment out.
+    """
     slots = get_lineup(raid_event_id)
+    status_map = build_lineup_status_map([raid_event_id])
     grouped: dict[str, list] = {"main_tanks": [], "off_tanks": [], "melee_dps": [], "healers": [], "range_dps": []}
     bench_queue: list = []
-    role_map = {"main_tank": "main_tanks", "off_tank": "off_tanks", "melee_dps": "melee_dps", "healer": "healers", "range_dps": "range_dps"}
     for slot in slots:
+        if slot.signup is None:
+            continue
+        signup_dict = slot.signup.to_dict(
+            guild_role_map=guild_role_map, lineup_status_map=status_map, view=view,
+        )
         if slot.slot_group == "bench":
-            if slot.signup is not None:
-                bench_queue.append(slot.signup.to_dict(guild_role_map=guild_role_map))
+            bench_queue.append(signup_dict)
             continue
-        key = role_map.get(slot.slot_group, "range_dps")
-        if slot.signup is not None:
-            grouped[key].append(slot.signup.to_dict(guild_role_map=guild_role_map))
+        key = _GROUP_KEYS.get(slot.slot_group, "range_dps")
+        grouped[key].append(signup_dict)
     grouped["bench_queue"] = bench_queue
     grouped["version"] = _lineup_version(grouped)
     return grouped
@@ -78,14 +120,20 @@ def auto_assign_slot(signup: Signup) -> None:
         character_id=signup.character_id,
     )
     db.session.add(slot)
+    event_summary_service.mark_dirty(signup.raid_event_id)
     db.session.commit()
 
 
 def remove_slot_for_signup(signup_id: int) -> None:
     """Remove LineupSlot(s) associated with a signup."""
+    signup = db.session.get(Signup, signup_id)
+    if signup is not None:
+        event_summary_service.mark_dirty(signup.raid_event_id)
     db.session.execute(
         sa.delete(LineupSlot).where(LineupSlot.signup_id == signup_id)
     )
+    if signup is not None:
+        change_counter_service.touch(change_counter_service.EVENT, signup.raid_event_id)
     db.session.commit()
 
 
@@ -140,6 +188,67 @@ def get_bench_info(signup_id: int) -> dict | None:
     }
 
 
+def build_lineup_status_map(raid_event_ids: list[int]) -> dict[int, dict]:
+    """Resolve lineup status and bench info for every signup in *raid_event_ids*.
+
+    Loads all LineupSlots for the given events in a single query and derives
+    the same values as :func:`has_role_slot` / :func:`get_bench_info` in
+    memory.  Returns a map of signup_id → ``{lineup_status, bench_info}``;
+    signups without any slot are absent (i.e. declined).
+    """
+    if not raid_event_ids:
+        return {}
+
+    rows = db.session.execute(
+        sa.select(
+            LineupSlot.raid_event_id,
+            LineupSlot.signup_id,
+            LineupSlot.slot_group,
+            LineupSlot.slot_index,
+            Signup.chosen_role,
+        )
+        .join(Signup, Signup.id == LineupSlot.signup_id)
+        .where(LineupSlot.raid_event_id.in_(raid_event_ids))
+    ).all()
+
+    going_ids: set[int] = set()
+    bench_rows = []
+    for row in rows:
+        if row.slot_group == "bench":
+            bench_rows.append(row)
+        else:
+            going_ids.add(row.signup_id)
+
+    # Per-role bench queue positions (1-based, ordered by slot_index)
+    bench_rows.sort(key=lambda r: (r.raid_event_id, r.slot_index))
+    role_counters: dict[tuple[int, str], int] = {}
+    bench_map: dict[int, dict] = {}
+    for row in bench_rows:
+        role = row.chosen_role
+        if role:
+            counter_key = (row.raid_event_id, role)
+            role_counters[counter_key] = role_counters.get(counter_key, 0) + 1
+            position = role_counters[counter_key]
+        else:
+            position = 1
+        bench_map[row.signup_id] = {
+            "waiting_for": role,
+            "queue_position": position,
+        }
+
+    result: dict[int, dict] = {}
+    for signup_id in going_ids | set(bench_map):
+        if signup_id in going_ids:
+            status = "going"
+        else:
+            status = "bench"
+        result[signup_id] = {
+            "lineup_status": status,
+            "bench_info": bench_map.get(signup_id),
+        }
+    return result
+
+
 def update_slot_group_for_signup(signup_id: int, new_slot_group: str) -> None:
     """Update the slot_group for all LineupSlots associated with a signup."""
     slots = list(
@@ -150,6 +259,7 @@ def update_slot_group_for_signup(signup_id: int, new_slot_group: str) -> None:
     for slot in slots:
         slot.slot_group = new_slot_group
         slot.slot_index = _next_slot_index(slot.raid_event_id, new_slot_group)
+        event_summary_service.mark_dirty(slot.raid_event_id)
     db.session.commit()
 
 
@@ -181,6 +291,7 @@ def upsert_slot(
     slot.character_id = character_id
     slot.confirmed_by = confirmed_by
     slot.confirmed_at = datetime.now(timezone.utc)
+    event_summary_service.mark_dirty(raid_event_id)
     db.session.commit()
     return slot
 
@@ -212,8 +323,7 @@ def update_lineup_grouped(
     players whose characters were moved to bench.
     """
     if expected_version is not None:
-        current = get_lineup_grouped(raid_event_id)
-        if current.get("version") != expected_version:
+        if lineup_version(get_lineup_order(raid_event_id)) != expected_version:
             raise LineupConflictError()
 
     # Snapshot which roles had signups before the update so we can detect
@@ -234,9 +344,11 @@ def update_lineup_grouped(
             old_role_signups.setdefault(slot.slot_group, set()).add(slot.signup_id)
 
     # Remove all existing slots for this event
+    event_summary_service.mark_dirty(raid_event_id)
     db.session.execute(
         sa.delete(LineupSlot).where(LineupSlot.raid_event_id == raid_event_id)
     )
+    change_counter_service.touch(change_counter_service.EVENT, raid_event_id)
     db.session.flush()
 
     role_map = {"main_tanks": "main_tank", "off_tanks": "off_tank", "melee_dps": "melee_dps", "healers": "healer", "range_dps": "range_dps"}
@@ -509,6 +621,7 @@ def reorder_bench_queue(
                 .where(LineupSlot.id == slot.id)
                 .values(slot_index=idx)
             )
+    change_counter_service.touch(change_counter_service.EVENT, raid_event_id)
     db.session.commit()
 
     # Expire cached ORM objects so they re-read from DB
@@ -558,4 +671,5 @@ def add_to_bench_queue(signup: Signup) -> None:
         character_id=signup.character_id,
     )
     db.session.add(slot)
+    event_summary_service.mark_dirty(signup.raid_event_id)
     db.session.commit()
@@ -9,6 +9,7 @@ import sqlalchemy as sa
 
 from app.extensions import db
 from app.models.notification import Notification
+from app.services import change_counter_service
 
 
 def create_notification(
@@ -42,6 +43,50 @@ def create_notification(
     return notif
 
 
+def create_notifications(
+    user_ids,
+    notification_type: str,
+    title: str,
+    body: Optional[str] = None,
+    guild_id: Optional[int] = None,
+    raid_event_id: Optional[int] = None,
+    *,
+    title_key: Optional[str] = None,
+    body_key: Optional[str] = None,
+    title_params: Optional[dict] = None,
+    body_params: Optional[dict] = None,
+) -> list[int]:
+    """Create the same notification for many users in one transaction.
+
+    All rows go out as a single executemany INSERT followed by one commit.
+    Duplicate user IDs are collapsed.  Returns the recipient user IDs.
+    """
+    import json as _json
+    recipients = list(dict.fromkeys(user_ids))
+    if not recipients:
+        return []
+    now = datetime.now(timezone.utc)
+    row = {
+        "type": notification_type,
+        "title": title,
+        "body": body,
+        "guild_id": guild_id,
+        "raid_event_id": raid_event_id,
+        "title_key": title_key,
+        "body_key": body_key,
+        "title_params": _json.dumps(title_params) if title_params else None,
+        "body_params": _json.dumps(body_params) if body_params else None,
+        "created_at": now,
+    }
+    db.session.execute(
+        sa.insert(Notification),
+        [{**row, "user_id": uid} for uid in recipients],
+    )
+    change_counter_service.touch(change_counter_service.NOTIFICATIONS, *recipients)
+    db.session.commit()
+    return recipients
+
+
 def list_notifications(user_id: int, *, limit: int = 50, offset: int = 0) -> list[Notification]:
     return list(
         db.session.execute(
@@ -68,6 +113,8 @@ def mark_all_read(user_id: int) -> int:
         .where(Notification.user_id == user_id, Notification.read_at.is_(None))
         .values(read_at=now)
     )
+    if result.rowcount:
+        change_counter_service.touch(change_counter_service.NOTIFICATIONS, user_id)
     db.session.commit()
     return result.rowcount
 
@@ -94,6 +141,8 @@ def delete_notification(notification_id: int, user_id: int) -> bool:
             Notification.user_id == user_id,
         )
     )
+    if result.rowcount:
+        change_counter_service.touch(change_counter_service.NOTIFICATIONS, user_id)
     db.session.commit()
     return result.rowcount > 0
 
@@ -103,5 +152,7 @@ def delete_all_notifications(user_id: int) -> int:
     result = db.session.execute(
         sa.delete(Notification).where(Notification.user_id == user_id)
     )
+    if result.rowcount:
+        change_counter_service.touch(change_counter_service.NOTIFICATIONS, user_id)
     db.session.commit()
     return result.rowcount
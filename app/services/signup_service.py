@@ -117,7 +117,7 @@ def _auto_promote_bench(
     """
     from app.models.character import Character
     from app.models.signup import LineupSlot
-    from app.services import lineup_service
+    from app.services import event_summary_service, lineup_service
     from app.utils.realtime import emit_signups_changed, emit_lineup_changed
 
     if exclude_signup_ids is None:
@@ -143,12 +143,13 @@ def _auto_promote_bench(
         if _user_has_role_slot(raid_event_id, benched.user_id, exclude_signup_id=benched.id):
             continue
         db.session.delete(bench_slot)
+        event_summary_service.mark_dirty(raid_event_id)
         db.session.commit()
         lineup_service.auto_assign_slot(benched)
         # Notify the promoted player and emit real-time updates
         _notify_bench_promotion(benched)
-        emit_signups_changed(raid_event_id)
-        emit_lineup_changed(raid_event_id)
+        emit_signups_changed(raid_event_id, signups=[benched])
+        emit_lineup_changed(raid_event_id, signups=[benched])
         return
 
     # Fallback: no bench queue slots, use created_at ordering
@@ -182,8 +183,8 @@ def _auto_promote_bench(
             lineup_service.auto_assign_slot(candidate)
             # Notify the promoted player and emit real-time updates
             _notify_bench_promotion(candidate)
-            emit_signups_changed(raid_event_id)
-            emit_lineup_changed(raid_event_id)
+            emit_signups_changed(raid_event_id, signups=[candidate])
+            emit_lineup_changed(raid_event_id, signups=[candidate])
             return
 
 
@@ -339,12 +340,22 @@ def decline_signup(signup: Signup) -> Signup:
     return signup
 
 
-def list_signups(raid_event_id: int) -> list[Signup]:
+def list_signups(raid_event_id: int, details: bool = True) -> list[Signup]:
+    """Return an event's signups with their characters.
+
+    *details* also loads each character's talents / equipment in the same
+    query, for callers serialising the ``full`` view.
+    """
+    from app.models.character import Character
+
+    character = sa.orm.joinedload(Signup.character)
+    if details:
+        character = character.joinedload(Character.profile).undefer_group("details")
     return list(
         db.session.execute(
             sa.select(Signup)
             .where(Signup.raid_event_id == raid_event_id)
-            .options(sa.orm.joinedload(Signup.character))
+            .options(character)
         ).scalars().unique().all()
     )
 
@@ -0,0 +1,118 @@
+"""Sync job service: queue admin-triggered armory syncs and track progress.
+
+A manual sync runs as a ``sync_all_characters`` job on the job worker
+instead of inside the admin's HTTP request.  Requesting a sync while one
+covering the same scope is queued or running returns that job rather than
+queueing another; a sync of all guilds covers every per-guild request.
+
+While the job runs, :class:`SyncProgress` records done / total / failed in
+the job's :class:`~app.models.notification.JobProgress` row after every
+committed batch, and streams the same figures to the admin sync Socket.IO
+room.
+"""
+
+from __future__ import annotations
+
+import json
+from datetime import datetime, timezone
+
+import sqlalchemy as sa
+
+from app.enums import JobStatus
+from app.extensions import db
+from app.models.notification import JobProgress, JobQueue
+from app.utils.realtime import emit_sync_progress
+
+JOB_TYPE = "sync_all_characters"
+
+
+def request_sync(guild_id: int | None = None) -> tuple[JobQueue, bool]:
+    """Queue a sync of one guild (or all guilds) unless one is already pending.
+
+    Returns ``(job, created)``; *created* is False when an existing queued or
+    running job already covers the requested scope.
+    """
+    from app.jobs.worker import enqueue_job
+
+    active = db.session.execute(
+        sa.select(JobQueue)
+        .where(
+            JobQueue.type == JOB_TYPE,
+            JobQueue.status.in_([JobStatus.QUEUED.value, JobStatus.RUNNING.value]),
+        )
+        .order_by(JobQueue.id)
+    ).scalars().all()
+    for job in active:
+        payload = job.payload
+        # Incremental (autosync) jobs only take the overdue characters
+        if payload.get("incremental"):
+            continue
+        scope = payload.get("guild_id")
+        if scope is None or scope == guild_id:
+            return job, False
+    return enqueue_job(JOB_TYPE, {"guild_id": guild_id} if guild_id else {}), True
+
+
+def job_status(job_id: int) -> dict | None:
+    """Return the status and progress of a sync job, or None if unknown."""
+    job = db.session.get(JobQueue, job_id)
+    if job is None or job.type != JOB_TYPE:
+        return None
+    progress = db.session.get(JobProgress, job_id)
+    return {
+        "job_id": job.id,
+        "status": job.status,
+        "guild_id": job.payload.get("guild_id"),
+        "attempts": job.attempts,
+        "last_error": job.last_error,
+        "created_at": job.to_dict()["created_at"],
+        "progress": progress.to_dict() if progress else None,
+    }
+
+
+class SyncProgress:
+    """``sync_characters`` progress callback bound to one job."""
+
+    def __init__(self, job_id: int, guild_id: int | None = None) -> None:
+        self.job_id = job_id
+        self.guild_id = guild_id
+
+    def _row(self) -> JobProgress:
+        row = db.session.get(JobProgress, self.job_id)
+        if row is None:
+            row = JobProgress(job_id=self.job_id)
+            db.session.add(row)
+        return row
+
+    def _emit(self, status: str, row: JobProgress | None = None, **extra) -> None:
+        emit_sync_progress({
+            "job_id": self.job_id,
+            "guild_id": self.guild_id,
+            "status": status,
+            "progress": row.to_dict() if row is not None else None,
+            **extra,
+        })
+
+    def __call__(self, stats) -> None:
+        row = self._row()
+        if stats.processed == 0:
+            # (Re)started: a retried job measures its ETA from now
+            row.started_at = datetime.now(timezone.utc)
+            row.result_json = None
+        row.done = stats.processed
+        row.total = stats.characters
+        row.failed = stats.failed + stats.not_found
+        db.session.commit()
+        self._emit(JobStatus.RUNNING.value, row)
+
+    def finish(self, stats) -> None:
+        row = self._row()
+        row.done = stats.processed
+        row.total = stats.characters
+        row.failed = stats.failed + stats.not_found
+        row.result_json = json.dumps(stats.to_dict())
+        db.session.commit()
+        self._emit(JobStatus.DONE.value, row)
+
+    def fail(self, exc: Exception) -> None:
+        self._emit(JobStatus.FAILED.value, error=str(exc))
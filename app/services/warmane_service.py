@@ -1,14 +1,16 @@
 """Warmane armory API client — thin wrapper around the armory provider system.
 
 All logic now lives in :mod:`app.services.armory.warmane`.  This module
-delegates every call to a shared :class:`WarmaneProvider` instance so that
-existing ``from app.services import warmane_service`` imports keep working.
+delegates every call to the registry's shared :class:`WarmaneProvider`
+instance so that existing ``from app.services import warmane_service``
+imports keep working (and share its pooled HTTP session).
 """
 
 from __future__ import annotations
 
 from typing import Optional
 
+from app.services.armory.registry import get_provider
 from app.services.armory.warmane import (
     WarmaneProvider,
     normalize_class_name,
@@ -16,7 +18,7 @@ from app.services.armory.warmane import (
     REQUEST_TIMEOUT,
 )
 
-_provider = WarmaneProvider()
+_provider: WarmaneProvider = get_provider("warmane")
 
 # Re-export constants so callers that reference them directly still work.
 __all__ = [
@@ -5,6 +5,7 @@ Provides common patterns used across API endpoint handlers:
 - Required-field validation
 - Guild-scoped event lookup
 - Guild role map construction
+- Serialization view / field selection
 """
 
 from __future__ import annotations
@@ -54,7 +55,7 @@ def build_guild_role_map(guild_id: int, user_ids: list[int]) -> dict:
     import sqlalchemy as sa
     from app.extensions import db
     from app.models.guild import GuildMembership
-    from app.models.permission import SystemRole
+    from app.utils.permissions import get_role_display_names
 
     if not user_ids:
         return {}
@@ -66,20 +67,35 @@ def build_guild_role_map(guild_id: int, user_ids: list[int]) -> dict:
         )
     ).all()
 
-    role_names = list({m.role for m in memberships})
-    display_map: dict[str, str] = {}
-    if role_names:
-        roles = db.session.execute(
-            sa.select(SystemRole.name, SystemRole.display_name).where(
-                SystemRole.name.in_(role_names)
-            )
-        ).all()
-        display_map = {r.name: r.display_name for r in roles}
+    display_map = get_role_display_names({m.role for m in memberships})
 
     return {
         m.user_id: {
             "role": m.role,
-            "display_name": display_map.get(m.role, m.role.replace("_", " ").title()),
+            "display_name": display_map[m.role],
         }
         for m in memberships
     }
+
+
+def get_view(default: str):
+    """Read the ``?view=`` serialization profile, falling back to *default*.
+
+    Returns ``(view, None)`` on success or ``(None, error_response)`` for an
+    unknown view name.
+    """
+    from app.utils.serialization import VIEWS
+
+    view = request.args.get("view") or default
+    if view not in VIEWS:
+        return None, (jsonify({"error": _t("api.common.invalidView", views=", ".join(VIEWS))}), 400)
+    return view, None
+
+
+def get_fields() -> list[str] | None:
+    """Parse ``?fields=a,b,c`` into a list of top-level keys (or ``None``)."""
+    raw = request.args.get("fields")
+    if not raw:
+        return None
+    return [f.strip() for f in raw.split(",") if f.strip()] or None
+
@@ -0,0 +1,50 @@
+"""Conditional GET support: weak ETags from change counters.
+
+Handlers compute an ETag from the counters their payload depends on and
+return early when the client already has that version::
+
+    etag = etag_for((EVENT, event_id), (GUILD_ROSTER, guild_id))
+    cached = not_modified(etag)
+    if cached is not None:
+        return cached
+    ...
+    return with_etag(jsonify(payload), etag), 200
+
+The tag also covers the request path and query string (so ``?view=`` and
+``?fields=`` variants differ) and the current user.  Responses are marked
+``private, no-cache``: clients may keep them but must revalidate.
+"""
+
+from __future__ import annotations
+
+import hashlib
+
+from flask import Response, request
+from flask_login import current_user
+
+from app.services import change_counter_service
+
+
+def etag_for(*keys: tuple[str, int]) -> str:
+    """Build a weak ETag value from the current versions of *keys*."""
+    current = change_counter_service.versions(keys)
+    digest = hashlib.blake2b(digest_size=12)
+    user_id = current_user.get_id() if current_user.is_authenticated else ""
+    digest.update(f"{request.full_path}|{user_id}".encode())
+    for (scope, scope_id), version in sorted(current.items()):
+        digest.update(f"|{scope}:{scope_id}={version}".encode())
+    return digest.hexdigest()
+
+
+def with_etag(response: Response, etag: str) -> Response:
+    """Attach *etag* (weak) and the revalidation cache policy to *response*."""
+    response.set_etag(etag, weak=True)
+    response.headers["Cache-Control"] = "private, no-cache"
+    return response
+
+
+def not_modified(etag: str) -> Response | None:
+    """Return a 304 response if the request's ``If-None-Match`` matches *etag*."""
+    if not request.if_none_match.contains_weak(etag):
+        return None
+    return with_etag(Response(status=304), etag)
@@ -5,6 +5,14 @@ All notification-creating functions follow the same pattern:
   2. Push a ``notification`` Socket.IO event to the target user so the
      bell badge updates in real time.
 
+Fan-out notifications (event lifecycle, officer alerts) go through
+``_notify_many``, which inserts every recipient's row with one executemany
+and one commit, then pushes to all recipients' rooms in a single emit.
+Pushes go through :func:`app.utils.realtime.emit_notifications`, so the
+per-user pushes of one request are also folded into a single emit.
+With ``NOTIFICATIONS_ASYNC`` enabled the fan-out is instead queued as one
+``send_notification`` job and performed by the job worker.
+
 Notifications store **both** a pre-rendered English fallback (title/body)
 and i18n translation keys + params (title_key/body_key + title_params/body_params).
 The frontend renders notifications using the i18n keys when available,
@@ -33,16 +41,18 @@ Notification types (stored in Notification.type):
 
 from __future__ import annotations
 
-import json as _json
 import logging
 from typing import Optional
 from zoneinfo import ZoneInfo
 
+from flask import current_app
+
 import sqlalchemy as sa
 
-from app.extensions import db, socketio
+from app.extensions import db
 from app.models.guild import GuildMembership
-from app.services.notification_service import create_notification
+from app.services.notification_service import create_notification, create_notifications
+from app.utils.realtime import emit_notifications
 
 log = logging.getLogger(__name__)
 
@@ -53,7 +63,12 @@ log = logging.getLogger(__name__)
 
 def _push_to_user(user_id: int) -> None:
     """Send a Socket.IO ``notification`` event to a specific user's room."""
-    socketio.emit("notification", {}, to=f"user_{user_id}")
+    emit_notifications([user_id])
+
+
+def _push_to_users(user_ids) -> None:
+    """Send one ``notification`` Socket.IO event to several users' rooms."""
+    emit_notifications(user_ids)
 
 
 def _role_name(role) -> str:
@@ -113,22 +128,78 @@ def _notify(
         log.exception("Failed to create notification for user %s", user_id)
 
 
+def _enqueue_notifications(user_ids: list[int], **fields) -> None:
+    """Queue a batched ``send_notification`` job for the job worker."""
+    from app.jobs.worker import enqueue_job
+
+    try:
+        enqueue_job("send_notification", {"user_ids": user_ids, **fields})
+    except Exception:
+        log.exception(
+            "Failed to queue %s notifications for %d users", fields.get("type"), len(user_ids)
+        )
+
+
+def _notify_many(
+    user_ids,
+    notification_type: str,
+    title: str,
+    body: Optional[str] = None,
+    guild_id: Optional[int] = None,
+    raid_event_id: Optional[int] = None,
+    *,
+    title_key: Optional[str] = None,
+    body_key: Optional[str] = None,
+    title_params: Optional[dict] = None,
+    body_params: Optional[dict] = None,
+) -> None:
+    """Create the same notification for many users and push it in one batch."""
+    user_ids = list(dict.fromkeys(user_ids))
+    if not user_ids:
+        return
+    if current_app.config.get("NOTIFICATIONS_ASYNC"):
+        _enqueue_notifications(
+            user_ids,
+            type=notification_type,
+            title=title,
+            body=body,
+            guild_id=guild_id,
+            raid_event_id=raid_event_id,
+            title_key=title_key,
+            body_key=body_key,
+            title_params=title_params,
+            body_params=body_params,
+        )
+        return
+    try:
+        recipients = create_notifications(
+            user_ids,
+            notification_type=notification_type,
+            title=title,
+            body=body,
+            guild_id=guild_id,
+            raid_event_id=raid_event_id,
+            title_key=title_key,
+            body_key=body_key,
+            title_params=title_params,
+            body_params=body_params,
+        )
+        _push_to_users(recipients)
+    except Exception:
+        log.exception(
+            "Failed to create %s notifications for %d users", notification_type, len(user_ids)
+        )
+
+
 def _get_officers(guild_id: int, exclude_user_id: int | None = None) -> list[int]:
     """Return user IDs of members who have the ``manage_signups`` permission.
 
     Uses the dynamic permission system: finds all roles that have the
     ``manage_signups`` permission, then finds guild members with those roles.
     """
-    from app.models.permission import Permission, RolePermission, SystemRole
-
-    # Find all role names that have the manage_signups permission
-    role_names = db.session.execute(
-        sa.select(SystemRole.name)
-        .join(RolePermission, RolePermission.role_id == SystemRole.id)
-        .join(Permission, RolePermission.permission_id == Permission.id)
-        .where(Permission.code == "manage_signups")
-    ).scalars().all()
+    from app.utils.permissions import roles_with_permission
 
+    role_names = roles_with_permission("manage_signups")
     if not role_names:
         return []
 
@@ -333,9 +404,8 @@ def _get_guild_for_event(event) -> object | None:
 
 def notify_event_created(event, guild_id: int) -> None:
     """Notify all guild members that a new event was created."""
-    from app.models.notification import Notification
     from app.models.guild import Guild
-    from datetime import datetime, timezone
+    from datetime import timezone
 
     guild = db.session.get(Guild, guild_id)
     guild_tag = _guild_tag(guild) if guild else ""
@@ -350,38 +420,24 @@ def notify_event_created(event, guild_id: int) -> None:
     except Exception:
         pass
 
-    member_ids = list(db.session.execute(
+    member_ids = db.session.execute(
         sa.select(GuildMembership.user_id).where(
             GuildMembership.guild_id == guild_id,
         )
-    ).scalars().all())
-
-    if not member_ids:
-        return
-
-    t_params = {"eventTitle": event.title, "guildTag": guild_tag}
-    b_params = {"starts": starts}
+    ).scalars().all()
 
-    now = datetime.now(timezone.utc)
-    db.session.bulk_save_objects([
-        Notification(
-            user_id=uid,
-            type="event_created",
-            title=f"📅 New raid scheduled: {event.title} {guild_tag}",
-            body=f"A new raid has been scheduled{starts}. Sign up now!",
-            guild_id=guild_id,
-            raid_event_id=event.id,
-            created_at=now,
-            title_key="notify.eventCreated.title",
-            body_key="notify.eventCreated.body",
-            title_params=_json.dumps(t_params),
-            body_params=_json.dumps(b_params),
-        )
-        for uid in member_ids
-    ])
-    db.session.commit()
-    for uid in member_ids:
-        _push_to_user(uid)
+    _notify_many(
+        member_ids,
+        notification_type="event_created",
+        title=f"📅 New raid scheduled: {event.title} {guild_tag}",
+        body=f"A new raid has been scheduled{starts}. Sign up now!",
+        guild_id=guild_id,
+        raid_event_id=event.id,
+        title_key="notify.eventCreated.title",
+        body_key="notify.eventCreated.body",
+        title_params={"eventTitle": event.title, "guildTag": guild_tag},
+        body_params={"starts": starts},
+    )
 
 
 def _get_signed_up_users(event_id: int) -> list[int]:
@@ -397,73 +453,69 @@ def _get_signed_up_users(event_id: int) -> list[int]:
 def notify_event_cancelled(event) -> None:
     """Notify all signed-up players that the event was cancelled."""
     etag = _event_tag(event)
-    for uid in _get_signed_up_users(event.id):
-        _notify(
-            user_id=uid,
-            notification_type="event_cancelled",
-            title=f"❌ Raid cancelled: {etag}",
-            body=f"The raid \"{event.title}\" has been cancelled.",
-            guild_id=event.guild_id,
-            raid_event_id=event.id,
-            title_key="notify.eventCancelled.title",
-            body_key="notify.eventCancelled.body",
-            title_params={"event": etag},
-            body_params={"eventTitle": event.title},
-        )
+    _notify_many(
+        _get_signed_up_users(event.id),
+        notification_type="event_cancelled",
+        title=f"❌ Raid cancelled: {etag}",
+        body=f"The raid \"{event.title}\" has been cancelled.",
+        guild_id=event.guild_id,
+        raid_event_id=event.id,
+        title_key="notify.eventCancelled.title",
+        body_key="notify.eventCancelled.body",
+        title_params={"event": etag},
+        body_params={"eventTitle": event.title},
+    )
 
 
 def notify_event_locked(event) -> None:
     """Notify all signed-up players that signups are now closed."""
     etag = _event_tag(event)
-    for uid in _get_signed_up_users(event.id):
-        _notify(
-            user_id=uid,
-            notification_type="event_locked",
-            title=f"🔒 Signups closed: {etag}",
-            body=f"Signups are now closed for \"{event.title}\". The roster is being finalized.",
-            guild_id=event.guild_id,
-            raid_event_id=event.id,
-            title_key="notify.eventLocked.title",
-            body_key="notify.eventLocked.body",
-            title_params={"event": etag},
-            body_params={"eventTitle": event.title},
-        )
+    _notify_many(
+        _get_signed_up_users(event.id),
+        notification_type="event_locked",
+        title=f"🔒 Signups closed: {etag}",
+        body=f"Signups are now closed for \"{event.title}\". The roster is being finalized.",
+        guild_id=event.guild_id,
+        raid_event_id=event.id,
+        title_key="notify.eventLocked.title",
+        body_key="notify.eventLocked.body",
+        title_params={"event": etag},
+        body_params={"eventTitle": event.title},
+    )
 
 
 def notify_event_updated(event) -> None:
     """Notify all signed-up players that event details changed."""
     etag = _event_tag(event)
-    for uid in _get_signed_up_users(event.id):
-        _notify(
-            user_id=uid,
-            notification_type="event_updated",
-            title=f"✏️ Raid updated: {etag}",
-            body=f"Event details for \"{event.title}\" have been updated. Check for any schedule or roster changes.",
-            guild_id=event.guild_id,
-            raid_event_id=event.id,
-            title_key="notify.eventUpdated.title",
-            body_key="notify.eventUpdated.body",
-            title_params={"event": etag},
-            body_params={"eventTitle": event.title},
-        )
+    _notify_many(
+        _get_signed_up_users(event.id),
+        notification_type="event_updated",
+        title=f"✏️ Raid updated: {etag}",
+        body=f"Event details for \"{event.title}\" have been updated. Check for any schedule or roster changes.",
+        guild_id=event.guild_id,
+        raid_event_id=event.id,
+        title_key="notify.eventUpdated.title",
+        body_key="notify.eventUpdated.body",
+        title_params={"event": etag},
+        body_params={"eventTitle": event.title},
+    )
 
 
 def notify_event_completed(event) -> None:
     """Notify all signed-up players that the event was completed."""
     etag = _event_tag(event)
-    for uid in _get_signed_up_users(event.id):
-        _notify(
-            user_id=uid,
-            notification_type="event_completed",
-            title=f"✅ Raid completed: {etag}",
-            body=f"The raid \"{event.title}\" has been marked as completed. GG!",
-            guild_id=event.guild_id,
-            raid_event_id=event.id,
-            title_key="notify.eventCompleted.title",
-            body_key="notify.eventCompleted.body",
-            title_params={"event": etag},
-            body_params={"eventTitle": event.title},
-        )
+    _notify_many(
+        _get_signed_up_users(event.id),
+        notification_type="event_completed",
+        title=f"✅ Raid completed: {etag}",
+        body=f"The raid \"{event.title}\" has been marked as completed. GG!",
+        guild_id=event.guild_id,
+        raid_event_id=event.id,
+        title_key="notify.eventCompleted.title",
+        body_key="notify.eventCompleted.body",
+        title_params={"event": etag},
+        body_params={"eventTitle": event.title},
+    )
 
 
 # ---------------------------------------------------------------------------
@@ -473,18 +525,17 @@ def notify_event_completed(event) -> None:
 def notify_member_joined_guild(user_id: int, guild) -> None:
     """Notify officers that a new member joined the guild."""
     tag = _guild_tag(guild)
-    for officer_id in _get_officers(guild.id, exclude_user_id=user_id):
-        _notify(
-            user_id=officer_id,
-            notification_type="guild_member_joined",
-            title=f"👤 New member joined {guild.name} {tag}",
-            body="A new member has joined your guild.",
-            guild_id=guild.id,
-            title_key="notify.memberJoined.title",
-            body_key="notify.memberJoined.body",
-            title_params={"guildName": guild.name, "guildTag": tag},
-            body_params={},
-        )
+    _notify_many(
+        _get_officers(guild.id, exclude_user_id=user_id),
+        notification_type="guild_member_joined",
+        title=f"👤 New member joined {guild.name} {tag}",
+        body="A new member has joined your guild.",
+        guild_id=guild.id,
+        title_key="notify.memberJoined.title",
+        body_key="notify.memberJoined.body",
+        title_params={"guildName": guild.name, "guildTag": tag},
+        body_params={},
+    )
 
 
 def notify_removed_from_guild(user_id: int, guild) -> None:
@@ -505,12 +556,8 @@ def notify_removed_from_guild(user_id: int, guild) -> None:
 
 def notify_guild_role_changed(user_id: int, guild, new_role: str) -> None:
     """Notify a user that their guild role was changed."""
-    # Look up the display name for the new role
-    from app.models.permission import SystemRole
-    display_name = db.session.execute(
-        sa.select(SystemRole.display_name).where(SystemRole.name == new_role)
-    ).scalar_one_or_none()
-    display = display_name if display_name else new_role.replace("_", " ").title()
+    from app.utils.permissions import get_role_display_names
+    display = get_role_display_names([new_role])[new_role]
     tag = _guild_tag(guild)
     _notify(
         user_id=user_id,
@@ -532,37 +579,35 @@ def notify_guild_role_changed(user_id: int, guild, new_role: str) -> None:
 def notify_officers_new_signup(signup, event, character_name: str) -> None:
     """Notify officers that someone signed up for a raid."""
     role = _role_name(signup.chosen_role)
-    for officer_id in _get_officers(event.guild_id, exclude_user_id=signup.user_id):
-        _notify(
-            user_id=officer_id,
-            notification_type="officer_signup_new",
-            title=f"{character_name} signed up for {event.title}",
-            body=f"{character_name} signed up as {role} for {event.title}.",
-            guild_id=event.guild_id,
-            raid_event_id=event.id,
-            title_key="notify.officerNewSignup.title",
-            body_key="notify.officerNewSignup.body",
-            title_params={"character": character_name, "eventTitle": event.title},
-            body_params={"character": character_name, "role": role, "eventTitle": event.title},
-        )
+    _notify_many(
+        _get_officers(event.guild_id, exclude_user_id=signup.user_id),
+        notification_type="officer_signup_new",
+        title=f"{character_name} signed up for {event.title}",
+        body=f"{character_name} signed up as {role} for {event.title}.",
+        guild_id=event.guild_id,
+        raid_event_id=event.id,
+        title_key="notify.officerNewSignup.title",
+        body_key="notify.officerNewSignup.body",
+        title_params={"character": character_name, "eventTitle": event.title},
+        body_params={"character": character_name, "role": role, "eventTitle": event.title},
+    )
 
 
 def notify_officers_signup_left(signup, event, character_name: str) -> None:
     """Notify officers that someone left/declined a raid."""
     role = _role_name(signup.chosen_role)
-    for officer_id in _get_officers(event.guild_id, exclude_user_id=signup.user_id):
-        _notify(
-            user_id=officer_id,
-            notification_type="officer_signup_left",
-            title=f"{character_name} left {event.title}",
-            body=f"{character_name} (previously {role}) left {event.title}.",
-            guild_id=event.guild_id,
-            raid_event_id=event.id,
-            title_key="notify.officerSignupLeft.title",
-            body_key="notify.officerSignupLeft.body",
-            title_params={"character": character_name, "eventTitle": event.title},
-            body_params={"character": character_name, "role": role, "eventTitle": event.title},
-        )
+    _notify_many(
+        _get_officers(event.guild_id, exclude_user_id=signup.user_id),
+        notification_type="officer_signup_left",
+        title=f"{character_name} left {event.title}",
+        body=f"{character_name} (previously {role}) left {event.title}.",
+        guild_id=event.guild_id,
+        raid_event_id=event.id,
+        title_key="notify.officerSignupLeft.title",
+        body_key="notify.officerSignupLeft.body",
+        title_params={"character": character_name, "eventTitle": event.title},
+        body_params={"character": character_name, "role": role, "eventTitle": event.title},
+    )
 
 
 def notify_officers_signup_withdrawn(
@@ -570,36 +615,34 @@ def notify_officers_signup_withdrawn(
 ) -> None:
     """Notify officers that a player withdrew from a raid (post-deletion)."""
     role_label = _role_name(role)
-    for officer_id in _get_officers(event.guild_id, exclude_user_id=user_id):
-        _notify(
-            user_id=officer_id,
-            notification_type="officer_signup_left",
-            title=f"{character_name} left {event.title}",
-            body=f"{character_name} (previously {role_label}) withdrew from {event.title}.",
-            guild_id=event.guild_id,
-            raid_event_id=event.id,
-            title_key="notify.officerSignupLeft.title",
-            body_key="notify.officerSignupWithdrawn.body",
-            title_params={"character": character_name, "eventTitle": event.title},
-            body_params={"character": character_name, "role": role_label, "eventTitle": event.title},
-        )
+    _notify_many(
+        _get_officers(event.guild_id, exclude_user_id=user_id),
+        notification_type="officer_signup_left",
+        title=f"{character_name} left {event.title}",
+        body=f"{character_name} (previously {role_label}) withdrew from {event.title}.",
+        guild_id=event.guild_id,
+        raid_event_id=event.id,
+        title_key="notify.officerSignupLeft.title",
+        body_key="notify.officerSignupWithdrawn.body",
+        title_params={"character": character_name, "eventTitle": event.title},
+        body_params={"character": character_name, "role": role_label, "eventTitle": event.title},
+    )
 
 
 def notify_officers_lineup_changed(event, changed_by_user_id: int) -> None:
     """Notify other officers that the lineup was modified."""
-    for officer_id in _get_officers(event.guild_id, exclude_user_id=changed_by_user_id):
-        _notify(
-            user_id=officer_id,
-            notification_type="officer_lineup_changed",
-            title=f"Lineup updated for {event.title}",
-            body=f"Another officer has modified the raid lineup for {event.title}.",
-            guild_id=event.guild_id,
-            raid_event_id=event.id,
-            title_key="notify.officerLineupChanged.title",
-            body_key="notify.officerLineupChanged.body",
-            title_params={"eventTitle": event.title},
-            body_params={"eventTitle": event.title},
-        )
+    _notify_many(
+        _get_officers(event.guild_id, exclude_user_id=changed_by_user_id),
+        notification_type="officer_lineup_changed",
+        title=f"Lineup updated for {event.title}",
+        body=f"Another officer has modified the raid lineup for {event.title}.",
+        guild_id=event.guild_id,
+        raid_event_id=event.id,
+        title_key="notify.officerLineupChanged.title",
+        body_key="notify.officerLineupChanged.body",
+        title_params={"eventTitle": event.title},
+        body_params={"eventTitle": event.title},
+    )
 
 
 # ---------------------------------------------------------------------------
@@ -2,26 +2,192 @@
 
 This module provides dynamic permission checking based on the SystemRole /
 Permission / RolePermission models.
+
+Role → permission codes and role → grantable roles are held in an
+in-process snapshot of frozensets, so permission checks normally cost no
+queries.  The snapshot is rebuilt lazily whenever the permission version
+changes.  The version has two parts: a process-local counter bumped by
+:func:`invalidate_permission_cache` (called by the roles API and
+automatically whenever role/permission rows are written through the ORM),
+and the shared ``permissions`` change counter
+(:mod:`app.services.change_counter_service`), bumped in the same
+transaction as those writes.  The shared counter is read once per request,
+so edits made by other worker processes apply from their next request.
+
+Memberships and role display names are memoized per request / Socket.IO
+event via :mod:`app.utils.request_cache`.
 """
 
 from __future__ import annotations
 
+import threading
+from dataclasses import dataclass
+
 from flask_login import current_user
 
 import sqlalchemy as sa
+from sqlalchemy import event as sa_event
 
 from app.enums import MemberStatus
 from app.extensions import db
 from app.models.guild import GuildMembership
 from app.models.permission import Permission, RolePermission, SystemRole, RoleGrantRule
+from app.utils import request_cache
+
+NS_PERMISSION_VERSION = "permission_version"
+_ROLE_MODELS = (SystemRole, Permission, RolePermission, RoleGrantRule)
+_SESSION_FLAG = "permissions_changed"
+_MEMBERS_FLAG = "memberships_changed"
+
+
+# ---------------------------------------------------------------------------
+# Permission snapshot
+# ---------------------------------------------------------------------------
+
+@dataclass(frozen=True)
+class _PermissionSnapshot:
+    version: tuple[int, int]
+    all_codes: frozenset[str]
+    role_permissions: dict[str, frozenset[str]]
+    role_grants: dict[str, frozenset[str]]
+
+
+_lock = threading.Lock()
+_version = 0
+_snapshot: _PermissionSnapshot | None = None
+
+
+def invalidate_permission_cache() -> None:
+    """Bump the permission version so the next check reloads the snapshot."""
+    global _version
+    with _lock:
+        _version += 1
+
+
+def reset_permission_cache() -> None:
+    """Drop the cached snapshot entirely (used by tests between databases)."""
+    global _snapshot
+    with _lock:
+        _snapshot = None
+
+
+def _shared_version() -> int:
+    """Return the database-backed permission version, read once per request."""
+    from app.services import change_counter_service as counters
+
+    return request_cache.cached(
+        NS_PERMISSION_VERSION, None,
+        lambda: counters.versions([counters.PERMISSIONS_KEY])[counters.PERMISSIONS_KEY],
+    )
+
+
+def _load_snapshot(version: tuple[int, int]) -> _PermissionSnapshot:
+    all_codes = frozenset(db.session.execute(sa.select(Permission.code)).scalars().all())
+    role_names = db.session.execute(sa.select(SystemRole.name)).scalars().all()
+
+    perms: dict[str, set[str]] = {name: set() for name in role_names}
+    for role_name, code in db.session.execute(
+        sa.select(SystemRole.name, Permission.code)
+        .select_from(RolePermission)
+        .join(SystemRole, RolePermission.role_id == SystemRole.id)
+        .join(Permission, RolePermission.permission_id == Permission.id)
+    ).all():
+        perms.setdefault(role_name, set()).add(code)
+
+    granter = sa.orm.aliased(SystemRole)
+    grantee = sa.orm.aliased(SystemRole)
+    grants: dict[str, set[str]] = {}
+    for granter_name, grantee_name in db.session.execute(
+        sa.select(granter.name, grantee.name)
+        .select_from(RoleGrantRule)
+        .join(granter, RoleGrantRule.granter_role_id == granter.id)
+        .join(grantee, RoleGrantRule.grantee_role_id == grantee.id)
+    ).all():
+        grants.setdefault(granter_name, set()).add(grantee_name)
+
+    return _PermissionSnapshot(
+        version=version,
+        all_codes=all_codes,
+        role_permissions={k: frozenset(v) for k, v in perms.items()},
+        role_grants={k: frozenset(v) for k, v in grants.items()},
+    )
+
+
+def _get_snapshot() -> _PermissionSnapshot:
+    global _snapshot
+    snap = _snapshot
+    version = (_version, _shared_version())
+    if snap is not None and snap.version == version:
+        return snap
+    snap = _load_snapshot(version)
+    with _lock:
+        # Keep the newer snapshot if a concurrent reload already won
+        if _snapshot is None or _snapshot.version <= snap.version:
+            _snapshot = snap
+    return snap
+
+
+def role_permission_codes(role_name: str | None) -> frozenset[str]:
+    """Return the permission codes granted to *role_name*."""
+    if role_name is None:
+        return frozenset()
+    return _get_snapshot().role_permissions.get(role_name, frozenset())
+
+
+def roles_with_permission(permission_code: str) -> list[str]:
+    """Return the names of all roles that grant *permission_code*."""
+    return sorted(
+        name for name, codes in _get_snapshot().role_permissions.items()
+        if permission_code in codes
+    )
+
+
+# ---------------------------------------------------------------------------
+# Request-scoped membership cache
+# ---------------------------------------------------------------------------
+
+def invalidate_membership_cache() -> None:
+    """Forget memberships and guild IDs memoized for the current request.
+
+    Called automatically when GuildMembership rows are written through the
+    ORM; call it explicitly after bulk UPDATE/DELETE statements.
+    """
+    request_cache.invalidate(request_cache.NS_MEMBERSHIP, request_cache.NS_USER_GUILDS)
+
+
+@sa_event.listens_for(db.session, "after_flush")
+def _track_role_writes(session, flush_context) -> None:
+    roles_changed = members_changed = False
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(obj, GuildMembership):
+            members_changed = True
+        elif isinstance(obj, _ROLE_MODELS):
+            roles_changed = True
+    if roles_changed:
+        session.info[_SESSION_FLAG] = True
+        # Visible to this session straight away; bumped again on commit
+        invalidate_permission_cache()
+        request_cache.invalidate(request_cache.NS_ROLE_NAMES)
+    if members_changed:
+        session.info[_MEMBERS_FLAG] = True
+        invalidate_membership_cache()
+
+
+@sa_event.listens_for(db.session, "after_commit")
+@sa_event.listens_for(db.session, "after_rollback")
+def _bump_on_transaction_end(session) -> None:
+    if session.info.pop(_SESSION_FLAG, False):
+        invalidate_permission_cache()
+        request_cache.invalidate(request_cache.NS_ROLE_NAMES)
+    if session.info.pop(_MEMBERS_FLAG, False):
+        invalidate_membership_cache()
 
 
 # ---------------------------------------------------------------------------
 # Core helpers
 # ---------------------------------------------------------------------------
 
-def get_membership(guild_id: int, user_id: int) -> GuildMembership | None:
-    """Return the active guild membership for a user, or None."""
+def _load_membership(guild_id: int, user_id: int) -> GuildMembership | None:
     return db.session.execute(
         sa.select(GuildMembership).where(
             GuildMembership.guild_id == guild_id,
@@ -31,6 +197,44 @@ def get_membership(guild_id: int, user_id: int) -> GuildMembership | None:
     ).scalar_one_or_none()
 
 
+def get_membership(guild_id: int, user_id: int) -> GuildMembership | None:
+    """Return the active guild membership for a user, or None.
+
+    Memoized for the current request / Socket.IO event.
+    """
+    membership = request_cache.cached(
+        request_cache.NS_MEMBERSHIP,
+        (guild_id, user_id),
+        lambda: _load_membership(guild_id, user_id),
+    )
+    if membership is not None and (
+        membership in db.session.deleted
+        or membership.status != MemberStatus.ACTIVE.value
+    ):
+        # Changed in this session but not flushed yet
+        return _load_membership(guild_id, user_id)
+    return membership
+
+
+def get_role_display_names(role_names) -> dict[str, str]:
+    """Return role name → display name, memoized for the current request.
+
+    Roles without a SystemRole row fall back to a title-cased name.
+    """
+    def _load(names: list[str]) -> dict[str, str]:
+        return dict(db.session.execute(
+            sa.select(SystemRole.name, SystemRole.display_name).where(
+                SystemRole.name.in_(names)
+            )
+        ).all())
+
+    found = request_cache.cached_many(request_cache.NS_ROLE_NAMES, role_names, _load)
+    return {
+        name: display or name.replace("_", " ").title()
+        for name, display in found.items()
+    }
+
+
 def has_permission(membership: GuildMembership | None, permission_code: str) -> bool:
     """Check if the user's role grants a specific permission.
 
@@ -40,21 +244,7 @@ def has_permission(membership: GuildMembership | None, permission_code: str) ->
         return True
     if membership is None:
         return False
-
-    # Query: does the role assigned to this membership have the permission?
-    result = db.session.execute(
-        sa.select(sa.literal(1))
-        .select_from(RolePermission)
-        .join(SystemRole, RolePermission.role_id == SystemRole.id)
-        .join(Permission, RolePermission.permission_id == Permission.id)
-        .where(
-            SystemRole.name == membership.role,
-            Permission.code == permission_code,
-        )
-        .limit(1)
-    ).scalar_one_or_none()
-
-    return result is not None
+    return permission_code in role_permission_codes(membership.role)
 
 
 def has_any_guild_permission(user_id: int, permission_code: str) -> bool:
@@ -66,33 +256,19 @@ def has_any_guild_permission(user_id: int, permission_code: str) -> bool:
     if current_user and getattr(current_user, "is_admin", False):
         return True
 
-    # Find all active memberships for this user
-    memberships = db.session.execute(
-        sa.select(GuildMembership).where(
+    # Find the roles of all active memberships for this user
+    roles = db.session.execute(
+        sa.select(GuildMembership.role).where(
             GuildMembership.user_id == user_id,
             GuildMembership.status == MemberStatus.ACTIVE.value,
         )
     ).scalars().all()
 
     # If user has no memberships, check the default "member" role
-    if not memberships:
-        result = db.session.execute(
-            sa.select(sa.literal(1))
-            .select_from(RolePermission)
-            .join(SystemRole, RolePermission.role_id == SystemRole.id)
-            .join(Permission, RolePermission.permission_id == Permission.id)
-            .where(
-                SystemRole.name == "member",
-                Permission.code == permission_code,
-            )
-            .limit(1)
-        ).scalar_one_or_none()
-        return result is not None
+    if not roles:
+        roles = ["member"]
 
-    for m in memberships:
-        if has_permission(m, permission_code):
-            return True
-    return False
+    return any(permission_code in role_permission_codes(r) for r in roles)
 
 
 def get_user_permissions(membership: GuildMembership | None) -> list[str]:
@@ -101,19 +277,10 @@ def get_user_permissions(membership: GuildMembership | None) -> list[str]:
     Site admins get all permissions.
     """
     if current_user and getattr(current_user, "is_admin", False):
-        rows = db.session.execute(sa.select(Permission.code)).scalars().all()
-        return list(rows)
+        return sorted(_get_snapshot().all_codes)
     if membership is None:
         return []
-
-    rows = db.session.execute(
-        sa.select(Permission.code)
-        .select_from(RolePermission)
-        .join(SystemRole, RolePermission.role_id == SystemRole.id)
-        .join(Permission, RolePermission.permission_id == Permission.id)
-        .where(SystemRole.name == membership.role)
-    ).scalars().all()
-    return list(rows)
+    return sorted(role_permission_codes(membership.role))
 
 
 def can_grant_role(membership: GuildMembership | None, target_role_name: str) -> bool:
@@ -125,23 +292,5 @@ def can_grant_role(membership: GuildMembership | None, target_role_name: str) ->
         return True
     if membership is None:
         return False
-
-    # Fetch the target role ID first, then check grant rules
-    target_role = db.session.execute(
-        sa.select(SystemRole).where(SystemRole.name == target_role_name)
-    ).scalar_one_or_none()
-    if target_role is None:
-        return False
-
-    granter = sa.orm.aliased(SystemRole)
-    result = db.session.execute(
-        sa.select(sa.literal(1))
-        .select_from(RoleGrantRule)
-        .join(granter, RoleGrantRule.granter_role_id == granter.id)
-        .where(
-            granter.name == membership.role,
-            RoleGrantRule.grantee_role_id == target_role.id,
-        )
-        .limit(1)
-    ).scalar_one_or_none()
-    return result is not None
+    grants = _get_snapshot().role_grants.get(membership.role, frozenset())
+    return target_role_name in grants
@@ -1,50 +1,278 @@
-"""Simple in-memory rate limiter for auth endpoints.
+"""Rate limiter for API endpoints (GCRA).
 
-Uses a sliding-window counter per IP address.  Suitable for the
-single-worker gevent deployment used by this application.
+Each key (route + client IP, or route + account) stores a single number,
+its *theoretical arrival time* (TAT), as in the generic cell rate
+algorithm: a limit of ``limit`` requests per ``window`` seconds admits one
+request every ``window / limit`` seconds with bursts of up to ``limit``.
+A request is allowed when pushing the TAT one interval forward keeps it
+within ``window`` of now.  Memory per key is constant and a decision is a
+dictionary lookup and a few float operations.
 
-The limiter is intentionally simple: no external dependencies (Redis,
-memcached) required.  State is lost on restart, which is acceptable
-since brute-force attacks are the primary threat model.
+Storage is pluggable (``RATE_LIMIT_BACKEND``):
+
+* ``memory`` (default) — :class:`MemoryStore`, per process, LRU-bounded
+  to ``RATE_LIMIT_MAX_KEYS`` keys.
+* ``sqlite`` — :class:`SQLiteStore`, a standalone SQLite file shared by
+  every process on the host.
+* ``database`` — :class:`DatabaseStore`, the ``rate_limit_buckets`` table
+  of the app database, shared by every process that uses it.
+
+Configured from the app config by :func:`init_rate_limiter`.
 """
 
 from __future__ import annotations
 
-import time
+import abc
+import math
+import sqlite3
 import threading
+import time
+from collections import OrderedDict
 from functools import wraps
-from typing import Callable
+from typing import Callable, Optional
 
+import sqlalchemy as sa
 from flask import jsonify, request
 
 from app.i18n import _t
 
-# threading.Lock is monkey-patched by gevent, so it works correctly
-# with cooperative greenlets in the single-worker deployment.
-_lock = threading.Lock()
-_hits: dict[str, list[float]] = {}
-
 # Defaults: 10 requests per 60-second window
 DEFAULT_LIMIT = 10
 DEFAULT_WINDOW = 60  # seconds
+DEFAULT_MAX_KEYS = 10000
+
+# Shared stores drop keys whose TAT has passed (they hold no state) this often
+_PRUNE_INTERVAL = 60  # seconds
+
+
+def _gcra(tat: Optional[float], now: float, interval: float, window: float) -> tuple[float, float]:
+    """Return ``(new_tat, retry_after)``; ``retry_after == 0`` means allowed."""
+    new_tat = max(tat or now, now) + interval
+    excess = new_tat - now - window
+    if excess > 0:
+        return tat, excess
+    return new_tat, 0.0
+
+
+# ---------------------------------------------------------------------------
+# Stores
+# ---------------------------------------------------------------------------
+
+class RateLimitStore(abc.ABC):
+    """Storage backend for :class:`RateLimiter`."""
+
+    @abc.abstractmethod
+    def hit(self, key: str, interval: float, window: float) -> float:
+        """Count a request against *key*; return 0 if allowed, else seconds to wait."""
+
+    @abc.abstractmethod
+    def clear(self) -> None:
+        """Remove every key."""
+
+    @abc.abstractmethod
+    def __len__(self) -> int:
+        ...
+
+
+class MemoryStore(RateLimitStore):
+    """In-process store; least recently used keys are evicted beyond *max_keys*."""
 
-# Periodic cleanup threshold
-_CLEANUP_INTERVAL = 300  # 5 minutes
-_last_cleanup: float = 0.0
+    def __init__(self, max_keys: int = DEFAULT_MAX_KEYS, clock: Callable[[], float] = time.monotonic) -> None:
+        self.max_keys = max(1, max_keys)
+        self._tats: OrderedDict[str, float] = OrderedDict()
+        self._clock = clock
+        # threading.Lock is monkey-patched by gevent, so it works correctly
+        # with cooperative greenlets.
+        self._lock = threading.Lock()
+
+    def hit(self, key: str, interval: float, window: float) -> float:
+        # Hot path: explicit acquire/release and a bound clock are
+        # measurably cheaper than ``with`` and a module attribute lookup
+        tats = self._tats
+        self._lock.acquire()
+        try:
+            now = self._clock()
+            tat = tats.get(key, now)
+            if tat < now:
+                tat = now
+            tat += interval
+            if tat - now > window:
+                # Still recently used: a throttled key must not age out first
+                tats.move_to_end(key)
+                return tat - now - window
+            tats[key] = tat
+            tats.move_to_end(key)
+            if len(tats) > self.max_keys:
+                tats.popitem(last=False)
+            return 0.0
+        finally:
+            self._lock.release()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._tats.clear()
+
+    def __len__(self) -> int:
+        return len(self._tats)
+
+
+class SQLiteStore(RateLimitStore):
+    """Store in a standalone SQLite file, shared across processes on one host.
+
+    Shared stores keep wall-clock TATs, comparable between processes.
+    """
+
+    def __init__(self, path: str) -> None:
+        self._lock = threading.Lock()
+        self._next_prune = 0.0
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=5)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS rate_limit_buckets (key TEXT PRIMARY KEY, tat REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS ix_rate_limit_buckets_tat ON rate_limit_buckets (tat)"
+        )
+
+    def hit(self, key: str, interval: float, window: float) -> float:
+        now = time.time()
+        with self._lock:
+            # IMMEDIATE takes the write lock up front: read-modify-write is atomic
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._conn.execute(
+                    "SELECT tat FROM rate_limit_buckets WHERE key = ?", (key,)
+                ).fetchone()
+                tat, retry_after = _gcra(row[0] if row else None, now, interval, window)
+                if not retry_after:
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO rate_limit_buckets (key, tat) VALUES (?, ?)", (key, tat),
+                    )
+                if now >= self._next_prune:
+                    self._next_prune = now + _PRUNE_INTERVAL
+                    self._conn.execute("DELETE FROM rate_limit_buckets WHERE tat < ?", (now,))
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        return retry_after
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM rate_limit_buckets")
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM rate_limit_buckets").fetchone()[0]
+
+
+class DatabaseStore(RateLimitStore):
+    """Store in the app database (:class:`~app.models.rate_limit.RateLimitBucket`).
+
+    Shared by every process and host using the database.  The TAT is advanced
+    with one conditional UPDATE, so concurrent requests cannot both take the
+    last slot; a key's first request INSERTs and a lost insert race falls
+    back to the UPDATE.  Runs on its own connection, outside the request's
+    session transaction.
+    """
 
+    def __init__(self, engine: sa.Engine | None = None) -> None:
+        from app.models.rate_limit import RateLimitBucket
 
-def _cleanup_expired(window: int) -> None:
-    """Remove entries older than *window* seconds to prevent memory growth."""
-    global _last_cleanup
-    now = time.monotonic()
-    if now - _last_cleanup < _CLEANUP_INTERVAL:
-        return
-    _last_cleanup = now
-    cutoff = now - window
-    expired_keys = [k for k, ts in _hits.items() if not ts or ts[-1] < cutoff]
-    for k in expired_keys:
-        _hits.pop(k, None)
+        self.table = RateLimitBucket.__table__
+        self._engine = engine
+        self._next_prune = 0.0
 
+    @property
+    def engine(self) -> sa.Engine:
+        if self._engine is not None:
+            return self._engine
+        from app.extensions import db
+        return db.engine
+
+    def _advance(self, conn, key: str, interval: float, window: float, now: float) -> bool:
+        t = self.table
+        start = sa.case((t.c.tat > now, t.c.tat), else_=now)
+        return conn.execute(
+            sa.update(t)
+            .where(t.c.key == key, start + interval - now <= window)
+            .values(tat=start + interval)
+        ).rowcount == 1
+
+    def hit(self, key: str, interval: float, window: float) -> float:
+        t = self.table
+        now = time.time()
+        with self.engine.begin() as conn:
+            if now >= self._next_prune:
+                self._next_prune = now + _PRUNE_INTERVAL
+                conn.execute(sa.delete(t).where(t.c.tat < now))
+            if self._advance(conn, key, interval, window, now):
+                return 0.0
+            tat = conn.execute(sa.select(t.c.tat).where(t.c.key == key)).scalar()
+            if tat is None:
+                try:
+                    with conn.begin_nested():
+                        conn.execute(sa.insert(t).values(key=key, tat=now + interval))
+                    return 0.0
+                except sa.exc.IntegrityError:
+                    # Another process created the key first
+                    if self._advance(conn, key, interval, window, now):
+                        return 0.0
+                    tat = conn.execute(sa.select(t.c.tat).where(t.c.key == key)).scalar()
+        return max(_gcra(tat, now, interval, window)[1], 0.001)
+
+    def clear(self) -> None:
+        with self.engine.begin() as conn:
+            conn.execute(sa.delete(self.table))
+
+    def __len__(self) -> int:
+        with self.engine.connect() as conn:
+            return conn.execute(sa.select(sa.func.count()).select_from(self.table)).scalar()
+
+
+# ---------------------------------------------------------------------------
+# Limiter
+# ---------------------------------------------------------------------------
+
+class RateLimiter:
+    """GCRA limiter over a :class:`RateLimitStore`."""
+
+    def __init__(self, store: RateLimitStore | None = None) -> None:
+        self.store = store if store is not None else MemoryStore()
+
+    def hit(self, key: str, limit: int, window: float) -> float:
+        """Count a request against *key*; return 0 if allowed, else seconds to wait."""
+        return self.store.hit(key, window / max(1, limit), window)
+
+    def clear(self) -> None:
+        self.store.clear()
+
+
+_limiter = RateLimiter()
+
+
+def get_limiter() -> RateLimiter:
+    return _limiter
+
+
+def init_rate_limiter(app) -> RateLimiter:
+    """Build the process-wide limiter from *app* config."""
+    global _limiter
+    cfg = app.config
+    backend = cfg.get("RATE_LIMIT_BACKEND", "memory")
+    if backend == "sqlite":
+        store: RateLimitStore = SQLiteStore(cfg["RATE_LIMIT_SQLITE_PATH"])
+    elif backend == "database":
+        store = DatabaseStore()
+    else:
+        store = MemoryStore(cfg.get("RATE_LIMIT_MAX_KEYS", DEFAULT_MAX_KEYS))
+    _limiter = RateLimiter(store)
+    return _limiter
+
+
+# ---------------------------------------------------------------------------
+# Decorator
+# ---------------------------------------------------------------------------
 
 def _get_client_ip() -> str:
     """Best-effort client IP (respects X-Forwarded-For behind a reverse proxy)."""
@@ -54,30 +282,63 @@ def _get_client_ip() -> str:
     return request.remote_addr or "unknown"
 
 
-def rate_limit(limit: int = DEFAULT_LIMIT, window: int = DEFAULT_WINDOW) -> Callable:
-    """Decorator that rate-limits a Flask view by client IP.
+def json_field(name: str) -> Callable[[], Optional[str]]:
+    """Account key: field *name* of the JSON body, lower-cased (e.g. a login email)."""
+
+    def account() -> Optional[str]:
+        data = request.get_json(silent=True)
+        value = data.get(name) if isinstance(data, dict) else None
+        if value is None:
+            return None
+        return str(value).strip().lower() or None
+
+    return account
+
+
+def current_account() -> Optional[str]:
+    """Account key: the logged-in user's ID."""
+    from flask_login import current_user
+
+    return str(current_user.id) if current_user.is_authenticated else None
 
-    Returns HTTP 429 when the limit is exceeded.
+
+def _too_many(retry_after: float):
+    resp = jsonify({"error": _t("common.errors.rateLimited")})
+    resp.headers["Retry-After"] = str(max(1, math.ceil(retry_after)))
+    return resp, 429
+
+
+def rate_limit(
+    limit: int = DEFAULT_LIMIT,
+    window: int = DEFAULT_WINDOW,
+    account: Callable[[], Optional[str]] | None = None,
+    account_limit: int | None = None,
+    account_window: int | None = None,
+) -> Callable:
+    """Decorator that rate-limits a Flask view per route.
+
+    Allows *limit* requests per *window* seconds from each client IP.  With
+    *account* (e.g. :func:`json_field` or :func:`current_account`), each
+    account is also limited to *account_limit* per *account_window* (by
+    default the same), whichever IP the requests come from.
+
+    Returns HTTP 429 with ``Retry-After`` when a limit is exceeded.
     """
 
     def decorator(f: Callable) -> Callable:
+        route = f"{f.__module__}.{f.__qualname__}"
+
         @wraps(f)
         def decorated(*args, **kwargs):
-            ip = _get_client_ip()
-            now = time.monotonic()
-            cutoff = now - window
-
-            with _lock:
-                _cleanup_expired(window)
-                timestamps = _hits.get(ip, [])
-                # Drop timestamps outside the window
-                timestamps = [t for t in timestamps if t > cutoff]
-                if len(timestamps) >= limit:
-                    _hits[ip] = timestamps
-                    return jsonify({"error": _t("common.errors.rateLimited")}), 429
-                timestamps.append(now)
-                _hits[ip] = timestamps
-
+            retry_after = _limiter.hit(f"{route}|ip|{_get_client_ip()}", limit, window)
+            if not retry_after and account is not None:
+                key = account()
+                if key:
+                    retry_after = _limiter.hit(
+                        f"{route}|account|{key}", account_limit or limit, account_window or window,
+                    )
+            if retry_after:
+                return _too_many(retry_after)
             return f(*args, **kwargs)
 
         return decorated
@@ -87,5 +348,4 @@ def rate_limit(limit: int = DEFAULT_LIMIT, window: int = DEFAULT_WINDOW) -> Call
 
 def reset() -> None:
     """Clear all rate-limit state (useful for testing)."""
-    with _lock:
-        _hits.clear()
+    _limiter.clear()
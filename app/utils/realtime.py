@@ -1,27 +1,254 @@
-"""Real-time event helpers — emit Socket.IO events to event rooms."""
+"""Real-time event helpers — emit Socket.IO events to event rooms.
+
+``signups_changed`` and ``lineup_changed`` carry a delta so clients that are
+in sync can patch their state instead of refetching:
+
+* ``lineup_changed`` always includes the new lineup ``version`` and
+  ``order`` (signup IDs per group, in slot order).
+* Both events include ``signups`` (changed records, serialised as the
+  matching GET endpoint would) and ``removed_ids`` when the caller knows
+  exactly which signups changed.  Without those keys, record contents may
+  have changed and clients should refetch.
+* ``signups_changed`` with a delta also carries ``statuses``: the lineup
+  status and bench info of every signup in the event (absent = declined),
+  since one promotion shifts the queue position of everyone behind it.
+
+The delta is computed once per change, however many clients are watching.
+
+Emits are coalesced.  Inside a request (or a :func:`coalescing` block, as
+used by the job worker) each ``(event, room)`` pair is collected and sent
+at most once when the request finishes, with deltas merged and payloads
+built from the final state.  ``notification`` pushes to several users are
+folded into one multi-room emit.  Outside such a scope emits go out
+immediately.
+"""
 
 from __future__ import annotations
 
 import logging
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+import sqlalchemy as sa
 
 from app.extensions import socketio
+from app.utils.serialization import FULL, LINEUP
 
 log = logging.getLogger(__name__)
 
 
-def emit_signups_changed(event_id: int) -> None:
-    """Notify all clients in the event room that signups have changed."""
-    socketio.emit("signups_changed", {"event_id": event_id}, to=f"event_{event_id}")
+class _Delta:
+    """Changed signups reported for one event since the last flush."""
+
+    __slots__ = ("signups", "removed_ids", "complete")
+
+    def __init__(self) -> None:
+        self.signups: dict = {}
+        self.removed_ids: set = set()
+        # False once any caller emitted without saying what changed
+        self.complete = True
+
+    def add(self, signups, removed_ids) -> None:
+        if signups is None and removed_ids is None:
+            self.complete = False
+            return
+        for signup in signups or ():
+            self.signups[signup.id] = signup
+        self.removed_ids.update(removed_ids or ())
+
+    def records(self):
+        """Return ``(signups, removed_ids)``, or ``(None, None)`` if incomplete."""
+        if not self.complete:
+            return None, None
+        removed = self.removed_ids
+        return [s for sid, s in self.signups.items() if sid not in removed], sorted(removed)
+
+
+class _Batch:
+    """Emits collected during one request or :func:`coalescing` block."""
+
+    def __init__(self) -> None:
+        self.deltas: dict[tuple[str, int], _Delta] = {}
+        self.events: dict[tuple[str, object], dict] = {}
+        self.notify_rooms: dict[str, None] = {}
+
+    def flush(self) -> None:
+        deltas, events, rooms = self.deltas, self.events, list(self.notify_rooms)
+        self.deltas, self.events, self.notify_rooms = {}, {}, {}
+        for (name, event_id), delta in deltas.items():
+            _send_delta(name, event_id, delta)
+        for (name, room), payload in events.items():
+            socketio.emit(name, payload, to=room)
+        if rooms:
+            socketio.emit("notification", {}, to=rooms)
+
+
+_batch: ContextVar[_Batch | None] = ContextVar("realtime_batch", default=None)
+
+
+def begin_batch() -> None:
+    """Start collecting emits for the current request (``before_request`` hook)."""
+    _batch.set(_Batch())
+
+
+def flush_batch(response=None):
+    """Send everything collected so far (``after_request`` hook).
+
+    Emitting is best-effort: a failure is logged and never fails the request.
+    """
+    batch = _batch.get()
+    if batch is not None:
+        try:
+            batch.flush()
+        except Exception:
+            log.exception("Failed to flush realtime events")
+    return response
+
+
+def end_batch(exc=None) -> None:
+    """Stop collecting (``teardown_request`` hook); unsent emits are dropped."""
+    _batch.set(None)
+
+
+@contextmanager
+def coalescing():
+    """Collect emits inside the block and flush them once on success."""
+    token = _batch.set(_Batch())
+    try:
+        yield
+        flush_batch()
+    finally:
+        _batch.reset(token)
+
+
+# ---------------------------------------------------------------------------
+# Payloads
+# ---------------------------------------------------------------------------
+
+def signup_records(signups, view: str = FULL, status_map: dict | None = None) -> list[dict]:
+    """Serialise *signups* (all from one event) as the signups/lineup endpoints do."""
+    if not signups:
+        return []
+    from app.services import lineup_service
+    from app.utils.api_helpers import build_guild_role_map
+
+    guild_id = signups[0].raid_event.guild_id
+    role_map = build_guild_role_map(guild_id, [s.user_id for s in signups])
+    if status_map is None:
+        status_map = lineup_service.build_lineup_status_map([signups[0].raid_event_id])
+    return [
+        s.to_dict(guild_role_map=role_map, lineup_status_map=status_map, view=view)
+        for s in signups
+    ]
 
 
-def emit_lineup_changed(event_id: int) -> None:
-    """Notify all clients in the event room that the lineup has changed."""
-    socketio.emit("lineup_changed", {"event_id": event_id}, to=f"event_{event_id}")
+def _signups_payload(event_id: int, signups, removed_ids) -> dict:
+    payload: dict = {"event_id": event_id}
+    if signups is not None:
+        from app.services import lineup_service
+
+        status_map = lineup_service.build_lineup_status_map([event_id])
+        payload["signups"] = signup_records(signups, FULL, status_map)
+        payload["removed_ids"] = removed_ids
+        payload["statuses"] = status_map
+    return payload
+
+
+def _lineup_payload(event_id: int, signups, removed_ids) -> dict:
+    from app.services import lineup_service
+
+    order = lineup_service.get_lineup_order(event_id)
+    payload: dict = {
+        "event_id": event_id,
+        "version": lineup_service.lineup_version(order),
+        "order": order,
+    }
+    if signups is not None:
+        payload["signups"] = signup_records(signups, LINEUP)
+        payload["removed_ids"] = removed_ids
+    return payload
+
+
+_DELTA_PAYLOADS = {
+    "signups_changed": _signups_payload,
+    "lineup_changed": _lineup_payload,
+}
+
+
+def _send_delta(name: str, event_id: int, delta: _Delta) -> None:
+    signups, removed_ids = delta.records()
+    try:
+        payload = _DELTA_PAYLOADS[name](event_id, signups, removed_ids)
+    except sa.orm.exc.ObjectDeletedError:
+        # A reported signup was deleted by a path that did not report it
+        payload = _DELTA_PAYLOADS[name](event_id, None, None)
+    socketio.emit(name, payload, to=f"event_{event_id}")
+
+
+def _queue_delta(name: str, event_id: int, signups, removed_ids) -> None:
+    batch = _batch.get()
+    delta = _Delta() if batch is None else batch.deltas.setdefault((name, event_id), _Delta())
+    delta.add(signups, removed_ids)
+    if batch is None:
+        _send_delta(name, event_id, delta)
+
+
+def _queue(name: str, payload: dict, room: str | None = None) -> None:
+    batch = _batch.get()
+    if batch is None:
+        socketio.emit(name, payload, to=room)
+    else:
+        batch.events[(name, room)] = payload
+
+
+# ---------------------------------------------------------------------------
+# Emitters
+# ---------------------------------------------------------------------------
+
+def emit_signups_changed(event_id: int, signups=None, removed_ids=None) -> None:
+    """Notify all clients in the event room that signups have changed.
+
+    Pass the changed *signups* and/or *removed_ids* when they are known.
+    """
+    _queue_delta("signups_changed", event_id, signups, removed_ids)
+
+
+def emit_lineup_changed(event_id: int, signups=None, removed_ids=None) -> None:
+    """Notify all clients in the event room that the lineup has changed.
+
+    The payload always carries the new slot order and version; pass the
+    changed *signups* and/or *removed_ids* when they are known.
+    """
+    _queue_delta("lineup_changed", event_id, signups, removed_ids)
+
+
+def emit_notifications(user_ids) -> None:
+    """Tell users their notification list changed (one emit for all rooms)."""
+    rooms = [f"user_{uid}" for uid in user_ids]
+    if not rooms:
+        return
+    batch = _batch.get()
+    if batch is None:
+        socketio.emit("notification", {}, to=rooms)
+    else:
+        batch.notify_rooms.update(dict.fromkeys(rooms))
+
+
+ADMIN_SYNC_ROOM = "admin_sync"
+
+
+def emit_sync_progress(payload: dict) -> None:
+    """Stream character-sync job progress to the admin sync room.
+
+    Sent immediately, never coalesced: a job would otherwise only report
+    its final state.
+    """
+    socketio.emit("sync_progress", payload, to=ADMIN_SYNC_ROOM)
 
 
 def emit_guild_changed(guild_id: int) -> None:
     """Notify all clients in a guild room that the guild has been updated."""
-    socketio.emit("guild_changed", {"guild_id": guild_id}, to=f"guild_{guild_id}")
+    _queue("guild_changed", {"guild_id": guild_id}, f"guild_{guild_id}")
 
 
 def emit_guilds_changed() -> None:
@@ -30,7 +257,7 @@ def emit_guilds_changed() -> None:
     Used when a new guild is created or a guild is deleted so that the
     sidebar / guild browser can refresh.
     """
-    socketio.emit("guilds_changed", {})
+    _queue("guilds_changed", {})
 
 
 def emit_events_changed(guild_id: int) -> None:
@@ -39,4 +266,4 @@ def emit_events_changed(guild_id: int) -> None:
     Used when events are created, updated, deleted, locked, cancelled etc.
     so that the Calendar view can refresh.
     """
-    socketio.emit("events_changed", {"guild_id": guild_id}, to=f"guild_{guild_id}")
+    _queue("events_changed", {"guild_id": guild_id}, f"guild_{guild_id}")
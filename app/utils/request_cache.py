@@ -0,0 +1,83 @@
+"""Request-scoped memoization stored on ``flask.g``.
+
+Values are cached for the lifetime of a single HTTP request or Socket.IO
+event (Flask-SocketIO pushes a fresh request context per event).  Contexts
+are context-local, so each greenlet sees its own cache.  Outside a request
+context — scheduler jobs, CLI commands — nothing is cached and the loader
+is always called.
+
+The store is tied to the current request object rather than just ``g``,
+because a request context reuses an already-pushed app context (and its
+``g``) for the same app.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Callable, Hashable, Iterable
+
+from flask import g, has_request_context, request
+
+_G_KEY = "_request_cache"
+
+# Namespaces shared between modules
+NS_MEMBERSHIP = "guild_membership"
+NS_USER_GUILDS = "user_guild_ids"
+NS_ROLE_NAMES = "role_display_name"
+
+
+def _store() -> dict[str, dict] | None:
+    if not has_request_context():
+        return None
+    req = request._get_current_object()
+    entry = g.get(_G_KEY)
+    if entry is None or entry[0] is not req:
+        entry = (req, {})
+        setattr(g, _G_KEY, entry)
+    return entry[1]
+
+
+def cached(namespace: str, key: Hashable, loader: Callable[[], Any]) -> Any:
+    """Return the cached value for *key* in *namespace*, loading it once."""
+    store = _store()
+    if store is None:
+        return loader()
+    bucket = store.setdefault(namespace, {})
+    if key not in bucket:
+        bucket[key] = loader()
+    return bucket[key]
+
+
+def cached_many(
+    namespace: str,
+    keys: Iterable[Hashable],
+    loader: Callable[[list], dict],
+) -> dict:
+    """Batch variant of :func:`cached`.
+
+    *loader* receives the keys not cached yet and returns a dict for them;
+    keys it omits are cached as ``None``.
+    """
+    keys = list(dict.fromkeys(keys))
+    store = _store()
+    if store is None:
+        loaded = loader(keys) if keys else {}
+        return {k: loaded.get(k) for k in keys}
+    bucket = store.setdefault(namespace, {})
+    missing = [k for k in keys if k not in bucket]
+    if missing:
+        loaded = loader(missing)
+        for k in missing:
+            bucket[k] = loaded.get(k)
+    return {k: bucket[k] for k in keys}
+
+
+def invalidate(*namespaces: str) -> None:
+    """Drop the given namespaces (or everything) from the current request cache."""
+    store = _store()
+    if store is None:
+        return
+    if not namespaces:
+        store.clear()
+        return
+    for ns in namespaces:
+        store.pop(ns, None)
@@ -0,0 +1,35 @@
+"""Named serialization profiles ("views") for API payloads.
+
+``to_dict`` on :class:`Character`, :class:`Signup`, :class:`LineupSlot` and
+:class:`RaidEvent` accepts a ``view``:
+
+* ``summary`` — identity and status only, for calendars and pickers.
+* ``lineup``  — what the lineup board renders; character metadata without
+  talents / equipment.
+* ``full``    — everything, including the character's gear.
+
+Endpoints pick a default and let clients override it with ``?view=``;
+``?fields=a,b`` further trims each object to the listed top-level keys.
+"""
+
+from __future__ import annotations
+
+from typing import Iterable
+
+SUMMARY = "summary"
+LINEUP = "lineup"
+FULL = "full"
+
+VIEWS = (SUMMARY, LINEUP, FULL)
+
+
+def pick_fields(data, fields: Iterable[str] | None):
+    """Keep only *fields* (plus ``id``) of a dict, or of each dict in a list."""
+    if not fields:
+        return data
+    if isinstance(data, list):
+        return [pick_fields(item, fields) for item in data]
+    if not isinstance(data, dict):
+        return data
+    wanted = set(fields) | {"id"}
+    return {key: value for key, value in data.items() if key in wanted}
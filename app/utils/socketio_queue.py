@@ -0,0 +1,156 @@
+"""Socket.IO message queue selection for multi-process deployments.
+
+With a single gunicorn worker every client is connected to the process that
+emits, so no queue is needed.  With several workers an emit must reach
+clients connected to *any* worker, so all of them share a pub/sub channel,
+configured by ``SOCKETIO_MESSAGE_QUEUE``:
+
+* empty (default) — single process, emits stay local.
+* ``redis://…`` / ``rediss://…`` / ``amqp://…`` — handed to Flask-SocketIO,
+  which picks its Redis or Kombu manager (needs ``redis`` / ``kombu``).
+* ``database`` — :class:`DatabaseQueueManager`: messages are relayed through
+  the ``realtime_messages`` table of the app database.  No extra service,
+  at the cost of a poll interval of latency; suits small deployments and
+  is the stand-in the multi-worker tests run against.
+
+Whatever the queue, clients must stick to one worker for the life of their
+connection (see the README on sticky sessions).
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import time
+from datetime import datetime, timedelta, timezone
+
+import socketio as _socketio
+import sqlalchemy as sa
+
+logger = logging.getLogger(__name__)
+
+DATABASE_QUEUE = "database"
+
+# A larger jump in IDs (e.g. a sequence cache skip) is not tracked as gaps
+_MAX_GAPS = 1000
+
+
+class DatabaseQueueManager(_socketio.PubSubManager):
+    """Socket.IO pub/sub manager backed by a SQL table.
+
+    Each process publishes by inserting a row and listens by polling for rows
+    newer than the last one it has seen.  Rows older than *retention* seconds
+    are pruned by publishers.
+
+    IDs are assigned at INSERT but transactions may commit out of order
+    (PostgreSQL sequences), so a row can appear below the highest ID already
+    read.  IDs skipped over are remembered as gaps for *reorder_grace*
+    seconds and re-read until they show up; rows are delivered once.
+    """
+
+    name = "database"
+
+    def __init__(
+        self,
+        url: str,
+        channel: str = "socketio",
+        write_only: bool = False,
+        logger=None,
+        poll_interval: float = 0.25,
+        retention: float = 60,
+        reorder_grace: float = 10,
+        engine_options: dict | None = None,
+    ) -> None:
+        super().__init__(channel=channel, write_only=write_only, logger=logger)
+        from app.models.realtime_message import RealtimeMessage
+
+        self.table = RealtimeMessage.__table__
+        self.engine = sa.create_engine(url, **(engine_options or {}))
+        self.poll_interval = poll_interval
+        self.retention = retention
+        self.reorder_grace = reorder_grace
+        self._last_id: int | None = None
+        # Unseen IDs below _last_id -> monotonic time to stop waiting for them
+        self._gaps: dict[int, float] = {}
+        self._next_prune = 0.0
+
+    def initialize(self) -> None:
+        # Record the tail before the listener starts so nothing published
+        # from here on is missed
+        self._tail()
+        super().initialize()
+
+    def _tail(self) -> None:
+        with self.engine.connect() as conn:
+            self._last_id = conn.execute(sa.select(sa.func.max(self.table.c.id))).scalar() or 0
+
+    def _publish(self, data) -> None:
+        now = datetime.now(timezone.utc)
+        with self.engine.begin() as conn:
+            conn.execute(self.table.insert().values(
+                channel=self.channel, payload=json.dumps(data), created_at=now,
+            ))
+            if time.monotonic() >= self._next_prune:
+                self._next_prune = time.monotonic() + self.retention
+                conn.execute(self.table.delete().where(
+                    self.table.c.created_at < now - timedelta(seconds=self.retention)
+                ))
+
+    def poll(self) -> list[dict]:
+        """Return messages published on the channel since the last poll.
+
+        A listener only sees messages published after it was initialised.
+        """
+        if self._last_id is None:
+            self._tail()
+            return []
+        now = time.monotonic()
+        self._gaps = {gap: until for gap, until in self._gaps.items() if until > now}
+        floor = min(self._gaps) - 1 if self._gaps else self._last_id
+        t = self.table
+        with self.engine.connect() as conn:
+            # Other channels' rows count as seen, so only their IDs are read
+            rows = conn.execute(
+                sa.select(t.c.id, sa.case((t.c.channel == self.channel, t.c.payload)).label("payload"))
+                .where(t.c.id > floor)
+                .order_by(t.c.id)
+            ).all()
+        messages = []
+        for row in rows:
+            if row.id > self._last_id:
+                if row.id - self._last_id - 1 <= _MAX_GAPS:
+                    for gap in range(self._last_id + 1, row.id):
+                        self._gaps[gap] = now + self.reorder_grace
+                self._last_id = row.id
+            elif self._gaps.pop(row.id, None) is None:
+                continue  # Already delivered
+            if row.payload is not None:
+                messages.append(json.loads(row.payload))
+        return messages
+
+    def _listen(self):
+        while True:
+            try:
+                yield from self.poll()
+            except sa.exc.SQLAlchemyError:
+                self._get_logger().exception("Polling the Socket.IO message table failed")
+            self.server.sleep(self.poll_interval)
+
+
+def socketio_queue_options(app) -> dict:
+    """Return the ``socketio.init_app`` options for the configured queue."""
+    url = app.config.get("SOCKETIO_MESSAGE_QUEUE") or ""
+    channel = app.config.get("SOCKETIO_CHANNEL", "wotlk-calendar")
+    if not url:
+        return {}
+    if url == DATABASE_QUEUE:
+        manager = DatabaseQueueManager(
+            app.config["SQLALCHEMY_DATABASE_URI"],
+            channel=channel,
+            poll_interval=app.config.get("SOCKETIO_QUEUE_POLL_SECONDS", 0.25),
+            engine_options=app.config.get("SQLALCHEMY_ENGINE_OPTIONS"),
+        )
+        logger.info("Socket.IO messages relayed through the database (channel %s)", channel)
+        return {"client_manager": manager}
+    logger.info("Socket.IO messages relayed through %s (channel %s)", url.split("://", 1)[0], channel)
+    return {"message_queue": url, "channel": channel}
@@ -13,6 +13,16 @@ import os
 from datetime import timedelta
 
 
+def _parse_limits(raw: str) -> dict[str, int]:
+    """Parse ``"type=n,type=n"`` into a dict of per-type limits."""
+    limits: dict[str, int] = {}
+    for part in raw.split(","):
+        name, _, value = part.partition("=")
+        if name.strip() and value.strip().isdigit():
+            limits[name.strip()] = int(value)
+    return limits
+
+
 class Config:
     # ------------------------------------------------------------------ Flask
     SECRET_KEY: str = os.environ.get("SECRET_KEY", "dev-secret-key-change-me")
@@ -62,6 +72,100 @@ class Config:
     # ----------------------------------------------------------- APScheduler
     SCHEDULER_ENABLED: bool = os.environ.get("SCHEDULER_ENABLED", "true").lower() == "true"
     SCHEDULER_TIMEZONE: str = os.environ.get("SCHEDULER_TIMEZONE", "UTC")
+    # Leader lease: only its holder runs the periodic jobs.  A dead leader
+    # is replaced within SCHEDULER_LEASE_SECONDS (+ one heartbeat).
+    SCHEDULER_LEASE_SECONDS: float = float(os.environ.get("SCHEDULER_LEASE_SECONDS", "15"))
+    SCHEDULER_HEARTBEAT_SECONDS: float = float(os.environ.get("SCHEDULER_HEARTBEAT_SECONDS", "5"))
+
+    # ------------------------------------------------------------ Job worker
+    JOB_WORKER_POOL_SIZE: int = int(os.environ.get("JOB_WORKER_POOL_SIZE", "4"))
+    # Fallback poll for jobs enqueued by other processes
+    JOB_WORKER_POLL_SECONDS: float = float(os.environ.get("JOB_WORKER_POLL_SECONDS", "5"))
+    # Max concurrently running jobs per type, e.g. "sync_all_characters=1"
+    JOB_WORKER_CONCURRENCY: dict = _parse_limits(
+        os.environ.get("JOB_WORKER_CONCURRENCY", "sync_all_characters=1")
+    )
+
+    JOB_MAX_ATTEMPTS: int = int(os.environ.get("JOB_MAX_ATTEMPTS", "5"))
+    # Retry backoff: base * 2^(attempt-1) seconds, capped
+    JOB_RETRY_BASE_SECONDS: int = int(os.environ.get("JOB_RETRY_BASE_SECONDS", "10"))
+    JOB_RETRY_MAX_SECONDS: int = int(os.environ.get("JOB_RETRY_MAX_SECONDS", "3600"))
+    # RUNNING jobs not renewed within this window are considered abandoned
+    JOB_LEASE_SECONDS: int = int(os.environ.get("JOB_LEASE_SECONDS", "300"))
+
+    # ---------------------------------------------------------- Armory sync
+    # "roster": one guild-roster fetch per guild, per-character fetches only
+    # for characters off-roster or with stale talents/equipment, at most
+    # ARMORY_SYNC_TICK_BUDGET per run.
+    # "character": one fetch per character.
+    ARMORY_SYNC_MODE: str = os.environ.get("ARMORY_SYNC_MODE", "roster")
+    ARMORY_SYNC_DETAIL_MAX_AGE_HOURS: int = int(os.environ.get("ARMORY_SYNC_DETAIL_MAX_AGE_HOURS", "24"))
+    # Incremental autosync: characters checked per tick, and the re-check
+    # interval (doubling while unchanged, from min up to max).  Characters
+    # signed up for an event within ARMORY_SYNC_UPCOMING_DAYS stay at min.
+    ARMORY_SYNC_TICK_BUDGET: int = int(os.environ.get("ARMORY_SYNC_TICK_BUDGET", "200"))
+    ARMORY_SYNC_MIN_INTERVAL_MINUTES: int = int(os.environ.get("ARMORY_SYNC_MIN_INTERVAL_MINUTES", "60"))
+    ARMORY_SYNC_MAX_INTERVAL_MINUTES: int = int(os.environ.get("ARMORY_SYNC_MAX_INTERVAL_MINUTES", "1440"))
+    ARMORY_SYNC_UPCOMING_DAYS: int = int(os.environ.get("ARMORY_SYNC_UPCOMING_DAYS", "7"))
+    # Parallel character fetches per sync run
+    ARMORY_SYNC_WORKERS: int = int(os.environ.get("ARMORY_SYNC_WORKERS", "8"))
+    # In-flight requests allowed against a single armory host
+    ARMORY_MAX_CONCURRENCY_PER_HOST: int = int(os.environ.get("ARMORY_MAX_CONCURRENCY_PER_HOST", "4"))
+    # Pooled keep-alive connections per armory provider (>= per-host cap)
+    ARMORY_HTTP_POOL_SIZE: int = int(os.environ.get("ARMORY_HTTP_POOL_SIZE", "10"))
+    ARMORY_HTTP_KEEPALIVE: bool = os.environ.get("ARMORY_HTTP_KEEPALIVE", "true").lower() == "true"
+    # Retries for connection errors / 429 / 5xx, with exponential backoff
+    ARMORY_HTTP_RETRIES: int = int(os.environ.get("ARMORY_HTTP_RETRIES", "1"))
+    ARMORY_HTTP_BACKOFF: float = float(os.environ.get("ARMORY_HTTP_BACKOFF", "1.0"))
+    # Upstream protection, shared by lookups and sync: token bucket per
+    # provider, and a breaker that fails fast after consecutive errors
+    ARMORY_RATE_LIMIT_PER_SECOND: float = float(os.environ.get("ARMORY_RATE_LIMIT_PER_SECOND", "5"))
+    ARMORY_RATE_LIMIT_BURST: int = int(os.environ.get("ARMORY_RATE_LIMIT_BURST", "10"))
+    ARMORY_RATE_LIMIT_MAX_WAIT: float = float(os.environ.get("ARMORY_RATE_LIMIT_MAX_WAIT", "10"))
+    ARMORY_BREAKER_FAILURES: int = int(os.environ.get("ARMORY_BREAKER_FAILURES", "5"))
+    ARMORY_BREAKER_RESET_SECONDS: float = float(os.environ.get("ARMORY_BREAKER_RESET_SECONDS", "30"))
+    # Armory response cache: "memory" (per process) or "sqlite" (shared file)
+    ARMORY_CACHE_ENABLED: bool = os.environ.get("ARMORY_CACHE_ENABLED", "true").lower() == "true"
+    ARMORY_CACHE_BACKEND: str = os.environ.get("ARMORY_CACHE_BACKEND", "memory")
+    ARMORY_CACHE_SQLITE_PATH: str = os.environ.get(
+        "ARMORY_CACHE_SQLITE_PATH", os.path.join(
+            os.path.dirname(os.path.abspath(__file__)), "instance", "armory_cache.db"
+        )
+    )
+    ARMORY_CACHE_MAX_ENTRIES: int = int(os.environ.get("ARMORY_CACHE_MAX_ENTRIES", "2048"))
+    # Seconds per endpoint, e.g. "character=300,guild=600"
+    ARMORY_CACHE_TTLS: dict = _parse_limits(
+        os.environ.get("ARMORY_CACHE_TTLS", "character=300,guild=600")
+    )
+    # Seconds to remember "not found" answers
+    ARMORY_CACHE_NEGATIVE_TTL: int = int(os.environ.get("ARMORY_CACHE_NEGATIVE_TTL", "60"))
+    # Characters written per commit
+    ARMORY_SYNC_BATCH_SIZE: int = int(os.environ.get("ARMORY_SYNC_BATCH_SIZE", "50"))
+
+    # ---------------------------------------------------------- Rate limits
+    # "memory" (per process, LRU-bounded), "sqlite" (shared file on the
+    # host) or "database" (app database, shared by every process)
+    RATE_LIMIT_BACKEND: str = os.environ.get("RATE_LIMIT_BACKEND", "memory")
+    RATE_LIMIT_SQLITE_PATH: str = os.environ.get(
+        "RATE_LIMIT_SQLITE_PATH", os.path.join(
+            os.path.dirname(os.path.abspath(__file__)), "instance", "rate_limits.db"
+        )
+    )
+    RATE_LIMIT_MAX_KEYS: int = int(os.environ.get("RATE_LIMIT_MAX_KEYS", "10000"))
+
+    # -------------------------------------------------------------- Socket.IO
+    # Message queue shared by worker processes: "" (single process),
+    # "redis://...", "amqp://..." or "database" (relay through the app DB)
+    SOCKETIO_MESSAGE_QUEUE: str = os.environ.get("SOCKETIO_MESSAGE_QUEUE", "")
+    SOCKETIO_CHANNEL: str = os.environ.get("SOCKETIO_CHANNEL", "wotlk-calendar")
+    # Poll interval of the "database" queue
+    SOCKETIO_QUEUE_POLL_SECONDS: float = float(os.environ.get("SOCKETIO_QUEUE_POLL_SECONDS", "0.25"))
+
+    # --------------------------------------------------------- Notifications
+    # When enabled, multi-recipient notification fan-out is queued as a
+    # ``send_notification`` job and drained by the job worker instead of
+    # running inside the request.  Requires a running job worker.
+    NOTIFICATIONS_ASYNC: bool = os.environ.get("NOTIFICATIONS_ASYNC", "false").lower() == "true"
 
 
 class DevelopmentConfig(Config):
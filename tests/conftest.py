@@ -39,6 +39,10 @@ def db(app):
         # Reset rate limiter state between tests
         from app.utils.rate_limit import reset as _reset_rate_limit
         _reset_rate_limit()
+        from app.utils.permissions import reset_permission_cache
+        reset_permission_cache()
+        from app.services.armory.cache import get_response_cache
+        get_response_cache().clear()
         yield _db
         _db.session.rollback()
         _db.drop_all()
@@ -0,0 +1,52 @@
+"""One app worker process for the multi-worker realtime tests.
+
+Run as ``python tests/realtime_worker.py <database-url> <port> [--init]``.
+Builds the app with ``SOCKETIO_MESSAGE_QUEUE=database`` and serves it with
+the gevent server, like one gunicorn worker would.  ``--init`` first creates
+the tables and an admin user (``admin@test.com`` / ``password123``).
+Prints ``READY`` once the port is bound.
+"""
+
+from gevent import monkey  # noqa: E402
+
+monkey.patch_all()
+
+import os  # noqa: E402
+import sys  # noqa: E402
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ["FLASK_ENV"] = "testing"
+
+from gevent.pywsgi import WSGIServer  # noqa: E402
+
+from app import create_app  # noqa: E402
+from app.extensions import db  # noqa: E402
+
+
+def main(url: str, port: int, init: bool) -> None:
+    app = create_app({
+        "TESTING": True,
+        "SQLALCHEMY_DATABASE_URI": url,
+        "SECRET_KEY": "test-secret",
+        "CORS_ORIGINS": ["*"],
+        "SCHEDULER_ENABLED": False,
+        "SOCKETIO_MESSAGE_QUEUE": "database",
+        "SOCKETIO_QUEUE_POLL_SECONDS": 0.05,
+    })
+    if init:
+        from app.services import auth_service
+
+        with app.app_context():
+            db.create_all()
+            user = auth_service.register_user("admin@test.com", "admin", "password123")
+            user.is_admin = True
+            db.session.commit()
+
+    server = WSGIServer(("127.0.0.1", port), app, log=None)
+    server.start()
+    print("READY", flush=True)
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main(sys.argv[1], int(sys.argv[2]), "--init" in sys.argv[3:])
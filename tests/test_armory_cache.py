@@ -0,0 +1,202 @@
+"""Tests for the armory response cache."""
+
+from __future__ import annotations
+
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from app.services.armory import cache as armory_cache
+from app.services.armory.cache import (
+    NOT_MODIFIED,
+    CacheEntry,
+    Fetched,
+    MemoryStore,
+    ResponseCache,
+    SQLiteStore,
+)
+from app.services.armory.warmane import WarmaneProvider
+
+
+def _loader(value, calls, **kwargs):
+    def load(stale):
+        calls.append(stale)
+        return Fetched(value, **kwargs)
+    return load
+
+
+class TestResponseCache:
+    def test_hit_after_miss(self):
+        cache, calls = ResponseCache(), []
+        assert cache.get_or_load("character", "k", _loader({"a": 1}, calls)) == {"a": 1}
+        assert cache.get_or_load("character", "k", _loader({"a": 2}, calls)) == {"a": 1}
+        assert len(calls) == 1
+        stats = cache.stats()
+        assert (stats["hits"], stats["misses"], stats["size"]) == (1, 1, 1)
+        assert stats["hit_rate"] == 0.5
+
+    def test_negative_caching(self):
+        cache, calls = ResponseCache(negative_ttl=60), []
+        assert cache.get_or_load("character", "k", _loader(None, calls)) is None
+        assert cache.get_or_load("character", "k", _loader({"a": 1}, calls)) is None
+        assert len(calls) == 1
+        assert cache.stats()["negative_hits"] == 1
+
+    def test_transient_errors_not_cached_and_stale_served(self):
+        cache, calls = ResponseCache(ttls={"character": 60}), []
+        cache.store.set("k", CacheEntry({"old": True}, expires_at=time.time() - 1))
+        result = cache.get_or_load("character", "k", _loader(None, calls, cacheable=False))
+        assert result == {"old": True}
+        assert cache.get_or_load("character", "k", _loader({"new": True}, calls)) == {"new": True}
+        assert cache.stats()["stale_served"] == 1
+
+    def test_revalidation_passes_validators_and_refreshes(self):
+        cache = ResponseCache(ttls={"character": 60})
+        cache.store.set("k", CacheEntry({"a": 1}, expires_at=time.time() - 1, etag='"v1"'))
+        seen = []
+
+        def load(stale):
+            seen.append(stale.etag)
+            return NOT_MODIFIED
+
+        assert cache.get_or_load("character", "k", load) == {"a": 1}
+        assert seen == ['"v1"']
+        assert cache.store.get("k").fresh
+        assert cache.stats()["revalidated"] == 1
+
+    def test_lru_eviction(self):
+        cache = ResponseCache(store=MemoryStore(max_entries=2))
+        for key in ("a", "b"):
+            cache.get_or_load("character", key, _loader({key: 1}, []))
+        cache.get_or_load("character", "a", _loader(None, []))  # touch "a"
+        cache.get_or_load("character", "c", _loader({"c": 1}, []))
+        assert cache.store.get("b") is None
+        assert cache.store.get("a") is not None
+        assert cache.stats()["evictions"] == 1
+
+    def test_single_flight(self):
+        cache = ResponseCache()
+        release = threading.Event()
+        calls = []
+
+        def slow(stale):
+            calls.append(1)
+            release.wait(5)
+            return Fetched({"name": "Arthas"})
+
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(cache.get_or_load("character", "k", slow)))
+            for _ in range(5)
+        ]
+        for t in threads:
+            t.start()
+        while cache.stats()["coalesced"] < 4:
+            time.sleep(0.01)
+        release.set()
+        for t in threads:
+            t.join(5)
+
+        assert len(calls) == 1
+        assert results == [{"name": "Arthas"}] * 5
+
+    def test_disabled_always_loads(self):
+        cache, calls = ResponseCache(enabled=False), []
+        cache.get_or_load("character", "k", _loader({"a": 1}, calls))
+        cache.get_or_load("character", "k", _loader({"a": 1}, calls))
+        assert len(calls) == 2
+
+
+class TestSQLiteStore:
+    def test_roundtrip_and_eviction(self, tmp_path):
+        store = SQLiteStore(str(tmp_path / "cache.db"), max_entries=2)
+        store.set("a", CacheEntry({"x": 1}, expires_at=time.time() + 60, etag='"e"'))
+        store.set("b", CacheEntry(None, expires_at=time.time() + 60))
+        entry = store.get("a")
+        assert entry.value == {"x": 1} and entry.etag == '"e"' and entry.fresh
+        assert store.get("b").value is None
+
+        time.sleep(0.01)
+        store.get("a")
+        assert store.set("c", CacheEntry({"y": 2}, expires_at=time.time() + 60)) == 1
+        assert store.get("b") is None
+        assert len(store) == 2
+
+    def test_shared_between_instances(self, tmp_path):
+        path = str(tmp_path / "cache.db")
+        ResponseCache(store=SQLiteStore(path)).get_or_load("guild", "k", _loader({"g": 1}, []))
+        calls = []
+        other = ResponseCache(store=SQLiteStore(path))
+        assert other.get_or_load("guild", "k", _loader({"g": 2}, calls)) == {"g": 1}
+        assert calls == []
+
+
+class TestProviderCaching:
+    @pytest.fixture
+    def cache(self, monkeypatch):
+        cache = ResponseCache()
+        monkeypatch.setattr(armory_cache, "_cache", cache)
+        return cache
+
+    def _response(self, status, payload=None, headers=None):
+        resp = MagicMock(status_code=status, headers=headers or {})
+        resp.json.return_value = payload or {}
+        return resp
+
+    def test_repeated_lookup_hits_cache(self, cache):
+        provider = WarmaneProvider()
+        resp = self._response(200, {"name": "Arthas"}, {"ETag": '"v1"'})
+        with patch.object(provider.session, "get", return_value=resp) as get:
+            provider.fetch_character("Icecrown", "Arthas")
+            assert provider.fetch_character("Icecrown", "Arthas") == {"name": "Arthas"}
+        assert get.call_count == 1
+
+    def test_not_found_negative_cached(self, cache):
+        provider = WarmaneProvider()
+        resp = self._response(200, {"error": "Character does not exist."})
+        with patch.object(provider.session, "get", return_value=resp) as get:
+            assert provider.fetch_character("Icecrown", "Nobody") is None
+            assert provider.fetch_character("Icecrown", "Nobody") is None
+        assert get.call_count == 1
+
+    def test_server_error_not_cached(self, cache):
+        provider = WarmaneProvider()
+        with patch.object(provider.session, "get", return_value=self._response(503)) as get:
+            provider.fetch_guild("Icecrown", "Guild")
+            provider.fetch_guild("Icecrown", "Guild")
+        assert get.call_count == 2
+
+    def test_conditional_request_on_expiry(self, cache):
+        provider = WarmaneProvider()
+        ok = self._response(200, {"name": "Arthas"}, {"ETag": '"v1"'})
+        with patch.object(provider.session, "get", return_value=ok):
+            provider.fetch_character("Icecrown", "Arthas")
+        for entry in cache.store._data.values():
+            entry.expires_at = 0
+        with patch.object(provider.session, "get", return_value=self._response(304)) as get:
+            assert provider.fetch_character("Icecrown", "Arthas") == {"name": "Arthas"}
+        assert get.call_args.kwargs["headers"] == {"If-None-Match": '"v1"'}
+
+
+class TestDashboardStats:
+    def test_dashboard_includes_cache_stats(self, app, db, seed):
+        from flask import session as flask_session
+        from flask_login import login_user
+
+        admin = seed["user1"]
+        admin.is_admin = True
+        db.session.commit()
+        client = app.test_client()
+        with app.test_request_context():
+            login_user(admin)
+            sess_data = dict(flask_session)
+        with client.session_transaction() as s:
+            s.update(sess_data)
+
+        resp = client.get("/api/v1/admin/dashboard")
+        assert resp.status_code == 200
+        stats = resp.get_json()["armory_cache"]
+        assert stats["backend"] == "MemoryStore"
+        assert {"hits", "misses", "hit_rate", "size"} <= set(stats)
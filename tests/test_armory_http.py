@@ -0,0 +1,79 @@
+"""Tests for pooled armory HTTP sessions and provider caching."""
+
+from __future__ import annotations
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from app.services.armory import http as armory_http
+from app.services.armory.registry import clear_provider_cache, get_provider
+from app.services.armory.warmane import WarmaneProvider
+
+
+@pytest.fixture
+def fresh_providers():
+    clear_provider_cache()
+    yield
+    clear_provider_cache()
+
+
+def _response(status=200, payload=None):
+    resp = MagicMock(status_code=status)
+    resp.json.return_value = payload if payload is not None else {}
+    return resp
+
+
+class TestProviderCache:
+    def test_same_backend_shares_instance(self, fresh_providers):
+        a = get_provider("warmane")
+        assert get_provider("Warmane") is a
+        custom = get_provider("warmane", api_base_url="https://armory.example.com/api/")
+        assert custom is not a
+        assert get_provider("warmane", api_base_url="https://armory.example.com/api") is custom
+        assert custom.api_base_url == "https://armory.example.com/api"
+
+    def test_clear_closes_sessions(self, fresh_providers):
+        provider = get_provider("warmane", api_base_url="https://a.example.com")
+        session = provider.session
+        with patch.object(session, "close") as close:
+            clear_provider_cache()
+        close.assert_called_once()
+        assert get_provider("warmane", api_base_url="https://a.example.com") is not provider
+
+
+class TestPooledSession:
+    def test_session_is_reused_across_calls(self):
+        provider = WarmaneProvider("https://armory.example.com/api")
+        session = provider.session
+        with patch.object(session, "get", return_value=_response(payload={"name": "Arthas"})) as get:
+            assert provider.fetch_character("Icecrown", "Arthas") == {"name": "Arthas"}
+            assert provider.fetch_guild("Icecrown", "Some Guild") == {"name": "Arthas"}
+        assert provider.session is session
+        assert get.call_count == 2
+        assert get.call_args_list[0].args[0] == (
+            "https://armory.example.com/api/character/Arthas/Icecrown/summary"
+        )
+        assert session.headers["User-Agent"].startswith("Mozilla/5.0")
+
+    def test_errors_return_none(self):
+        provider = WarmaneProvider()
+        with patch.object(provider.session, "get", return_value=_response(status=503)):
+            assert provider.fetch_character("Icecrown", "Arthas") is None
+        with patch.object(provider.session, "get",
+                          return_value=_response(payload={"error": "Character does not exist."})):
+            assert provider.fetch_character("Icecrown", "Nobody") is None
+
+    def test_adapter_uses_configured_pool_and_retries(self, app, monkeypatch):
+        monkeypatch.setattr(armory_http, "_settings", armory_http.HttpSettings())
+        monkeypatch.setitem(app.config, "ARMORY_HTTP_POOL_SIZE", 6)
+        monkeypatch.setitem(app.config, "ARMORY_HTTP_RETRIES", 3)
+        monkeypatch.setitem(app.config, "ARMORY_HTTP_KEEPALIVE", False)
+        armory_http.init_armory_http(app)
+
+        session = armory_http.build_session()
+        adapter = session.get_adapter("https://armory.example.com")
+        assert adapter._pool_maxsize == 6
+        assert adapter.max_retries.total == 3
+        assert 503 in adapter.max_retries.status_forcelist
+        assert session.headers["Connection"] == "close"
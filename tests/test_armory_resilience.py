@@ -0,0 +1,131 @@
+"""Tests for the armory rate governor and circuit breaker."""
+
+from __future__ import annotations
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+import requests
+
+from app.services.armory import resilience
+from app.services.armory.registry import (
+    clear_provider_cache,
+    get_breaker_state,
+    get_provider,
+    provider_health,
+)
+from app.services.armory.resilience import CircuitBreaker, TokenBucket
+from app.services.armory.warmane import WarmaneProvider
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestTokenBucket:
+    def test_burst_then_refill(self):
+        clock = _Clock()
+        bucket = TokenBucket(rate=2, burst=3, clock=clock)
+        assert [bucket.try_acquire() for _ in range(3)] == [0.0, 0.0, 0.0]
+        assert bucket.try_acquire() == pytest.approx(0.5)
+        clock.now += 0.5
+        assert bucket.try_acquire() == 0.0
+
+    def test_acquire_times_out(self):
+        bucket = TokenBucket(rate=1, burst=1)
+        assert bucket.acquire(timeout=0) is True
+        assert bucket.acquire(timeout=0) is False
+
+
+class TestCircuitBreaker:
+    def test_opens_after_consecutive_failures(self):
+        breaker = CircuitBreaker(failure_threshold=3, reset_timeout=30, clock=_Clock())
+        for _ in range(2):
+            breaker.record_failure()
+        breaker.record_success()
+        for _ in range(2):
+            breaker.record_failure()
+        assert breaker.state == "closed"
+        breaker.record_failure()
+        assert breaker.state == "open"
+        assert breaker.allow() is False
+        assert breaker.snapshot()["rejected"] == 1
+
+    def test_half_open_probe(self):
+        clock = _Clock()
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=30, clock=clock)
+        breaker.record_failure()
+        clock.now += 30
+        assert breaker.state == "half_open"
+        assert breaker.allow() is True
+        assert breaker.allow() is False  # one probe at a time
+        breaker.record_failure()
+        assert breaker.state == "open"
+
+        clock.now += 30
+        assert breaker.allow() is True
+        breaker.record_success()
+        assert breaker.state == "closed"
+        assert breaker.allow() is True
+
+
+class TestProviderProtection:
+    @pytest.fixture
+    def provider(self, monkeypatch):
+        monkeypatch.setattr(
+            resilience, "_settings",
+            resilience.ResilienceSettings(failure_threshold=2, reset_timeout=60, max_wait=0),
+        )
+        return WarmaneProvider("https://armory.example.com/api")
+
+    def test_breaker_fails_fast_after_errors(self, provider):
+        with patch.object(provider.session, "get", side_effect=requests.ConnectionError("down")) as get:
+            for name in ("A", "B", "C", "D"):
+                assert provider.fetch_character("Icecrown", name) is None
+        assert get.call_count == 2
+        assert provider.breaker.snapshot()["state"] == "open"
+
+    def test_server_errors_trip_not_found_does_not(self, provider):
+        not_found = MagicMock(status_code=404, headers={})
+        with patch.object(provider.session, "get", return_value=not_found):
+            for name in ("A", "B", "C"):
+                provider.fetch_character("Icecrown", name)
+        assert provider.breaker.state == "closed"
+
+        unavailable = MagicMock(status_code=503, headers={})
+        with patch.object(provider.session, "get", return_value=unavailable):
+            provider.fetch_character("Icecrown", "D")
+            provider.fetch_character("Icecrown", "E")
+        assert provider.breaker.state == "open"
+
+    def test_governor_limits_calls(self, provider):
+        provider._governor = TokenBucket(rate=0.001, burst=2)
+        ok = MagicMock(status_code=200, headers={})
+        ok.json.return_value = {"name": "x"}
+        with patch.object(provider.session, "get", return_value=ok) as get:
+            results = [provider.fetch_character("Icecrown", n) for n in ("A", "B", "C")]
+        assert get.call_count == 2
+        assert results[2] is None
+
+
+class TestRegistryExposure:
+    def test_provider_health_and_breaker_state(self):
+        clear_provider_cache()
+        try:
+            provider = get_provider("warmane", api_base_url="https://armory.example.com/api")
+            for _ in range(provider.breaker.failure_threshold):
+                provider.breaker.record_failure()
+
+            state = get_breaker_state("warmane", "https://armory.example.com/api")
+            assert state["state"] == "open"
+            assert get_breaker_state("warmane")["state"] == "closed"
+
+            health = {h["api_base_url"]: h for h in provider_health()}
+            assert health["https://armory.example.com/api"]["breaker"]["state"] == "open"
+            assert "tokens" in health["https://armory.example.com/api"]["governor"]
+        finally:
+            clear_provider_cache()
@@ -0,0 +1,379 @@
+"""Tests for the parallel armory character sync."""
+
+from __future__ import annotations
+
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import event as sa_event
+
+from app.models.character import Character, CharacterSyncState
+from app.services import armory_sync_service
+
+
+class _FakeArmory:
+    """Stub ``fetch_character`` that records peak concurrency."""
+
+    def __init__(self, missing=(), delay=0.02):
+        self.missing = set(missing)
+        self.delay = delay
+        self.calls = []
+        self.active = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, realm, name):
+        with self._lock:
+            self.calls.append((realm, name))
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        try:
+            time.sleep(self.delay)
+            if name in self.missing:
+                return {"error": "Character does not exist."}
+            return {
+                "name": name, "class": "Hunter", "level": "80", "race": "Orc",
+                "talents": [{"tree": "Marksmanship"}],
+            }
+        finally:
+            with self._lock:
+                self.active -= 1
+
+
+def _add_chars(db, seed, count):
+    for i in range(count):
+        db.session.add(Character(
+            user_id=seed["user1"].id, guild_id=seed["guild"].id, realm_name="Icecrown",
+            name=f"Alt{i}", class_name="Hunter", is_active=True,
+        ))
+    db.session.commit()
+
+
+class TestArmorySync:
+    def test_syncs_all_active_characters(self, db, seed):
+        fake = _FakeArmory(missing={"HunterThree"})
+        stats = armory_sync_service.sync_characters(mode="character", fetch=fake)
+
+        assert stats.characters == 3
+        assert stats.synced == 2
+        assert stats.not_found == 1
+        assert stats.failed == 0
+        db.session.expire_all()
+        char = db.session.get(Character, seed["char1"].id)
+        assert char.char_metadata["level"] == 80
+        assert char.char_metadata["race"] == "Orc"
+        assert char.primary_spec is not None
+        assert char.armory_url.endswith("/HunterOne/Icecrown/summary")
+        assert armory_sync_service.last_run_stats()["synced"] == 2
+
+    def test_per_host_concurrency_cap(self, app, db, seed, monkeypatch):
+        monkeypatch.setattr(armory_sync_service, "_host_limits", {})
+        monkeypatch.setitem(app.config, "ARMORY_MAX_CONCURRENCY_PER_HOST", 2)
+        _add_chars(db, seed, 9)
+        fake = _FakeArmory()
+
+        stats = armory_sync_service.sync_characters(mode="character", fetch=fake, max_workers=8)
+
+        assert stats.synced == 12
+        assert fake.peak == 2
+
+    def test_fetches_run_in_parallel(self, app, db, seed, monkeypatch):
+        monkeypatch.setattr(armory_sync_service, "_host_limits", {})
+        monkeypatch.setitem(app.config, "ARMORY_MAX_CONCURRENCY_PER_HOST", 4)
+        _add_chars(db, seed, 5)
+        fake = _FakeArmory()
+
+        armory_sync_service.sync_characters(mode="character", fetch=fake, max_workers=4)
+
+        assert fake.peak > 1
+
+    def test_writes_are_batched(self, db, seed):
+        _add_chars(db, seed, 7)
+        commits = []
+        # Connection-level COMMITs: per-character savepoints are not counted
+        listener = lambda conn: commits.append(1)  # noqa: E731
+        sa_event.listen(db.engine, "commit", listener)
+        try:
+            stats = armory_sync_service.sync_characters(
+                mode="character", fetch=_FakeArmory(delay=0), batch_size=4,
+            )
+        finally:
+            sa_event.remove(db.engine, "commit", listener)
+
+        assert stats.synced == 10
+        assert stats.batches == 3
+        assert len(commits) == 3
+
+    def test_fetch_errors_are_counted(self, db, seed):
+        def _boom(realm, name):
+            if name == "HunterTwo":
+                raise RuntimeError("connection reset")
+            return {"name": name, "class": "Hunter"}
+
+        stats = armory_sync_service.sync_characters(mode="character", fetch=_boom)
+        assert stats.synced == 2
+        assert stats.failed == 1
+
+    def test_guild_filter_and_inactive_skipped(self, db, seed):
+        seed["char3"].is_active = False
+        db.session.commit()
+        fake = _FakeArmory(delay=0)
+
+        stats = armory_sync_service.sync_characters(
+            guild_id=seed["guild"].id, mode="character", fetch=fake,
+        )
+        assert stats.characters == 2
+        assert sorted(n for _, n in fake.calls) == ["HunterOne", "HunterTwo"]
+
+        assert armory_sync_service.sync_characters(guild_id=999, mode="character", fetch=fake).characters == 0
+
+
+class _FakeRoster:
+    """Stub ``fetch_guild`` returning a roster for the seeded guild."""
+
+    def __init__(self, names):
+        self.names = names
+        self.calls = []
+
+    def __call__(self, realm, guild_name):
+        self.calls.append((realm, guild_name))
+        return {
+            "name": guild_name,
+            "roster": [
+                {"name": n, "class": "Hunter", "level": "80", "race": "Troll",
+                 "professions": {"professions": [{"name": "Skinning", "skill": "450"}]}}
+                for n in self.names
+            ],
+        }
+
+
+def _mark_details_fresh(db, *chars):
+    for char in chars:
+        char.char_metadata = {"talents": [{"tree": "Survival"}]}
+        db.session.add(CharacterSyncState(
+            character_id=char.id, details_synced_at=datetime.now(timezone.utc),
+        ))
+    db.session.commit()
+
+
+class TestRosterSync:
+    def test_roster_replaces_per_character_fetches(self, db, seed):
+        _mark_details_fresh(db, seed["char1"], seed["char2"], seed["char3"])
+        roster = _FakeRoster(["HunterOne", "HunterTwo", "HunterThree"])
+        fake = _FakeArmory(delay=0)
+
+        stats = armory_sync_service.sync_characters(mode="roster", fetch=fake, fetch_guild=roster)
+
+        assert roster.calls == [("Icecrown", "Test Guild")]
+        assert fake.calls == []
+        assert (stats.fetches, stats.synced, stats.from_roster) == (1, 3, 3)
+        db.session.expire_all()
+        meta = db.session.get(Character, seed["char1"].id).char_metadata
+        assert meta["race"] == "Troll"
+        assert meta["professions"] == [{"name": "Skinning", "skill": "450"}]
+        # Talents are not on the roster and must survive
+        assert meta["talents"] == [{"tree": "Survival"}]
+
+    def test_off_roster_and_stale_details_fall_back(self, db, seed):
+        _mark_details_fresh(db, seed["char1"])
+        roster = _FakeRoster(["HunterOne", "HunterTwo"])
+        fake = _FakeArmory(delay=0)
+
+        stats = armory_sync_service.sync_characters(mode="roster", fetch=fake, fetch_guild=roster)
+
+        # HunterTwo: on roster but never had details; HunterThree: not on roster
+        assert sorted(n for _, n in fake.calls) == ["HunterThree", "HunterTwo"]
+        assert stats.fetches == 3
+        assert stats.synced == 3
+        db.session.expire_all()
+        assert db.session.get(Character, seed["char2"].id).char_metadata["race"] == "Orc"
+        assert db.session.get(CharacterSyncState, seed["char2"].id).details_synced_at is not None
+
+    def test_failed_detail_fetch_keeps_roster_update(self, db, seed):
+        roster = _FakeRoster(["HunterOne"])
+        stats = armory_sync_service.sync_characters(
+            mode="roster", fetch=lambda realm, name: None, fetch_guild=roster,
+        )
+        assert stats.from_roster == 1
+        assert stats.not_found == 2
+        db.session.expire_all()
+        assert db.session.get(Character, seed["char1"].id).char_metadata["race"] == "Troll"
+
+    def test_detail_fetches_are_budgeted(self, db, seed):
+        _add_chars(db, seed, 4)
+        _signup(db, seed, "char3")
+        roster = _FakeRoster(["HunterOne", "HunterTwo", "HunterThree"] + [f"Alt{i}" for i in range(3)])
+        fake = _FakeArmory(delay=0)
+
+        stats = armory_sync_service.sync_characters(
+            mode="roster", fetch=fake, fetch_guild=roster, budget=2,
+        )
+
+        # Off-roster first, then signed up; nobody else fans out
+        assert sorted(n for _, n in fake.calls) == ["Alt3", "HunterThree"]
+        assert stats.fetches == 3
+        assert stats.deferred == 5
+        # Deferred characters still get their roster fields
+        assert stats.synced == 7
+        db.session.expire_all()
+        assert db.session.get(CharacterSyncState, seed["char1"].id).details_synced_at is None
+
+        # The next run moves on to details that were deferred; off-roster
+        # characters have no other source and are fetched every run
+        fake.calls.clear()
+        armory_sync_service.sync_characters(mode="roster", fetch=fake, fetch_guild=roster, budget=2)
+        assert len(fake.calls) == 2
+        assert ("Icecrown", "Alt3") in fake.calls
+        assert ("Icecrown", "HunterThree") not in fake.calls
+
+    def test_roster_fetched_once_per_guild(self, db, seed):
+        _add_chars(db, seed, 20)
+        roster = _FakeRoster([])
+        stats = armory_sync_service.sync_characters(
+            mode="roster", fetch=_FakeArmory(delay=0), fetch_guild=roster,
+        )
+        assert len(roster.calls) == 1
+        assert stats.roster_fetches == 1
+
+
+class _UpdateCounter:
+    """Count UPDATE statements against the characters table."""
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.count = 0
+
+    def _on_execute(self, conn, cursor, statement, *args):
+        if statement.lstrip().upper().startswith("UPDATE CHARACTERS"):
+            self.count += 1
+
+    def __enter__(self):
+        sa_event.listen(self.engine, "before_cursor_execute", self._on_execute)
+        return self
+
+    def __exit__(self, *exc):
+        sa_event.remove(self.engine, "before_cursor_execute", self._on_execute)
+
+
+def _signup(db, seed, char_key, days_ahead=2):
+    from app.models.signup import Signup
+
+    event = seed["event"]
+    event.starts_at_utc = datetime.now(timezone.utc) + timedelta(days=days_ahead)
+    user_key = {"char1": "user1", "char2": "user2", "char3": "user3"}[char_key]
+    db.session.add(Signup(
+        raid_event_id=event.id, user_id=seed[user_key].id,
+        character_id=seed[char_key].id, chosen_role="range_dps",
+    ))
+    db.session.commit()
+
+
+class TestIncrementalSync:
+    def test_unchanged_characters_skip_write(self, db, seed):
+        fake = _FakeArmory(delay=0)
+        first = armory_sync_service.sync_characters(mode="character", fetch=fake)
+        assert first.synced == 3
+
+        with _UpdateCounter(db.engine) as updates:
+            second = armory_sync_service.sync_characters(mode="character", fetch=fake)
+        assert (second.synced, second.unchanged) == (0, 3)
+        assert updates.count == 0
+
+        state = db.session.get(CharacterSyncState, seed["char1"].id)
+        assert state.unchanged_streak == 1
+        assert state.content_hash is not None
+
+    def test_changed_payload_is_written(self, db, seed):
+        armory_sync_service.sync_characters(mode="character", fetch=_FakeArmory(delay=0))
+
+        def _levelled(realm, name):
+            return {"name": name, "class": "Hunter", "level": "81", "race": "Orc",
+                    "talents": [{"tree": "Marksmanship"}]}
+
+        stats = armory_sync_service.sync_characters(mode="character", fetch=_levelled)
+        assert stats.synced == 3
+        db.session.expire_all()
+        assert db.session.get(Character, seed["char1"].id).char_metadata["level"] == 81
+        assert db.session.get(CharacterSyncState, seed["char1"].id).unchanged_streak == 0
+
+    def test_backoff_grows_while_unchanged(self, app, db, seed, monkeypatch):
+        monkeypatch.setitem(app.config, "ARMORY_SYNC_MIN_INTERVAL_MINUTES", 60)
+        monkeypatch.setitem(app.config, "ARMORY_SYNC_MAX_INTERVAL_MINUTES", 180)
+        fake = _FakeArmory(delay=0)
+        gaps = []
+        for _ in range(4):
+            before = datetime.now(timezone.utc)
+            armory_sync_service.sync_characters(mode="character", fetch=fake)
+            due = db.session.get(CharacterSyncState, seed["char1"].id).next_due_at
+            gaps.append(round((due.replace(tzinfo=timezone.utc) - before).total_seconds() / 60))
+        assert gaps == [60, 120, 180, 180]
+
+    def test_incremental_only_due_and_within_budget(self, db, seed):
+        fake = _FakeArmory(delay=0)
+        stats = armory_sync_service.sync_characters(
+            mode="character", incremental=True, budget=2, fetch=fake,
+        )
+        assert stats.characters == 2
+
+        fake.calls.clear()
+        stats = armory_sync_service.sync_characters(mode="character", incremental=True, fetch=fake)
+        assert [n for _, n in fake.calls] == ["HunterThree"]
+
+        fake.calls.clear()
+        stats = armory_sync_service.sync_characters(mode="character", incremental=True, fetch=fake)
+        assert stats.characters == 0
+        assert fake.calls == []
+
+    def test_upcoming_signups_prioritised(self, db, seed):
+        past = datetime.now(timezone.utc) - timedelta(minutes=5)
+        for key in ("char1", "char2", "char3"):
+            db.session.add(CharacterSyncState(character_id=seed[key].id, next_due_at=past))
+        db.session.commit()
+        _signup(db, seed, "char3")
+
+        fake = _FakeArmory(delay=0)
+        armory_sync_service.sync_characters(mode="character", incremental=True, budget=1, fetch=fake)
+        assert fake.calls == [("Icecrown", "HunterThree")]
+
+    def test_signed_up_characters_skip_backoff(self, app, db, seed):
+        _signup(db, seed, "char3")
+        fake = _FakeArmory(delay=0)
+        for _ in range(3):
+            armory_sync_service.sync_characters(mode="character", fetch=fake)
+
+        states = {
+            key: db.session.get(CharacterSyncState, seed[key].id) for key in ("char1", "char3")
+        }
+        assert states["char1"].unchanged_streak == states["char3"].unchanged_streak == 2
+        assert states["char3"].next_due_at < states["char1"].next_due_at
+
+    def test_failed_apply_is_rolled_back_and_retried(self, app, db, seed, monkeypatch):
+        real_apply = armory_sync_service.apply_character_data
+
+        def _half_apply(char, char_data):
+            char.primary_spec = "Half applied"
+            if char.name == "HunterTwo":
+                raise ValueError("bad payload")
+            real_apply(char, char_data)
+
+        monkeypatch.setattr(armory_sync_service, "apply_character_data", _half_apply)
+        fake = _FakeArmory(delay=0)
+        stats = armory_sync_service.sync_characters(mode="character", fetch=fake)
+        assert (stats.synced, stats.failed) == (2, 1)
+
+        db.session.expire_all()
+        assert db.session.get(Character, seed["char2"].id).primary_spec != "Half applied"
+        state = db.session.get(CharacterSyncState, seed["char2"].id)
+        assert state.content_hash is None
+        assert state.details_synced_at is None
+        min_interval = app.config["ARMORY_SYNC_MIN_INTERVAL_MINUTES"]
+        assert state.next_due_at.replace(tzinfo=timezone.utc) <= (
+            datetime.now(timezone.utc) + timedelta(minutes=min_interval)
+        )
+
+        # The next run sees a changed payload and applies it
+        monkeypatch.setattr(armory_sync_service, "apply_character_data", real_apply)
+        stats = armory_sync_service.sync_characters(mode="character", fetch=fake)
+        assert (stats.synced, stats.unchanged) == (1, 2)
+        assert db.session.get(CharacterSyncState, seed["char2"].id).content_hash is not None
@@ -504,14 +504,15 @@ class TestRealtimeEmits:
         ev = seed["event"]
         s1 = _signup(ev, seed["user1"], seed["char1"])
         _signup(ev, seed["user2"], seed["char2"])
-        _signup(ev, seed["user3"], seed["char3"], force_bench=True)
+        s3 = _signup(ev, seed["user3"], seed["char3"], force_bench=True)
 
         with patch("app.utils.realtime.emit_signups_changed") as mock_s, \
              patch("app.utils.realtime.emit_lineup_changed") as mock_l:
             signup_service.delete_signup(s1)
 
-        mock_s.assert_called_with(ev.id)
-        mock_l.assert_called_with(ev.id)
+        # The promoted signup travels with the event as a delta
+        mock_s.assert_called_with(ev.id, signups=[s3])
+        mock_l.assert_called_with(ev.id, signups=[s3])
 
     def test_no_emit_when_no_promotion(self, seed, db):
         """10c: No emit when bench is empty (no promotion occurs)."""
@@ -88,8 +88,8 @@ class TestBenchAutoPromote:
         ).all()
         assert len(bench_after) == 0
         # Real-time events should have been emitted
-        mock_emit_s.assert_called_with(event.id)
-        mock_emit_l.assert_called_with(event.id)
+        mock_emit_s.assert_called_with(event.id, signups=[s3])
+        mock_emit_l.assert_called_with(event.id, signups=[s3])
 
     def test_promote_on_decline(self, seed, db):
         """When a going player is declined via decline_signup(), the bench
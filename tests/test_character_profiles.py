@@ -0,0 +1,155 @@
+"""Tests for the normalised character profile / profession tables."""
+
+from __future__ import annotations
+
+import json
+
+from sqlalchemy import event as sa_event
+
+from app.models.character import Character, CharacterProfession, CharacterProfile
+from app.services import character_service
+
+_META = {
+    "level": "80", "race": "Orc", "gender": "Male", "faction": "Horde",
+    "guild": "Test Guild", "achievement_points": "4520", "honorable_kills": "1200",
+    "professions": [{"name": "Alchemy", "skill": "450"}, {"name": "Herbalism", "skill": "400"}],
+    "talents": [{"tree": "Marksmanship"}],
+    "equipment": [{"slot": "head", "item": "40505"}] * 18,
+    "last_synced": "2026-01-02T03:04:05+00:00",
+    "gear_score": 5600,
+}
+
+
+class _SelectCounter:
+    def __init__(self, engine):
+        self.engine = engine
+        self.statements = []
+
+    def _on_execute(self, conn, cursor, statement, *args):
+        if statement.lstrip().upper().startswith("SELECT"):
+            self.statements.append(statement)
+
+    def __enter__(self):
+        sa_event.listen(self.engine, "before_cursor_execute", self._on_execute)
+        return self
+
+    def __exit__(self, *exc):
+        sa_event.remove(self.engine, "before_cursor_execute", self._on_execute)
+
+
+class TestProfileStorage:
+    def test_metadata_round_trip(self, db, seed):
+        char = seed["char1"]
+        char.char_metadata = _META
+        db.session.commit()
+        db.session.expire_all()
+
+        char = db.session.get(Character, char.id)
+        assert char.metadata_json is None
+        assert char.profile.level == 80
+        assert char.profile.achievement_points == 4520
+        meta = char.char_metadata
+        assert meta["level"] == 80
+        assert meta["guild"] == "Test Guild"
+        assert meta["professions"] == _META["professions"]
+        assert meta["equipment"] == _META["equipment"]
+        assert meta["gear_score"] == 5600
+        assert meta["last_synced"] == "2026-01-02T03:04:05+00:00"
+        assert sorted((p.name, p.skill) for p in char.professions) == [
+            ("Alchemy", 450), ("Herbalism", 400),
+        ]
+
+    def test_lineup_view_skips_detail_columns(self, db, seed):
+        seed["char1"].char_metadata = _META
+        db.session.commit()
+        db.session.expire_all()
+
+        with _SelectCounter(db.engine) as selects:
+            char = db.session.get(Character, seed["char1"].id)
+            payload = char.to_dict(view="lineup")
+        assert len(selects.statements) == 1
+        assert "equipment_json" not in selects.statements[0]
+        assert payload["metadata"]["level"] == 80
+        assert payload["metadata"]["professions"] == _META["professions"]
+        assert "equipment" not in payload["metadata"]
+        assert "gear_score" not in payload["metadata"]
+
+    def test_professions_rewritten_on_change(self, db, seed):
+        char = seed["char1"]
+        char.char_metadata = _META
+        db.session.commit()
+        char.char_metadata = {**_META, "professions": [{"name": "Mining", "skill": "450"}]}
+        db.session.commit()
+
+        rows = db.session.query(CharacterProfession).filter_by(character_id=char.id).all()
+        assert [(p.name, p.skill) for p in rows] == [("Mining", 450)]
+
+    def test_legacy_blob_is_read_and_backfilled(self, db, seed):
+        char = seed["char2"]
+        char.metadata_json = json.dumps({"level": "80", "professions": [{"name": "Alchemy", "skill": "450"}]})
+        db.session.commit()
+        assert char.to_dict()["metadata"]["level"] == "80"
+
+        assert character_service.backfill_profiles() == 1
+        db.session.expire_all()
+        char = db.session.get(Character, char.id)
+        assert char.metadata_json is None
+        assert char.profile.level == 80
+        assert character_service.backfill_profiles() == 0
+
+    def test_deleting_character_removes_profile(self, db, seed):
+        char = seed["char3"]
+        char.char_metadata = _META
+        db.session.commit()
+        char_id = char.id
+
+        character_service.delete_character(char)
+
+        assert db.session.get(CharacterProfile, char_id) is None
+        assert db.session.query(CharacterProfession).filter_by(character_id=char_id).count() == 0
+
+
+class TestCharacterSearch:
+    def _profiles(self, db, seed):
+        seed["char1"].char_metadata = _META
+        seed["char2"].char_metadata = {
+            **_META, "level": "79", "professions": [{"name": "Alchemy", "skill": "375"}],
+        }
+        seed["char3"].char_metadata = {**_META, "faction": "Alliance", "professions": []}
+        db.session.commit()
+
+    def test_level_and_profession_filters(self, db, seed):
+        self._profiles(db, seed)
+        gid = seed["guild"].id
+
+        def names(**kw):
+            return [c.name for c in character_service.search_characters(gid, **kw)]
+
+        assert names(level=80) == ["HunterOne", "HunterThree"]
+        assert names(profession="Alchemy") == ["HunterOne", "HunterTwo"]
+        assert names(level=80, profession="Alchemy", min_skill=450) == ["HunterOne"]
+        assert names(faction="Alliance") == ["HunterThree"]
+        assert names(min_level=81) == []
+
+    def test_search_endpoint(self, app, db, seed):
+        from flask import session as flask_session
+        from flask_login import login_user
+
+        self._profiles(db, seed)
+        admin = seed["user1"]
+        admin.is_admin = True
+        db.session.commit()
+        client = app.test_client()
+        with app.test_request_context():
+            login_user(admin)
+            sess_data = dict(flask_session)
+        with client.session_transaction() as s:
+            s.update(sess_data)
+
+        resp = client.get(
+            f"/api/v1/guilds/{seed['guild'].id}/characters?level=80&profession=Alchemy"
+        )
+        assert resp.status_code == 200
+        body = resp.get_json()
+        assert [c["name"] for c in body] == ["HunterOne"]
+        assert "equipment" not in body[0]["metadata"]
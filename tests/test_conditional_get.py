@@ -0,0 +1,129 @@
+"""Tests for change counters and ETag / If-None-Match handling."""
+
+from __future__ import annotations
+
+import pytest
+
+from app.models.guild import GuildMembership
+from app.services import change_counter_service, character_service, notification_service, signup_service
+from app.services.change_counter_service import EVENT, GUILD_EVENTS, GUILD_ROSTER, NOTIFICATIONS
+
+
+@pytest.fixture
+def client(app, db, seed):
+    """A logged-in guild member client."""
+    from flask import session as flask_session
+    from flask_login import login_user
+
+    db.session.add(GuildMembership(
+        guild_id=seed["guild"].id, user_id=seed["user1"].id, role="member", status="active",
+    ))
+    db.session.commit()
+    client = app.test_client()
+    with app.test_request_context():
+        login_user(seed["user1"])
+        sess_data = dict(flask_session)
+    with client.session_transaction() as s:
+        s.update(sess_data)
+    return client
+
+
+def _revalidate(client, url):
+    first = client.get(url)
+    assert first.status_code == 200
+    etag = first.headers["ETag"]
+    assert etag.startswith('W/"')
+    assert first.headers["Cache-Control"] == "private, no-cache"
+    again = client.get(url, headers={"If-None-Match": etag})
+    return etag, again
+
+
+class TestChangeCounters:
+    def _version(self, key):
+        return change_counter_service.versions([key])[key]
+
+    def test_orm_changes_bump_counters(self, db, seed):
+        event_key = (EVENT, seed["event"].id)
+        guild_key = (GUILD_EVENTS, seed["guild"].id)
+        before = change_counter_service.versions([event_key, guild_key])
+
+        signup_service.create_signup(
+            seed["event"].id, seed["user1"].id, seed["char1"].id, "range_dps", None, None, 2,
+        )
+        after = change_counter_service.versions([event_key, guild_key])
+        assert after[event_key] > before[event_key]
+        # Stored signup counts changed, so the calendar feed changed too
+        assert after[guild_key] > before[guild_key]
+
+        roster_key = (GUILD_ROSTER, seed["guild"].id)
+        roster = self._version(roster_key)
+        seed["char2"].char_metadata = {"level": "80"}
+        db.session.commit()
+        assert self._version(roster_key) > roster
+
+    def test_bulk_statements_touch_counters(self, db, seed):
+        signup_service.create_signup(
+            seed["event"].id, seed["user2"].id, seed["char2"].id, "range_dps", None, None, 2,
+        )
+        event_key = (EVENT, seed["event"].id)
+        version = self._version(event_key)
+        character_service.delete_character(seed["char2"])
+        assert self._version(event_key) > version
+
+        notif_key = (NOTIFICATIONS, seed["user1"].id)
+        notification_service.create_notifications([seed["user1"].id], "test", "Hello")
+        created = self._version(notif_key)
+        assert created > 0
+        notification_service.mark_all_read(seed["user1"].id)
+        assert self._version(notif_key) > created
+
+    def test_unknown_keys_are_zero(self, db, seed):
+        assert change_counter_service.versions([(EVENT, 999_999)]) == {(EVENT, 999_999): 0}
+
+
+class TestConditionalGet:
+    def test_lineup_not_modified_until_signup(self, client, seed):
+        url = f"/api/v1/guilds/{seed['guild'].id}/events/{seed['event'].id}/lineup"
+        etag, again = _revalidate(client, url)
+        assert again.status_code == 304
+        assert again.data == b""
+        assert again.headers["ETag"] == etag
+
+        signup_service.create_signup(
+            seed["event"].id, seed["user1"].id, seed["char1"].id, "range_dps", None, None, 2,
+        )
+        changed = client.get(url, headers={"If-None-Match": etag})
+        assert changed.status_code == 200
+        assert changed.headers["ETag"] != etag
+
+    def test_signups_follow_roster_changes(self, client, db, seed):
+        signup_service.create_signup(
+            seed["event"].id, seed["user1"].id, seed["char1"].id, "range_dps", None, None, 2,
+        )
+        url = f"/api/v1/guilds/{seed['guild'].id}/events/{seed['event'].id}/signups"
+        etag, again = _revalidate(client, url)
+        assert again.status_code == 304
+
+        seed["char1"].char_metadata = {"level": "80", "race": "Troll"}
+        db.session.commit()
+        assert client.get(url, headers={"If-None-Match": etag}).status_code == 200
+
+    def test_views_get_distinct_tags(self, client, db, seed):
+        url = f"/api/v1/guilds/{seed['guild'].id}/events"
+        etag, again = _revalidate(client, url)
+        assert again.status_code == 304
+        assert client.get(f"{url}?view=full", headers={"If-None-Match": etag}).status_code == 200
+
+        seed["event"].title = "Renamed"
+        db.session.commit()
+        assert client.get(url, headers={"If-None-Match": etag}).status_code == 200
+
+    def test_unread_count(self, client, seed):
+        url = "/api/v1/notifications/unread-count"
+        etag, again = _revalidate(client, url)
+        assert again.status_code == 304
+
+        notification_service.create_notifications([seed["user1"].id], "test", "Hello")
+        changed = client.get(url, headers={"If-None-Match": etag})
+        assert changed.status_code == 200
+        assert changed.get_json() == {"count": 1}
@@ -0,0 +1,200 @@
+"""Tests for the exact-time event auto-lock schedule."""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+import pytest
+import sqlalchemy as sa
+
+from app.jobs import autolock
+from app.jobs.autolock import LockSchedule
+from app.jobs.handlers import auto_lock_upcoming_events
+from app.models.guild import GuildMembership
+from app.models.notification import Notification
+from app.models.raid import RaidEvent
+from app.models.signup import Signup
+from app.services import event_service
+
+
+def _at(minutes: float) -> datetime:
+    return datetime.now(timezone.utc) + timedelta(minutes=minutes)
+
+
+def _event(db, seed, starts_in_hours=24, close_in_minutes=None, status="open"):
+    starts = _at(starts_in_hours * 60)
+    event = RaidEvent(
+        guild_id=seed["guild"].id, title=f"Raid {starts_in_hours}h",
+        realm_name="Icecrown", raid_size=2, difficulty="normal",
+        starts_at_utc=starts, ends_at_utc=starts + timedelta(hours=3),
+        close_signups_at=_at(close_in_minutes) if close_in_minutes is not None else None,
+        status=status, created_by=seed["user1"].id,
+    )
+    db.session.add(event)
+    db.session.commit()
+    return event
+
+
+@pytest.fixture
+def active(app, ctx):
+    """Run the auto-lock schedule as if this process were the leader."""
+    autolock.start(app)
+    yield autolock.get_schedule()
+    autolock.stop()
+
+
+class TestLockSchedule:
+    def test_pops_in_deadline_order(self):
+        schedule = LockSchedule()
+        now = datetime.now(timezone.utc)
+        schedule.reset([(1, now + timedelta(minutes=3)), (2, now + timedelta(minutes=1))])
+        schedule.set(3, now + timedelta(minutes=2))
+        assert schedule.next_deadline() == now + timedelta(minutes=1)
+        assert schedule.pop_due(now + timedelta(minutes=2)) == [2, 3]
+        assert len(schedule) == 1
+
+    def test_rescheduled_and_dropped_entries_are_skipped(self):
+        schedule = LockSchedule()
+        now = datetime.now(timezone.utc)
+        schedule.set(1, now + timedelta(minutes=1))
+        schedule.set(2, now + timedelta(minutes=2))
+        schedule.set(1, now + timedelta(minutes=5))
+        schedule.set(2, None)
+        assert schedule.next_deadline() == now + timedelta(minutes=5)
+        assert schedule.pop_due(now + timedelta(minutes=3)) == []
+        assert schedule.pop_due(now + timedelta(minutes=5)) == [1]
+
+
+class TestAutoLock:
+    def test_locks_due_events_in_one_pass(self, app, db, seed):
+        closed = _event(db, seed, close_in_minutes=-1)
+        starting = _event(db, seed, starts_in_hours=3)
+        later = _event(db, seed, starts_in_hours=48, close_in_minutes=30)
+        draft = _event(db, seed, close_in_minutes=-1, status="draft")
+
+        with patch("app.utils.realtime.socketio.emit"):
+            assert auto_lock_upcoming_events(app) == 2
+
+        db.session.expire_all()
+        assert [db.session.get(RaidEvent, e.id).status for e in (closed, starting, later, draft)] == [
+            "locked", "locked", "open", "draft",
+        ]
+        assert db.session.get(RaidEvent, closed.id).locked_at is not None
+        # The seeded event starts in 24h with no close time
+        assert db.session.get(RaidEvent, seed["event"].id).status == "open"
+
+    def test_announces_like_a_manual_lock(self, app, db, seed):
+        first = _event(db, seed, close_in_minutes=-1)
+        _event(db, seed, close_in_minutes=-2)
+        db.session.add(Signup(
+            raid_event_id=first.id, user_id=seed["user2"].id, character_id=seed["char2"].id,
+            chosen_role="range_dps",
+        ))
+        db.session.commit()
+
+        with patch("app.utils.realtime.socketio.emit") as emit:
+            auto_lock_upcoming_events(app)
+        names = [c.args[0] for c in emit.call_args_list]
+        # Both locks share one guild emit
+        assert names.count("events_changed") == 1
+        assert "notification" in names
+        notified = db.session.execute(
+            sa.select(Notification.user_id).where(Notification.type == "event_locked")
+        ).scalars().all()
+        assert notified == [seed["user2"].id]
+
+    def test_bumps_etags(self, app, db, seed):
+        from flask import session as flask_session
+        from flask_login import login_user
+
+        db.session.add(GuildMembership(
+            guild_id=seed["guild"].id, user_id=seed["user1"].id, role="member", status="active",
+        ))
+        db.session.commit()
+        event = _event(db, seed, close_in_minutes=-1)
+        client = app.test_client()
+        with app.test_request_context():
+            login_user(seed["user1"])
+            sess_data = dict(flask_session)
+        with client.session_transaction() as s:
+            s.update(sess_data)
+
+        guild_id = seed["guild"].id
+        urls = [
+            f"/api/v1/guilds/{guild_id}/events",
+            "/api/v1/events",
+            f"/api/v1/guilds/{guild_id}/events/{event.id}/signups",
+        ]
+        etags = [client.get(url).headers["ETag"] for url in urls]
+        with patch("app.utils.realtime.socketio.emit"):
+            assert auto_lock_upcoming_events(app) == 1
+        for url, etag in zip(urls, etags):
+            assert client.get(url, headers={"If-None-Match": etag}).status_code == 200, url
+
+    def test_nothing_due(self, app, db, seed):
+        with patch("app.utils.realtime.socketio.emit") as emit:
+            assert auto_lock_upcoming_events(app) == 0
+        assert not emit.called
+
+
+class TestSchedule:
+    def test_rebuilt_from_open_events(self, app, db, seed, active):
+        _event(db, seed, close_in_minutes=10, status="locked")
+        autolock.start(app)
+        assert len(active) == 1
+        assert active.next_deadline() == (
+            autolock._utc(seed["event"].starts_at_utc) - autolock.FALLBACK_LOCK_BEFORE_START
+        )
+
+    def test_arms_one_job_for_the_earliest_deadline(self, app, db, seed):
+        with patch("app.jobs.scheduler.scheduler") as scheduler:
+            scheduler.running = True
+            autolock.start(app)
+            soon = _event(db, seed, close_in_minutes=2)
+            autolock.track_event(soon)
+            autolock.track_event(_event(db, seed, close_in_minutes=20))
+            autolock.stop()
+        run_dates = [c.kwargs["run_date"] for c in scheduler.add_job.call_args_list]
+        assert run_dates == [
+            autolock._utc(seed["event"].starts_at_utc) - autolock.FALLBACK_LOCK_BEFORE_START,
+            autolock._utc(soon.close_signups_at),
+        ]
+        assert {c.kwargs["id"] for c in scheduler.add_job.call_args_list} == {autolock.LOCK_JOB_ID}
+
+    def test_kept_current_by_event_service(self, db, seed, active):
+        event = event_service.create_event(seed["guild"].id, seed["user1"].id, {
+            "title": "Fresh", "realm_name": "Icecrown",
+            "starts_at_utc": _at(24 * 60).isoformat(),
+            "close_signups_at": _at(5).isoformat(),
+        })
+        assert active.next_deadline() == autolock._utc(event.close_signups_at)
+
+        event_service.update_event(event, {"close_signups_at": _at(60).isoformat()})
+        assert active.next_deadline() > _at(30)
+
+        event_service.update_event(event, {"status": "cancelled"})
+        assert len(active) == 1  # only the seeded event is left
+
+    def test_refresh_picks_up_other_processes(self, db, seed, active):
+        # Written without the service, as another worker would be seen
+        event = _event(db, seed, close_in_minutes=2)
+        assert len(active) == 1
+        autolock.refresh()
+        assert active.next_deadline() == autolock._utc(event.close_signups_at)
+
+    def test_fire_locks_and_moves_on(self, app, db, seed, active):
+        event = _event(db, seed, close_in_minutes=-1)
+        autolock.refresh()
+        with patch("app.utils.realtime.socketio.emit"):
+            autolock.fire(app)
+        db.session.expire_all()
+        assert db.session.get(RaidEvent, event.id).status == "locked"
+        assert event.id not in autolock.get_schedule().pop_due(_at(10 ** 5))
+
+    def test_inactive_outside_the_leader(self, db, seed, ctx):
+        event_service.create_event(seed["guild"].id, seed["user1"].id, {
+            "title": "Fresh", "realm_name": "Icecrown",
+            "starts_at_utc": _at(24 * 60).isoformat(),
+        })
+        assert len(autolock.get_schedule()) == 0
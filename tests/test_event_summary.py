@@ -0,0 +1,116 @@
+"""Tests for materialised event summaries used by the calendar feed."""
+
+from __future__ import annotations
+
+from app.extensions import bcrypt
+from app.models.guild import GuildMembership
+from app.models.raid import EventSummary
+from app.services import event_service, event_summary_service, lineup_service, signup_service
+
+
+def _signup(seed, user, char, force_bench=False):
+    event = seed["event"]
+    return signup_service.create_signup(
+        raid_event_id=event.id, user_id=user.id, character_id=char.id,
+        chosen_role="range_dps", chosen_spec=None, note=None,
+        raid_size=event.raid_size, force_bench=force_bench, event=event,
+    )
+
+
+def _summary_row(db, event_id):
+    db.session.expire_all()
+    return db.session.get(EventSummary, event_id)
+
+
+class TestSummaryMaintenance:
+    def test_summary_written_on_signup(self, db, seed):
+        event = seed["event"]
+        _signup(seed, seed["user1"], seed["char1"])
+        _signup(seed, seed["user2"], seed["char2"])
+        _signup(seed, seed["user3"], seed["char3"], force_bench=True)
+
+        row = _summary_row(db, event.id)
+        assert row is not None
+        assert row.signup_count == 3
+        assert row.going_count == 2
+        assert row.bench_count == 1
+        assert row.role_counts == {"range_dps": 2}
+
+    def test_summary_updated_on_decline_with_promotion(self, db, seed):
+        event = seed["event"]
+        s1 = _signup(seed, seed["user1"], seed["char1"])
+        _signup(seed, seed["user2"], seed["char2"])
+        _signup(seed, seed["user3"], seed["char3"], force_bench=True)
+
+        signup_service.decline_signup(s1)
+
+        row = _summary_row(db, event.id)
+        assert row.signup_count == 2
+        assert row.going_count == 2
+        assert row.bench_count == 0
+
+    def test_summary_updated_on_delete(self, db, seed):
+        event = seed["event"]
+        s1 = _signup(seed, seed["user1"], seed["char1"])
+        signup_service.delete_signup(s1)
+        row = _summary_row(db, event.id)
+        assert row.signup_count == 0
+        assert row.role_counts == {}
+
+    def test_signup_in_role_and_bench_counts_once(self, db, seed):
+        event = seed["event"]
+        s1 = _signup(seed, seed["user1"], seed["char1"])
+        s2 = _signup(seed, seed["user2"], seed["char2"])
+        lineup_service.update_lineup_grouped(
+            event.id, {"range_dps": [s1.id, s2.id], "bench_queue": [s1.id]}, seed["user1"].id,
+        )
+        statuses = lineup_service.build_lineup_status_map([event.id])
+        assert statuses[s1.id]["lineup_status"] == "going"
+
+        row = _summary_row(db, event.id)
+        assert row.signup_count == 2
+        assert row.going_count == 2
+        assert row.bench_count == 0
+        assert row.role_counts == {"range_dps": 2}
+
+    def test_summary_removed_with_event(self, db, seed):
+        event = seed["event"]
+        event_id = event.id
+        _signup(seed, seed["user1"], seed["char1"])
+        event_service.delete_event(event)
+        assert _summary_row(db, event_id) is None
+
+    def test_fallback_for_event_without_row(self, db, seed):
+        event = seed["event"]
+        assert event.summary is None
+        assert event_summary_service.get_summary(event)["signup_count"] == 0
+
+    def test_rebuild_all(self, db, seed):
+        event = seed["event"]
+        _signup(seed, seed["user1"], seed["char1"])
+        db.session.delete(_summary_row(db, event.id))
+        db.session.commit()
+        assert event_summary_service.rebuild_all() == 1
+        assert _summary_row(db, event.id).signup_count == 1
+
+
+class TestCalendarFeed:
+    def test_feed_includes_summary_counts(self, app, db, seed):
+        user1 = seed["user1"]
+        user1.password_hash = bcrypt.generate_password_hash("pw123456").decode("utf-8")
+        db.session.add(GuildMembership(
+            guild_id=seed["guild"].id, user_id=user1.id, role="member", status="active",
+        ))
+        db.session.commit()
+        _signup(seed, user1, seed["char1"])
+        _signup(seed, seed["user3"], seed["char3"], force_bench=True)
+
+        client = app.test_client()
+        client.post("/api/v1/auth/login", json={"email": user1.email, "password": "pw123456"})
+        resp = client.get("/api/v1/events?include_signup_count=true")
+        assert resp.status_code == 200
+        [ev] = resp.get_json()
+        assert ev["signup_count"] == 2
+        assert ev["going_count"] == 1
+        assert ev["bench_count"] == 1
+        assert ev["role_counts"] == {"range_dps": 1}
@@ -39,6 +39,8 @@ def db(app):
         _db.create_all()
         from app.utils.rate_limit import reset as _reset_rate_limit
         _reset_rate_limit()
+        from app.utils.permissions import reset_permission_cache
+        reset_permission_cache()
         yield _db
         _db.session.rollback()
         _db.drop_all()
@@ -0,0 +1,80 @@
+"""Tests for the compiled translation catalog."""
+
+from __future__ import annotations
+
+import json
+
+import pytest
+from flask import g
+
+from app import i18n
+from app.i18n import _t, render_many, translate
+
+
+@pytest.fixture
+def catalog(tmp_path, monkeypatch):
+    """Compile a small catalog from temporary locale files."""
+    (tmp_path / "en.json").write_text(json.dumps({
+        "greet": {"hello": "Hello {name}", "plain": "Hi", "braces": "Use {0} or {name!r}"},
+        "onlyEnglish": "English only",
+        "broken": "Oops {",
+    }), encoding="utf-8")
+    (tmp_path / "pl.json").write_text(json.dumps({
+        "greet": {"hello": "Cześć {name}", "plain": "Hej"},
+    }), encoding="utf-8")
+    monkeypatch.setattr(i18n, "_TRANSLATIONS_DIR", str(tmp_path))
+    i18n._load_translations()
+    yield
+    monkeypatch.undo()
+    i18n._load_translations()
+
+
+class TestCatalog:
+    def test_flattened_lookup_and_fallbacks(self, catalog):
+        assert ("pl", "greet.hello") in i18n._CATALOG
+        # Missing Polish keys are precomputed from English
+        assert i18n._CATALOG[("pl", "onlyEnglish")] is i18n._CATALOG[("en", "onlyEnglish")]
+        assert translate("pl", "onlyEnglish") == "English only"
+        assert translate("pl", "no.such.key") == "no.such.key"
+        assert translate("pl", "greet") == "greet"
+
+    def test_interpolation(self, catalog):
+        assert translate("pl", "greet.hello", name="Arthas") == "Cześć Arthas"
+        assert translate("en", "greet.hello") == "Hello {name}"
+        assert translate("en", "greet.hello", other="x") == "Hello {name}"
+        assert translate("en", "greet.braces", name="x") == "Use {0} or {name!r}"
+        assert translate("en", "broken", name="x") == "Oops {"
+
+    def test_render_many(self, catalog):
+        items = [("greet.hello", {"name": "Jaina"}), ("greet.plain", None), ("missing", {})]
+        assert render_many(items, locale="pl") == ["Cześć Jaina", "Hej", "missing"]
+
+
+class TestRequestLocale:
+    def test_locale_resolved_once_per_request(self, app, monkeypatch):
+        calls = []
+        resolve = i18n._resolve_locale
+
+        def _counting():
+            calls.append(1)
+            return resolve()
+
+        monkeypatch.setattr(i18n, "_resolve_locale", _counting)
+        with app.test_request_context(headers={"Accept-Language": "pl"}):
+            first = _t("common.errors.forbidden")
+            assert _t("common.errors.forbidden") == first
+            assert render_many([("common.errors.forbidden", None)]) == [first]
+            assert g._i18n_locale[1] == "pl"
+        assert len(calls) == 1
+
+    def test_login_mid_request_switches_locale(self, app, db, seed):
+        from flask_login import login_user
+
+        user = seed["user1"]
+        user.language = "pl"
+        db.session.commit()
+        with app.test_request_context(headers={"Accept-Language": "en"}):
+            english = _t("common.errors.forbidden")
+            login_user(user)
+            assert _t("common.errors.forbidden") == translate("pl", "common.errors.forbidden")
+            assert _t("common.errors.forbidden") != english
@@ -0,0 +1,233 @@
+"""Tests for the job queue worker: execution, wakeup and concurrency limits."""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+import sqlalchemy as sa
+
+from app.jobs import handlers
+from app.extensions import db as _db
+from app.jobs.worker import (
+    JobWorker, _workers, claim_jobs, claim_next_job, complete_job, enqueue_job, fail_job,
+    renew_leases, requeue_stale_jobs, retry_delay, run_job,
+)
+from app.models.notification import JobQueue
+
+
+@pytest.fixture
+def test_handlers():
+    """Register throwaway handlers for the duration of a test."""
+    calls: list[dict] = []
+
+    def _ok(payload):
+        calls.append(payload)
+
+    def _boom(payload):
+        raise RuntimeError("boom")
+
+    handlers._HANDLERS["test_ok"] = _ok
+    handlers._HANDLERS["test_boom"] = _boom
+    handlers._HANDLERS["test_other"] = _ok
+    yield calls
+    for name in ("test_ok", "test_boom", "test_other"):
+        handlers._HANDLERS.pop(name, None)
+
+
+def _aware(dt):
+    return dt if dt.tzinfo else dt.replace(tzinfo=timezone.utc)
+
+
+def _age_lease(job, seconds):
+    job.locked_at = datetime.now(timezone.utc) - timedelta(seconds=seconds)
+    _db.session.commit()
+
+
+class _RecordingExecutor:
+    """Stands in for the thread pool: records submissions without running them."""
+
+    def __init__(self):
+        self.submitted = []
+
+    def submit(self, fn, job_id, job_type, attempt):
+        self.submitted.append(job_type)
+
+
+class TestRunJob:
+    def test_success(self, db, ctx, test_handlers):
+        job = enqueue_job("test_ok", {"n": 1})
+        run_job(claim_next_job())
+        assert test_handlers == [{"n": 1}]
+        assert db.session.get(JobQueue, job.id).status == "done"
+
+    def test_handler_error_retries_with_backoff(self, app, db, ctx, test_handlers):
+        job = enqueue_job("test_boom", {})
+        before = datetime.now(timezone.utc)
+        run_job(claim_next_job())
+        job = db.session.get(JobQueue, job.id)
+        assert job.status == "queued"
+        assert job.last_error == "boom"
+        base = app.config["JOB_RETRY_BASE_SECONDS"]
+        assert _aware(job.available_at) >= before + timedelta(seconds=base)
+        # Not claimable until the backoff has elapsed
+        assert claim_next_job() is None
+
+    def test_handler_error_fails_after_max_attempts(self, app, db, ctx, test_handlers, monkeypatch):
+        monkeypatch.setitem(app.config, "JOB_MAX_ATTEMPTS", 2)
+        job = enqueue_job("test_boom", {})
+        for _ in range(2):
+            claimed = claim_next_job()
+            run_job(claimed)
+            claimed.available_at = datetime.now(timezone.utc)
+            db.session.commit()
+        job = db.session.get(JobQueue, job.id)
+        assert job.status == "failed"
+        assert job.attempts == 2
+
+    def test_retry_delay_is_exponential_and_capped(self, app, ctx, monkeypatch):
+        monkeypatch.setitem(app.config, "JOB_RETRY_BASE_SECONDS", 10)
+        monkeypatch.setitem(app.config, "JOB_RETRY_MAX_SECONDS", 60)
+        assert [retry_delay(n).total_seconds() for n in (1, 2, 3, 4, 5)] == [10, 20, 40, 60, 60]
+
+    def test_unknown_type_marks_failed(self, db, ctx):
+        job = enqueue_job("no_such_type", {})
+        run_job(claim_next_job())
+        assert db.session.get(JobQueue, job.id).status == "failed"
+
+
+class TestClaiming:
+    def test_batch_claim(self, db, ctx):
+        ids = [enqueue_job("test_ok", {"n": i}).id for i in range(5)]
+        first = claim_jobs(3)
+        second = claim_jobs(3)
+        assert [j.id for j in first] == ids[:3]
+        assert [j.id for j in second] == ids[3:]
+        assert all(j.status == "running" and j.attempts == 1 for j in first + second)
+        assert claim_jobs(3) == []
+
+    def test_claim_without_returning_support(self, db, ctx, monkeypatch):
+        monkeypatch.setattr(db.engine.dialect, "update_returning", False)
+        ids = [enqueue_job("test_ok", {}).id for _ in range(3)]
+        assert [j.id for j in claim_jobs(2)] == ids[:2]
+        assert [j.id for j in claim_jobs(2)] == ids[2:]
+
+    def test_claim_skips_excluded_types(self, db, ctx):
+        enqueue_job("test_ok", {})
+        other = enqueue_job("test_other", {})
+        assert [j.id for j in claim_jobs(5, exclude_types={"test_ok"})] == [other.id]
+
+
+class TestLeases:
+    def test_stale_running_job_is_requeued(self, db, ctx):
+        job = enqueue_job("test_ok", {})
+        claimed = claim_next_job()
+        _age_lease(claimed, 3600)
+        assert requeue_stale_jobs() == 1
+        db.session.expire_all()
+        job = db.session.get(JobQueue, job.id)
+        assert job.status == "queued"
+        assert job.last_error == "Lease expired"
+        assert claim_next_job().id == job.id
+
+    def test_stale_job_out_of_attempts_fails(self, app, db, ctx, monkeypatch):
+        monkeypatch.setitem(app.config, "JOB_MAX_ATTEMPTS", 1)
+        job = enqueue_job("test_ok", {})
+        _age_lease(claim_next_job(), 3600)
+        requeue_stale_jobs()
+        db.session.expire_all()
+        assert db.session.get(JobQueue, job.id).status == "failed"
+
+    def test_renewed_lease_is_not_stale(self, db, ctx):
+        job = enqueue_job("test_ok", {})
+        _age_lease(claim_next_job(), 3600)
+        renew_leases({job.id: 1})
+        assert requeue_stale_jobs() == 0
+        db.session.expire_all()
+        assert db.session.get(JobQueue, job.id).status == "running"
+
+    def test_stalled_worker_cannot_touch_the_new_claim(self, app, db, ctx, test_handlers):
+        enqueue_job("test_ok", {"n": 1})
+        first = JobWorker(app, pool_size=1)
+        first._executor = _RecordingExecutor()
+        first.drain()
+        stalled_job_id, stalled_attempt = next(iter(first._leases.items()))
+
+        # Worker A stalls past its lease; worker B recovers and claims the job
+        _age_lease(db.session.get(JobQueue, stalled_job_id), 3600)
+        assert requeue_stale_jobs() == 1
+        second = JobWorker(app, pool_size=1)
+        second._executor = _RecordingExecutor()
+        assert second.drain() == 1
+        assert second._leases == {stalled_job_id: stalled_attempt + 1}
+
+        # A's renewals and its late result no longer match the row
+        _age_lease(db.session.get(JobQueue, stalled_job_id), 3600)
+        renew_leases(first._leases)
+        job = db.session.get(JobQueue, stalled_job_id)
+        assert not complete_job(job, stalled_attempt)
+        assert not fail_job(job, "late", attempt=stalled_attempt)
+        db.session.expire_all()
+        job = db.session.get(JobQueue, stalled_job_id)
+        assert (job.status, job.attempts, job.last_error) == ("running", 2, "Lease expired")
+        assert requeue_stale_jobs() == 1  # A's renewal did not extend B's lease
+
+        # A task that lost its lease before starting is skipped
+        first._execute(stalled_job_id, "test_ok", stalled_attempt)
+        assert test_handlers == []
+
+    def test_current_claim_completes(self, db, ctx, test_handlers):
+        enqueue_job("test_ok", {})
+        job = claim_next_job()
+        assert complete_job(job, 1)
+        assert db.session.get(JobQueue, job.id).status == "done"
+
+
+class TestJobWorker:
+    def test_enqueue_wakes_local_workers(self, app, db, ctx):
+        worker = JobWorker(app, poll_interval=60)
+        _workers.add(worker)
+        try:
+            assert not worker._wakeup.is_set()
+            enqueue_job("test_ok", {})
+            assert worker._wakeup.is_set()
+        finally:
+            _workers.discard(worker)
+
+    def test_drain_respects_pool_size(self, app, db, ctx, test_handlers):
+        for _ in range(3):
+            enqueue_job("test_ok", {})
+        worker = JobWorker(app, pool_size=2)
+        worker._executor = _RecordingExecutor()
+        assert worker.drain() == 2
+        assert worker._executor.submitted == ["test_ok", "test_ok"]
+
+    def test_drain_respects_per_type_limit(self, app, db, ctx, test_handlers):
+        for _ in range(3):
+            enqueue_job("test_ok", {})
+        enqueue_job("test_other", {})
+        worker = JobWorker(app, pool_size=10, concurrency={"test_ok": 1})
+        worker._executor = _RecordingExecutor()
+        assert worker.drain() == 2
+        assert sorted(worker._executor.submitted) == ["test_ok", "test_other"]
+        assert worker._running == {"test_ok": 1, "test_other": 1}
+
+        queued = db.session.execute(
+            sa.select(sa.func.count()).select_from(JobQueue).where(JobQueue.status == "queued")
+        ).scalar()
+        assert queued == 2
+
+    def test_execute_runs_job_and_frees_slot(self, app, db, ctx, test_handlers):
+        job = enqueue_job("test_ok", {"n": 2})
+        worker = JobWorker(app, pool_size=1)
+        worker._executor = _RecordingExecutor()
+        worker.drain()
+        worker._wakeup.clear()
+
+        worker._execute(job.id, "test_ok", 1)
+
+        assert test_handlers == [{"n": 2}]
+        assert worker._in_flight == 0
+        assert worker._wakeup.is_set()
+        db.session.expire_all()
+        assert db.session.get(JobQueue, job.id).status == "done"
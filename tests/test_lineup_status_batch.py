@@ -0,0 +1,112 @@
+"""Tests for batched lineup-status resolution used by Signup.to_dict.
+
+Verifies that ``lineup_service.build_lineup_status_map`` produces the same
+lineup_status / bench_info as the per-signup helpers, and that serialising
+a whole roster runs a fixed number of queries regardless of roster size.
+"""
+
+from __future__ import annotations
+
+from sqlalchemy import event as sa_event
+
+from app.models.character import Character
+from app.models.user import User
+from app.services import lineup_service, signup_service
+
+
+def _add_player(db, guild, name):
+    u = User(username=name, email=f"{name}@test.com", password_hash="x", is_active=True)
+    db.session.add(u)
+    db.session.flush()
+    c = Character(
+        user_id=u.id, guild_id=guild.id, realm_name="Icecrown",
+        name=name.title(), class_name="Hunter", default_role="range_dps",
+        is_main=True, is_active=True,
+    )
+    db.session.add(c)
+    db.session.commit()
+    return u, c
+
+
+def _signup(seed, user, char, force_bench=False):
+    event = seed["event"]
+    return signup_service.create_signup(
+        raid_event_id=event.id, user_id=user.id, character_id=char.id,
+        chosen_role="range_dps", chosen_spec=None, note=None,
+        raid_size=event.raid_size, force_bench=force_bench, event=event,
+    )
+
+
+class _QueryCounter:
+    def __init__(self, engine):
+        self.engine = engine
+        self.count = 0
+
+    def _on_execute(self, *args, **kwargs):
+        self.count += 1
+
+    def __enter__(self):
+        sa_event.listen(self.engine, "before_cursor_execute", self._on_execute)
+        return self
+
+    def __exit__(self, *exc):
+        sa_event.remove(self.engine, "before_cursor_execute", self._on_execute)
+
+
+class TestBuildLineupStatusMap:
+    def test_empty_event_list(self, seed):
+        assert lineup_service.build_lineup_status_map([]) == {}
+
+    def test_matches_per_signup_helpers(self, db, seed):
+        s1 = _signup(seed, seed["user1"], seed["char1"])
+        s2 = _signup(seed, seed["user2"], seed["char2"])
+        s3 = _signup(seed, seed["user3"], seed["char3"], force_bench=True)
+        u4, c4 = _add_player(db, seed["guild"], "benchtwo")
+        s4 = _signup(seed, u4, c4, force_bench=True)
+
+        status_map = lineup_service.build_lineup_status_map([seed["event"].id])
+
+        for s in (s1, s2, s3, s4):
+            info = status_map[s.id]
+            assert (info["lineup_status"] == "going") == lineup_service.has_role_slot(s.id)
+            assert info["bench_info"] == lineup_service.get_bench_info(s.id)
+
+        assert status_map[s3.id]["bench_info"]["queue_position"] == 1
+        assert status_map[s4.id]["bench_info"]["queue_position"] == 2
+
+    def test_declined_signup_absent(self, db, seed):
+        s1 = _signup(seed, seed["user1"], seed["char1"])
+        signup_service.decline_signup(s1)
+        status_map = lineup_service.build_lineup_status_map([seed["event"].id])
+        assert s1.id not in status_map
+        d = s1.to_dict(lineup_status_map=status_map)
+        assert d["lineup_status"] == "declined"
+        assert d["bench_info"] is None
+
+    def test_to_dict_without_map_resolves_status(self, db, seed):
+        _signup(seed, seed["user1"], seed["char1"])
+        _signup(seed, seed["user2"], seed["char2"])
+        s3 = _signup(seed, seed["user3"], seed["char3"], force_bench=True)
+        d = s3.to_dict()
+        assert d["lineup_status"] == "bench"
+        assert d["bench_info"] == {"waiting_for": "range_dps", "queue_position": 1}
+
+
+class TestFixedQueryCount:
+    def test_lineup_grouped_query_count_independent_of_roster(self, db, seed):
+        event = seed["event"]
+        _signup(seed, seed["user1"], seed["char1"])
+        _signup(seed, seed["user2"], seed["char2"])
+        db.session.expire_all()
+        with _QueryCounter(db.engine) as small:
+            lineup_service.get_lineup_grouped(event.id)
+
+        for i in range(10):
+            u, c = _add_player(db, seed["guild"], f"extra{i}")
+            _signup(seed, u, c, force_bench=True)
+        db.session.expire_all()
+        with _QueryCounter(db.engine) as large:
+            grouped = lineup_service.get_lineup_grouped(event.id)
+
+        assert len(grouped["bench_queue"]) == 10
+        assert large.count == small.count
@@ -0,0 +1,180 @@
+"""Tests for relaying Socket.IO emits between worker processes."""
+
+from __future__ import annotations
+
+import json
+import os
+import socket
+import subprocess
+import sys
+import threading
+from datetime import datetime, timezone
+from unittest.mock import MagicMock
+
+import pytest
+import sqlalchemy as sa
+
+from app.extensions import db as _db
+from app.utils.socketio_queue import DatabaseQueueManager, socketio_queue_options
+
+WORKER = os.path.join(os.path.dirname(__file__), "realtime_worker.py")
+
+
+def _manager(url, **kw):
+    manager = DatabaseQueueManager(url, channel="test", **kw)
+    manager.set_server(MagicMock())
+    return manager
+
+
+def _insert(manager, row_id, event):
+    """Commit a message row with an explicit ID."""
+    with manager.engine.begin() as conn:
+        conn.execute(manager.table.insert().values(
+            id=row_id, channel="test", created_at=datetime.now(timezone.utc),
+            payload=json.dumps({"method": "emit", "event": event}),
+        ))
+
+
+class TestDatabaseQueue:
+    @pytest.fixture
+    def url(self, tmp_path):
+        url = f"sqlite:///{tmp_path / 'queue.db'}"
+        _db.metadata.create_all(sa.create_engine(url))
+        return url
+
+    def test_messages_reach_other_managers(self, url):
+        sender, receiver, other = _manager(url), _manager(url), _manager(url)
+        other.channel = "elsewhere"
+        receiver.initialize()
+        other.initialize()
+
+        sender.emit("guilds_changed", {}, room="guild_1")
+        messages = receiver.poll()
+        assert [(m["method"], m["event"], m["room"]) for m in messages] == [
+            ("emit", "guilds_changed", "guild_1"),
+        ]
+        assert messages[0]["host_id"] == sender.host_id
+        assert receiver.poll() == []
+        assert other.poll() == []
+
+    def test_listener_starts_at_the_tail(self, url):
+        sender, receiver = _manager(url), _manager(url)
+        sender.emit("old", {})
+        receiver.initialize()
+        sender.emit("new", {})
+        assert [m["event"] for m in receiver.poll()] == ["new"]
+
+    def test_late_commits_below_the_last_id_are_delivered_once(self, url):
+        receiver = _manager(url)
+        receiver.initialize()
+        # Row 2 commits before row 1, as concurrent PostgreSQL inserts can
+        _insert(receiver, 2, "second")
+        assert [m["event"] for m in receiver.poll()] == ["second"]
+        _insert(receiver, 1, "first")
+        assert [m["event"] for m in receiver.poll()] == ["first"]
+        assert receiver.poll() == []
+
+    def test_gaps_are_given_up_after_the_grace(self, url):
+        receiver = _manager(url, reorder_grace=0)
+        receiver.initialize()
+        _insert(receiver, 5, "fifth")
+        assert len(receiver.poll()) == 1
+        receiver.poll()
+        assert receiver._gaps == {}
+
+    def test_old_messages_are_pruned(self, url):
+        sender = _manager(url, retention=0)
+        sender.emit("first", {})
+        sender.emit("second", {})
+        with sender.engine.connect() as conn:
+            count = conn.execute(sa.select(sa.func.count()).select_from(sender.table)).scalar()
+        assert count == 1
+
+
+class TestQueueOptions:
+    def test_options(self):
+        config = {"SQLALCHEMY_DATABASE_URI": "sqlite://", "SOCKETIO_CHANNEL": "cal"}
+        fake = type("App", (), {"config": config})
+        assert socketio_queue_options(fake) == {}
+        config["SOCKETIO_MESSAGE_QUEUE"] = "redis://redis:6379/0"
+        assert socketio_queue_options(fake) == {"message_queue": "redis://redis:6379/0", "channel": "cal"}
+        config["SOCKETIO_MESSAGE_QUEUE"] = "database"
+        manager = socketio_queue_options(fake)["client_manager"]
+        assert isinstance(manager, DatabaseQueueManager)
+        assert manager.channel == "cal"
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@pytest.fixture
+def workers(tmp_path):
+    """Start two app workers sharing one SQLite database; yield their base URLs."""
+    url = f"sqlite:///{tmp_path / 'app.db'}"
+    procs, bases = [], []
+    try:
+        for init in (True, False):
+            port = _free_port()
+            proc = subprocess.Popen(
+                [sys.executable, WORKER, url, str(port)] + (["--init"] if init else []),
+                stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True,
+            )
+            procs.append(proc)
+            line = proc.stdout.readline()
+            assert line.strip() == "READY", proc.stderr.read() if proc.poll() is not None else line
+            bases.append(f"http://127.0.0.1:{port}")
+        yield bases
+    finally:
+        for proc in procs:
+            proc.kill()
+            proc.communicate()
+
+
+class TestTwoWorkers:
+    def test_emit_on_one_worker_reaches_client_on_another(self, workers):
+        requests = pytest.importorskip("requests")
+        socketio_client = pytest.importorskip("socketio")
+        first, second = workers
+        headers = {"User-Agent": "multiworker-test"}
+
+        http = requests.Session()
+        http.headers.update(headers)
+        login = http.post(f"{first}/api/v1/auth/login", json={"email": "admin@test.com", "password": "password123"})
+        assert login.status_code == 200
+
+        received: list[tuple[str, dict]] = []
+        arrived = threading.Condition()
+        client = socketio_client.Client()
+
+        def _record(name):
+            def handler(data):
+                with arrived:
+                    received.append((name, data))
+                    arrived.notify_all()
+            return handler
+
+        def _wait_for(name):
+            with arrived:
+                assert arrived.wait_for(lambda: any(n == name for n, _ in received), timeout=10), received
+
+        for name in ("guilds_changed", "guild_changed"):
+            client.on(name, _record(name))
+        cookie = "; ".join(f"{k}={v}" for k, v in http.cookies.items())
+        # The client is connected to the second worker only
+        client.connect(second, headers={**headers, "Cookie": cookie}, transports=["polling"])
+        try:
+            created = http.post(f"{first}/api/v1/guilds", json={"name": "Relay", "realm_name": "Icecrown"})
+            assert created.status_code == 201
+            _wait_for("guilds_changed")
+
+            guild_id = created.json()["id"]
+            client.call("join_guild", {"guild_id": guild_id}, timeout=10)
+            assert http.put(f"{first}/api/v1/guilds/{guild_id}", json={"faction": "Horde"}).status_code == 200
+            _wait_for("guild_changed")
+        finally:
+            client.disconnect()
+
+        assert ("guild_changed", {"guild_id": guild_id}) in received
@@ -0,0 +1,155 @@
+"""Tests for bulk notification fan-out (one insert, one commit, one push)."""
+
+from __future__ import annotations
+
+from unittest.mock import patch
+
+import sqlalchemy as sa
+from sqlalchemy import event as sa_event
+
+from app.models.guild import GuildMembership
+from app.models.notification import Notification
+from app.services import notification_service, signup_service
+from app.utils import notify
+
+
+def _signup_all(seed):
+    event = seed["event"]
+    for user, char, bench in (
+        (seed["user1"], seed["char1"], False),
+        (seed["user2"], seed["char2"], False),
+        (seed["user3"], seed["char3"], True),
+    ):
+        signup_service.create_signup(
+            raid_event_id=event.id, user_id=user.id, character_id=char.id,
+            chosen_role="range_dps", chosen_spec=None, note=None,
+            raid_size=event.raid_size, force_bench=bench, event=event,
+        )
+
+
+class _CommitCounter:
+    def __init__(self, session):
+        self.session = session
+        self.count = 0
+
+    def _on_commit(self, session):
+        self.count += 1
+
+    def __enter__(self):
+        sa_event.listen(self.session, "after_commit", self._on_commit)
+        return self
+
+    def __exit__(self, *exc):
+        sa_event.remove(self.session, "after_commit", self._on_commit)
+
+
+def _notifications(db, notification_type):
+    return db.session.execute(
+        sa.select(Notification).where(Notification.type == notification_type)
+    ).scalars().all()
+
+
+class TestBulkCreate:
+    def test_create_notifications_dedupes_and_commits_once(self, db, seed):
+        ids = [seed["user1"].id, seed["user2"].id, seed["user1"].id]
+        with _CommitCounter(db.session) as commits:
+            recipients = notification_service.create_notifications(
+                ids, "admin_message", "Hello", body="Body",
+                guild_id=seed["guild"].id, title_params={"guildName": "Test Guild"},
+            )
+        assert recipients == [seed["user1"].id, seed["user2"].id]
+        assert commits.count == 1
+        rows = _notifications(db, "admin_message")
+        assert sorted(r.user_id for r in rows) == sorted(recipients)
+        assert rows[0].to_dict()["title_params"] == {"guildName": "Test Guild"}
+        assert rows[0].created_at is not None
+
+    def test_empty_recipients(self, db, seed):
+        assert notification_service.create_notifications([], "admin_message", "x") == []
+
+
+class TestFanOut:
+    def test_event_locked_single_commit_and_push(self, db, seed):
+        _signup_all(seed)
+        with _CommitCounter(db.session) as commits, \
+                patch("app.utils.realtime.socketio.emit") as emit:
+            notify.notify_event_locked(seed["event"])
+
+        assert commits.count == 1
+        emit.assert_called_once()
+        rooms = emit.call_args.kwargs["to"]
+        assert sorted(rooms) == sorted(
+            f"user_{seed[u].id}" for u in ("user1", "user2", "user3")
+        )
+        assert len(_notifications(db, "event_locked")) == 3
+
+    def test_officer_fanout(self, db, seed):
+        from app.seeds.permissions import seed_permissions
+
+        seed_permissions()
+        for key, role in (("user1", "officer"), ("user2", "raid_leader"), ("user3", "member")):
+            db.session.add(GuildMembership(
+                guild_id=seed["guild"].id, user_id=seed[key].id, role=role, status="active",
+            ))
+        db.session.commit()
+
+        with patch("app.utils.realtime.socketio.emit") as emit:
+            notify.notify_officers_lineup_changed(seed["event"], seed["user1"].id)
+
+        rows = _notifications(db, "officer_lineup_changed")
+        assert [r.user_id for r in rows] == [seed["user2"].id]
+        emit.assert_called_once()
+
+    def test_no_recipients_no_push(self, db, seed):
+        with patch("app.utils.realtime.socketio.emit") as emit:
+            notify.notify_event_cancelled(seed["event"])
+        emit.assert_not_called()
+        assert _notifications(db, "event_cancelled") == []
+
+
+class TestAsyncDispatch:
+    def test_fanout_is_queued_as_one_job(self, app, db, seed, monkeypatch):
+        from app.models.notification import JobQueue
+
+        monkeypatch.setitem(app.config, "NOTIFICATIONS_ASYNC", True)
+        _signup_all(seed)
+        with patch("app.utils.realtime.socketio.emit") as emit:
+            notify.notify_event_cancelled(seed["event"])
+        emit.assert_not_called()
+        assert _notifications(db, "event_cancelled") == []
+
+        [job] = db.session.execute(sa.select(JobQueue)).scalars().all()
+        assert job.type == "send_notification"
+        assert sorted(job.payload["user_ids"]) == sorted(
+            seed[u].id for u in ("user1", "user2", "user3")
+        )
+
+    def test_worker_drains_batched_job(self, app, db, seed, monkeypatch):
+        from app.jobs.handlers import process_job_queue
+        from app.models.notification import JobQueue
+
+        monkeypatch.setitem(app.config, "NOTIFICATIONS_ASYNC", True)
+        _signup_all(seed)
+        notify.notify_event_locked(seed["event"])
+
+        with patch("app.utils.realtime.socketio.emit") as emit:
+            process_job_queue(app)
+        emit.assert_called_once()
+
+        db.session.expire_all()
+        rows = _notifications(db, "event_locked")
+        assert len(rows) == 3
+        assert rows[0].title_key == "notify.eventLocked.title"
+        assert rows[0].to_dict()["body_params"] == {"eventTitle": seed["event"].title}
+        [job] = db.session.execute(sa.select(JobQueue)).scalars().all()
+        assert job.status == "done"
+
+    def test_single_recipient_payload_still_supported(self, db, seed):
+        from app.jobs.handlers import handle_send_notification
+
+        with patch("app.utils.realtime.socketio.emit"):
+            handle_send_notification({
+                "user_id": seed["user1"].id, "type": "admin_message", "title": "Hi",
+            })
+        [row] = _notifications(db, "admin_message")
+        assert row.user_id == seed["user1"].id
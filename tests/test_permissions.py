@@ -38,6 +38,8 @@ def db(app):
         _db.create_all()
         from app.utils.rate_limit import reset as _reset_rate_limit
         _reset_rate_limit()
+        from app.utils.permissions import reset_permission_cache
+        reset_permission_cache()
         yield _db
         _db.session.rollback()
         _db.drop_all()
@@ -1630,3 +1632,123 @@ class TestOwnershipTransfer:
                 json={"user_id": seeded["outsider"].id},
             )
             assert resp.status_code == 404
+
+
+# ===========================================================================
+# Test: permission snapshot cache
+# ===========================================================================
+
+class TestPermissionCache:
+    """Permission checks are served from the cached role snapshot."""
+
+    @staticmethod
+    def _count_queries(fn):
+        from sqlalchemy import event as sa_event
+
+        calls = []
+
+        def _on_execute(*args, **kwargs):
+            calls.append(1)
+
+        sa_event.listen(_db.engine, "before_cursor_execute", _on_execute)
+        try:
+            fn()
+        finally:
+            sa_event.remove(_db.engine, "before_cursor_execute", _on_execute)
+        return len(calls)
+
+    def test_warm_checks_issue_no_queries(self, seeded, app):
+        with app.test_request_context():
+            from flask_login import login_user
+            login_user(seeded["officer_user"])
+            gm = seeded["gm_of"]
+            assert has_permission(gm, "create_events") is True
+
+            def _checks():
+                for _ in range(20):
+                    has_permission(gm, "create_events")
+                    has_permission(gm, "manage_roles")
+                get_user_permissions(gm)
+                can_grant_role(gm, "member")
+
+            assert self._count_queries(_checks) == 0
+
+    def test_orm_edit_invalidates(self, seeded, app):
+        with app.test_request_context():
+            from flask_login import login_user
+            login_user(seeded["member_user"])
+            gm = seeded["gm_mb"]
+            assert has_permission(gm, "create_events") is False
+
+            role = _db.session.execute(
+                _db.select(SystemRole).where(SystemRole.name == "member")
+            ).scalar_one()
+            perm = _db.session.execute(
+                _db.select(Permission).where(Permission.code == "create_events")
+            ).scalar_one()
+            _db.session.add(RolePermission(role_id=role.id, permission_id=perm.id))
+            _db.session.commit()
+
+            assert has_permission(gm, "create_events") is True
+
+    def test_bulk_edit_requires_version_bump(self, seeded, app):
+        from app.utils.permissions import invalidate_permission_cache
+
+        with app.test_request_context():
+            from flask_login import login_user
+            login_user(seeded["officer_user"])
+            gm = seeded["gm_of"]
+            assert has_permission(gm, "create_events") is True
+
+            role = _db.session.execute(
+                _db.select(SystemRole).where(SystemRole.name == "officer")
+            ).scalar_one()
+            _db.session.execute(
+                _db.delete(RolePermission).where(RolePermission.role_id == role.id)
+            )
+            _db.session.commit()
+
+            invalidate_permission_cache()
+            assert has_permission(gm, "create_events") is False
+            assert get_user_permissions(gm) == []
+
+    def test_edit_on_another_process_applies_from_next_request(self, seeded, app):
+        from app.services import change_counter_service
+
+        gm = seeded["gm_mb"]
+        with app.test_request_context():
+            assert has_permission(gm, "create_events") is False
+
+        # Another worker grants the permission: its process-local version
+        # bump never reaches this process, only the shared counter does
+        role_id = _db.session.execute(
+            _db.select(SystemRole.id).where(SystemRole.name == "member")
+        ).scalar_one()
+        perm_id = _db.session.execute(
+            _db.select(Permission.id).where(Permission.code == "create_events")
+        ).scalar_one()
+        with _db.engine.begin() as conn:
+            conn.execute(RolePermission.__table__.insert().values(role_id=role_id, permission_id=perm_id))
+            change_counter_service._bump(conn, {change_counter_service.PERMISSIONS_KEY})
+
+        with app.test_request_context():
+            assert has_permission(gm, "create_events") is True
+
+    def test_grant_rule_edit_invalidates(self, seeded, app):
+        with app.test_request_context():
+            from flask_login import login_user
+            login_user(seeded["officer_user"])
+            gm = seeded["gm_of"]
+            assert can_grant_role(gm, "raid_leader") is True
+
+            officer = _db.session.execute(
+                _db.select(SystemRole).where(SystemRole.name == "officer")
+            ).scalar_one()
+            rules = _db.session.execute(
+                _db.select(RoleGrantRule).where(RoleGrantRule.granter_role_id == officer.id)
+            ).scalars().all()
+            for r in rules:
+                _db.session.delete(r)
+            _db.session.commit()
+
+            assert can_grant_role(gm, "raid_leader") is False
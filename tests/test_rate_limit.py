@@ -0,0 +1,132 @@
+"""Tests for the GCRA rate limiter and its stores."""
+
+from __future__ import annotations
+
+from unittest.mock import patch
+
+import pytest
+import sqlalchemy as sa
+
+from app.extensions import db as _db
+from app.utils import rate_limit
+from app.utils.rate_limit import DatabaseStore, MemoryStore, RateLimiter, SQLiteStore
+
+
+@pytest.fixture(params=["memory", "sqlite", "database"])
+def limiter(request, tmp_path, clock):
+    if request.param == "memory":
+        store = MemoryStore(clock=clock)
+    elif request.param == "sqlite":
+        store = SQLiteStore(str(tmp_path / "limits.db"))
+    else:
+        engine = sa.create_engine(f"sqlite:///{tmp_path / 'app.db'}")
+        _db.metadata.create_all(engine)
+        store = DatabaseStore(engine)
+    return RateLimiter(store)
+
+
+class _Clock:
+    """Stands in for the limiter's clocks."""
+
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    fake = _Clock()
+    # Shared stores read the wall clock
+    with patch.object(rate_limit.time, "time", fake):
+        yield fake
+
+
+class TestGcra:
+    def test_burst_then_steady_rate(self, limiter, clock):
+        # 5 per 10s: a burst of 5, then one every 2 seconds
+        assert [limiter.hit("k", 5, 10) for _ in range(5)] == [0.0] * 5
+        retry_after = limiter.hit("k", 5, 10)
+        assert retry_after == pytest.approx(2.0, abs=0.01)
+        clock.now += 2
+        assert limiter.hit("k", 5, 10) == 0.0
+        assert limiter.hit("k", 5, 10) > 0
+
+    def test_keys_are_independent(self, limiter, clock):
+        assert limiter.hit("a", 1, 60) == 0.0
+        assert limiter.hit("a", 1, 60) > 0
+        assert limiter.hit("b", 1, 60) == 0.0
+
+    def test_denied_requests_are_not_counted(self, limiter, clock):
+        limiter.hit("k", 1, 10)
+        for _ in range(20):
+            limiter.hit("k", 1, 10)
+        clock.now += 10
+        assert limiter.hit("k", 1, 10) == 0.0
+
+    def test_clear(self, limiter, clock):
+        limiter.hit("k", 1, 60)
+        limiter.clear()
+        assert len(limiter.store) == 0
+        assert limiter.hit("k", 1, 60) == 0.0
+
+
+class TestMemoryStore:
+    def test_keys_are_lru_bounded(self, clock):
+        store = MemoryStore(max_keys=3, clock=clock)
+        for key in ("a", "b", "c"):
+            store.hit(key, 60, 60)
+        store.hit("a", 60, 60)  # denied, but "a" stays; "b" is least recent
+        store.hit("d", 60, 60)
+        assert len(store) == 3
+        assert set(store._tats) == {"a", "c", "d"}
+
+
+class TestSharedStores:
+    def test_sqlite_file_is_shared(self, tmp_path, clock):
+        path = str(tmp_path / "limits.db")
+        first, second = SQLiteStore(path), SQLiteStore(path)
+        assert first.hit("k", 60, 60) == 0.0
+        assert second.hit("k", 60, 60) > 0
+
+    def test_expired_keys_are_pruned(self, tmp_path, clock):
+        engine = sa.create_engine(f"sqlite:///{tmp_path / 'app.db'}")
+        _db.metadata.create_all(engine)
+        store = DatabaseStore(engine)
+        store.hit("old", 1, 1)
+        clock.now += 120
+        store.hit("new", 1, 1)
+        assert len(store) == 1
+
+
+class TestDecorator:
+    def test_limits_are_per_route(self, app, db):
+        client = app.test_client()
+        for _ in range(10):
+            client.post("/api/v1/auth/login", json={"email": "x@test.com", "password": "wrong"})
+        assert client.post("/api/v1/auth/login", json={"email": "x@test.com"}).status_code == 429
+        # Register has its own budget for the same IP
+        resp = client.post("/api/v1/auth/register", json={})
+        assert resp.status_code == 400
+
+    def test_login_is_limited_per_account_across_ips(self, app, db):
+        client = app.test_client()
+        for i in range(10):
+            resp = client.post(
+                "/api/v1/auth/login", json={"email": "Victim@test.com", "password": "wrong"},
+                headers={"X-Forwarded-For": f"10.0.0.{i}"},
+            )
+            assert resp.status_code == 401
+        resp = client.post(
+            "/api/v1/auth/login", json={"email": "victim@test.com", "password": "wrong"},
+            headers={"X-Forwarded-For": "10.0.1.1"},
+        )
+        assert resp.status_code == 429
+        assert int(resp.headers["Retry-After"]) >= 1
+        # Other accounts from a fresh IP are unaffected
+        resp = client.post(
+            "/api/v1/auth/login", json={"email": "other@test.com", "password": "wrong"},
+            headers={"X-Forwarded-For": "10.0.1.2"},
+        )
+        assert resp.status_code == 401
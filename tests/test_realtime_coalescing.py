@@ -0,0 +1,105 @@
+"""Tests for per-request coalescing of realtime emits."""
+
+from __future__ import annotations
+
+from unittest.mock import patch
+
+import pytest
+
+from app.models.guild import GuildMembership
+from app.services import signup_service
+from app.utils import notify, realtime
+
+
+def _names(emit):
+    return [c.args[0] for c in emit.call_args_list]
+
+
+def _signup(seed, user, char, **kw):
+    with patch("app.utils.realtime.socketio.emit"):
+        return signup_service.create_signup(
+            seed["event"].id, seed[user].id, seed[char].id, "range_dps", None, None, 2, **kw,
+        )
+
+
+class TestCoalescingScope:
+    def test_deltas_are_merged_per_room(self, db, seed):
+        first = _signup(seed, "user1", "char1")
+        second = _signup(seed, "user2", "char2")
+        event_id = seed["event"].id
+
+        with patch("app.utils.realtime.socketio.emit") as emit:
+            with realtime.coalescing():
+                realtime.emit_signups_changed(event_id, signups=[first])
+                realtime.emit_signups_changed(event_id, signups=[second])
+                realtime.emit_signups_changed(event_id, removed_ids=[first.id])
+                realtime.emit_events_changed(seed["guild"].id)
+                realtime.emit_events_changed(seed["guild"].id)
+                assert emit.call_count == 0
+
+        assert sorted(_names(emit)) == ["events_changed", "signups_changed"]
+        payload = next(c.args[1] for c in emit.call_args_list if c.args[0] == "signups_changed")
+        assert [s["id"] for s in payload["signups"]] == [second.id]
+        assert payload["removed_ids"] == [first.id]
+
+    def test_bare_emit_wins(self, db, seed):
+        first = _signup(seed, "user1", "char1")
+        with patch("app.utils.realtime.socketio.emit") as emit:
+            with realtime.coalescing():
+                realtime.emit_lineup_changed(seed["event"].id, signups=[first])
+                realtime.emit_lineup_changed(seed["event"].id)
+
+        emit.assert_called_once()
+        assert "signups" not in emit.call_args.args[1]
+        assert emit.call_args.args[1]["order"]["range_dps"] == [first.id]
+
+    def test_notification_pushes_fold_into_one_emit(self, db, seed):
+        with patch("app.utils.realtime.socketio.emit") as emit:
+            with realtime.coalescing():
+                for key in ("user1", "user2", "user1"):
+                    notify._push_to_user(seed[key].id)
+
+        emit.assert_called_once()
+        assert emit.call_args.kwargs["to"] == [f"user_{seed['user1'].id}", f"user_{seed['user2'].id}"]
+
+    def test_failed_block_sends_nothing(self, db, seed):
+        with patch("app.utils.realtime.socketio.emit") as emit:
+            with pytest.raises(RuntimeError):
+                with realtime.coalescing():
+                    realtime.emit_guilds_changed()
+                    raise RuntimeError("boom")
+        emit.assert_not_called()
+
+
+class TestRequestCoalescing:
+    def test_delete_with_promotion_emits_once_per_room(self, app, db, seed):
+        from flask import session as flask_session
+        from flask_login import login_user
+
+        db.session.add(GuildMembership(
+            guild_id=seed["guild"].id, user_id=seed["user1"].id, role="member", status="active",
+        ))
+        db.session.commit()
+        first = _signup(seed, "user1", "char1")
+        _signup(seed, "user2", "char2")
+        benched = _signup(seed, "user3", "char3", force_bench=True)
+        first_id = first.id
+
+        client = app.test_client()
+        with app.test_request_context():
+            login_user(seed["user1"])
+            sess_data = dict(flask_session)
+        with client.session_transaction() as s:
+            s.update(sess_data)
+
+        url = f"/api/v1/guilds/{seed['guild'].id}/events/{seed['event'].id}/signups/{first_id}"
+        with patch("app.utils.realtime.socketio.emit") as emit:
+            assert client.delete(url).status_code == 200
+
+        names = _names(emit)
+        # The promotion and the delete each emitted; one of each goes out
+        assert names.count("signups_changed") == 1
+        assert names.count("lineup_changed") == 1
+        payload = next(c.args[1] for c in emit.call_args_list if c.args[0] == "signups_changed")
+        assert [s["id"] for s in payload["signups"]] == [benched.id]
+        assert payload["removed_ids"] == [first_id]
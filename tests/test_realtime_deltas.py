@@ -0,0 +1,80 @@
+"""Tests for the delta payloads carried by realtime lineup/signup events."""
+
+from __future__ import annotations
+
+from unittest.mock import patch
+
+from app.services import lineup_service, signup_service
+from app.utils import realtime
+
+
+def _payloads(emit, name):
+    return [c.args[1] for c in emit.call_args_list if c.args[0] == name]
+
+
+class TestLineupOrder:
+    def test_order_version_matches_grouped_version(self, db, seed):
+        ev = seed["event"]
+        with patch("app.utils.realtime.socketio.emit"):
+            for user, char in (("user1", "char1"), ("user2", "char2"), ("user3", "char3")):
+                signup_service.create_signup(ev.id, seed[user].id, seed[char].id, "range_dps", None, None, 2)
+
+        order = lineup_service.get_lineup_order(ev.id)
+        grouped = lineup_service.get_lineup_grouped(ev.id)
+        assert order["range_dps"] == [s["id"] for s in grouped["range_dps"]]
+        assert order["bench_queue"] == [s["id"] for s in grouped["bench_queue"]]
+        assert lineup_service.lineup_version(order) == grouped["version"]
+
+
+class TestDeltaPayloads:
+    def test_emits_carry_changed_records(self, db, seed):
+        ev = seed["event"]
+        with patch("app.utils.realtime.socketio.emit"):
+            signup = signup_service.create_signup(
+                ev.id, seed["user1"].id, seed["char1"].id, "range_dps", None, "gs 5.6k", 2,
+            )
+
+        with patch("app.utils.realtime.socketio.emit") as emit:
+            realtime.emit_signups_changed(ev.id, signups=[signup])
+            realtime.emit_lineup_changed(ev.id, signups=[signup])
+
+        signups_payload, = _payloads(emit, "signups_changed")
+        assert [s["id"] for s in signups_payload["signups"]] == [signup.id]
+        assert signups_payload["signups"][0]["note"] == "gs 5.6k"
+        assert signups_payload["statuses"][signup.id]["lineup_status"] == "going"
+        assert signups_payload["removed_ids"] == []
+
+        lineup_payload, = _payloads(emit, "lineup_changed")
+        assert lineup_payload["order"]["range_dps"] == [signup.id]
+        assert lineup_payload["version"] == lineup_service.get_lineup_grouped(ev.id)["version"]
+        assert "equipment" not in lineup_payload["signups"][0]["character"].get("metadata", {})
+
+    def test_promotion_after_delete(self, db, seed):
+        ev = seed["event"]
+        with patch("app.utils.realtime.socketio.emit"):
+            first = signup_service.create_signup(ev.id, seed["user1"].id, seed["char1"].id, "range_dps", None, None, 2)
+            signup_service.create_signup(ev.id, seed["user2"].id, seed["char2"].id, "range_dps", None, None, 2)
+            benched = signup_service.create_signup(
+                ev.id, seed["user3"].id, seed["char3"].id, "range_dps", None, None, 2, force_bench=True,
+            )
+
+        with patch("app.utils.realtime.socketio.emit") as emit:
+            signup_service.delete_signup(first)
+
+        promoted, = _payloads(emit, "signups_changed")
+        assert [s["id"] for s in promoted["signups"]] == [benched.id]
+        assert promoted["signups"][0]["lineup_status"] == "going"
+        assert promoted["statuses"][benched.id]["lineup_status"] == "going"
+        lineup_payload, = _payloads(emit, "lineup_changed")
+        assert benched.id in lineup_payload["order"]["range_dps"]
+        assert lineup_payload["order"]["bench_queue"] == []
+
+    def test_bare_emit_has_no_records(self, db, seed):
+        with patch("app.utils.realtime.socketio.emit") as emit:
+            realtime.emit_signups_changed(seed["event"].id)
+            realtime.emit_lineup_changed(seed["event"].id)
+
+        assert _payloads(emit, "signups_changed") == [{"event_id": seed["event"].id}]
+        lineup_payload, = _payloads(emit, "lineup_changed")
+        assert "signups" not in lineup_payload
+        assert set(lineup_payload) == {"event_id", "version", "order"}
@@ -0,0 +1,101 @@
+"""Tests for request-scoped memoization of memberships and guild IDs."""
+
+from __future__ import annotations
+
+from sqlalchemy import event as sa_event
+
+from app.models.guild import GuildMembership
+from app.services import guild_service
+from app.utils import request_cache
+from app.utils.permissions import get_membership, get_role_display_names
+
+
+class _QueryCounter:
+    def __init__(self, engine):
+        self.engine = engine
+        self.count = 0
+
+    def _on_execute(self, *args, **kwargs):
+        self.count += 1
+
+    def __enter__(self):
+        sa_event.listen(self.engine, "before_cursor_execute", self._on_execute)
+        return self
+
+    def __exit__(self, *exc):
+        sa_event.remove(self.engine, "before_cursor_execute", self._on_execute)
+
+
+def _join(db, guild, user, role="member"):
+    m = GuildMembership(guild_id=guild.id, user_id=user.id, role=role, status="active")
+    db.session.add(m)
+    db.session.commit()
+    return m
+
+
+class TestRequestCache:
+    def test_no_caching_outside_request(self, seed):
+        calls = []
+        request_cache.cached("ns", 1, lambda: calls.append(1))
+        request_cache.cached("ns", 1, lambda: calls.append(1))
+        assert len(calls) == 2
+
+    def test_cached_within_request_only(self, app, seed):
+        calls = []
+        with app.test_request_context():
+            request_cache.cached("ns", 1, lambda: calls.append(1))
+            request_cache.cached("ns", 1, lambda: calls.append(1))
+        with app.test_request_context():
+            request_cache.cached("ns", 1, lambda: calls.append(1))
+        assert len(calls) == 2
+
+    def test_cached_many_loads_only_missing(self, app, seed):
+        seen = []
+
+        def _loader(keys):
+            seen.append(sorted(keys))
+            return {k: k * 10 for k in keys if k != 3}
+
+        with app.test_request_context():
+            assert request_cache.cached_many("ns", [1, 2], _loader) == {1: 10, 2: 20}
+            assert request_cache.cached_many("ns", [2, 3], _loader) == {2: 20, 3: None}
+        assert seen == [[1, 2], [3]]
+
+
+class TestMembershipMemoization:
+    def test_repeated_lookups_hit_memory(self, app, db, seed):
+        guild, user = seed["guild"], seed["user1"]
+        _join(db, guild, user)
+        with app.test_request_context():
+            first = get_membership(guild.id, user.id)
+            guild_ids = guild_service.get_user_guild_ids(user.id)
+            with _QueryCounter(db.engine) as qc:
+                for _ in range(5):
+                    assert get_membership(guild.id, user.id) is first
+                    assert guild_service.get_user_guild_ids(user.id) == guild_ids
+            assert qc.count == 0
+
+    def test_membership_write_invalidates(self, app, db, seed):
+        guild, user = seed["guild"], seed["user1"]
+        with app.test_request_context():
+            assert get_membership(guild.id, user.id) is None
+            assert guild_service.get_user_guild_ids(user.id) == []
+            _join(db, guild, user)
+            assert get_membership(guild.id, user.id) is not None
+            assert guild_service.get_user_guild_ids(user.id) == [guild.id]
+
+    def test_unflushed_status_change_not_served_from_cache(self, app, db, seed):
+        guild, user = seed["guild"], seed["user1"]
+        m = _join(db, guild, user)
+        with app.test_request_context():
+            assert get_membership(guild.id, user.id) is m
+            m.status = "removed"
+            assert get_membership(guild.id, user.id) is None
+
+    def test_role_display_names(self, app, db, seed):
+        with app.test_request_context():
+            names = get_role_display_names(["raid_leader"])
+            with _QueryCounter(db.engine) as qc:
+                assert get_role_display_names(["raid_leader"]) == names
+            assert qc.count == 0
+        assert names == {"raid_leader": "Raid Leader"}
@@ -0,0 +1,83 @@
+"""Tests for the scheduler leader lease."""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+
+import click
+
+from app.jobs import leader
+from app.jobs.leader import LeaderElector, SCHEDULER_LEASE
+from app.models.scheduler_lease import SchedulerLease
+
+
+def _expire(db):
+    lease = db.session.get(SchedulerLease, SCHEDULER_LEASE)
+    lease.expires_at = datetime.now(timezone.utc) - timedelta(seconds=1)
+    db.session.commit()
+
+
+class TestLease:
+    def test_one_holder_at_a_time(self, db, ctx):
+        assert leader.try_acquire(SCHEDULER_LEASE, "a", 15)
+        assert not leader.try_acquire(SCHEDULER_LEASE, "b", 15)
+        # The holder renews
+        assert leader.try_acquire(SCHEDULER_LEASE, "a", 15)
+        assert leader.current_holder(SCHEDULER_LEASE) == "a"
+
+    def test_expired_lease_is_taken_over(self, db, ctx):
+        leader.try_acquire(SCHEDULER_LEASE, "a", 15)
+        _expire(db)
+        assert leader.current_holder(SCHEDULER_LEASE) is None
+        assert leader.try_acquire(SCHEDULER_LEASE, "b", 15)
+        assert not leader.try_acquire(SCHEDULER_LEASE, "a", 15)
+
+    def test_release(self, db, ctx):
+        leader.try_acquire(SCHEDULER_LEASE, "a", 15)
+        leader.release(SCHEDULER_LEASE, "b")
+        assert leader.current_holder(SCHEDULER_LEASE) == "a"
+        leader.release(SCHEDULER_LEASE, "a")
+        assert leader.try_acquire(SCHEDULER_LEASE, "b", 15)
+
+
+class TestElector:
+    def _elector(self, app, events, name):
+        return LeaderElector(
+            app, ttl=15, heartbeat=5,
+            on_elected=lambda: events.append((name, "elected")),
+            on_demoted=lambda: events.append((name, "demoted")),
+        )
+
+    def test_failover(self, app, db):
+        events = []
+        first, second = self._elector(app, events, "first"), self._elector(app, events, "second")
+        assert first.step()
+        assert not second.step()
+        assert first.step()
+        assert events == [("first", "elected")]
+
+        # The first process stalls past its lease; the second takes over
+        with app.app_context():
+            _expire(db)
+        assert second.step()
+        assert not first.step()
+        assert events[1:] == [("second", "elected"), ("first", "demoted")]
+
+    def test_stop_hands_over_immediately(self, app, db):
+        events = []
+        first, second = self._elector(app, events, "first"), self._elector(app, events, "second")
+        first.step()
+        first.stop()
+        assert second.step()
+        assert events == [("first", "elected"), ("first", "demoted"), ("second", "elected")]
+
+
+class TestCliDetection:
+    def test_cli_commands_do_not_start_the_scheduler(self):
+        from app import _running_cli_command
+
+        assert not _running_cli_command()
+        with click.Context(click.Command("seed"), info_name="seed"):
+            assert _running_cli_command()
+        with click.Context(click.Command("run"), info_name="run"):
+            assert not _running_cli_command()
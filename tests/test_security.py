@@ -57,6 +57,8 @@ def db(app):
         # Reset rate limiter state between tests
         from app.utils.rate_limit import reset as _reset_rate_limit
         _reset_rate_limit()
+        from app.utils.permissions import reset_permission_cache
+        reset_permission_cache()
         yield _db
         _db.session.rollback()
         _db.drop_all()
@@ -282,10 +284,10 @@ class TestRateLimiting:
 
     def test_rate_limit_resets(self, ctx):
         """Rate limit state can be cleared."""
-        from app.utils.rate_limit import reset, _hits
-        _hits["test_ip"] = [1.0, 2.0, 3.0]
+        from app.utils.rate_limit import get_limiter, reset
+        get_limiter().hit("test_ip", 10, 60)
         reset()
-        assert len(_hits) == 0
+        assert len(get_limiter().store) == 0
 
 
 # ---------------------------------------------------------------------------
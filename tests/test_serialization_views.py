@@ -0,0 +1,114 @@
+"""Tests for the summary / lineup / full serialization views."""
+
+from __future__ import annotations
+
+import pytest
+
+from app.models.guild import GuildMembership
+from app.services import signup_service
+from app.utils.serialization import pick_fields
+
+_GEAR = {
+    "level": "80", "race": "Orc", "professions": [{"name": "Alchemy", "skill": "450"}],
+    "talents": [{"tree": "Marksmanship", "points": "7/57/7"}],
+    "equipment": [{"slot": i, "item": "40505", "name": "Valorous Cryptstalker Headpiece"} for i in range(18)],
+}
+
+
+@pytest.fixture
+def raid(app, db, seed):
+    """Two geared signups and a logged-in guild member client."""
+    for key in ("char1", "char2"):
+        seed[key].char_metadata = _GEAR
+    db.session.add(GuildMembership(
+        guild_id=seed["guild"].id, user_id=seed["user1"].id, role="member", status="active",
+    ))
+    db.session.commit()
+    for user, char in (("user1", "char1"), ("user2", "char2")):
+        signup_service.create_signup(
+            seed["event"].id, seed[user].id, seed[char].id, "range_dps", None, "gs 5.6k", 2,
+        )
+
+    from flask import session as flask_session
+    from flask_login import login_user
+
+    client = app.test_client()
+    with app.test_request_context():
+        login_user(seed["user1"])
+        sess_data = dict(flask_session)
+    with client.session_transaction() as s:
+        s.update(sess_data)
+    base = f"/api/v1/guilds/{seed['guild'].id}/events/{seed['event'].id}"
+    return client, base
+
+
+class TestModelViews:
+    def test_character_views(self, db, seed):
+        char = seed["char1"]
+        char.char_metadata = _GEAR
+        db.session.commit()
+
+        full = char.to_dict()
+        lineup = char.to_dict(view="lineup")
+        summary = char.to_dict(view="summary")
+        assert full["metadata"]["equipment"]
+        assert "equipment" not in lineup["metadata"]
+        assert lineup["metadata"]["professions"] == _GEAR["professions"]
+        assert summary["metadata"] == {"level": 80}
+        assert "armory_url" not in summary
+
+    def test_event_views(self, db, seed):
+        event = seed["event"]
+        event.instructions = "Bring flasks"
+        summary = event.to_dict(view="summary")
+        assert "instructions" not in summary and "healer_slots" not in summary
+        assert event.to_dict(view="lineup")["range_dps_slots"] == 2
+        assert event.to_dict()["instructions"] == "Bring flasks"
+
+    def test_pick_fields_keeps_id(self):
+        rows = [{"id": 1, "name": "a", "note": "x"}]
+        assert pick_fields(rows, ["name"]) == [{"id": 1, "name": "a"}]
+        assert pick_fields(rows, None) is rows
+
+
+class TestEndpointViews:
+    def test_lineup_defaults_to_compact(self, raid):
+        client, base = raid
+        compact = client.get(f"{base}/lineup")
+        full = client.get(f"{base}/lineup?view=full")
+        assert compact.status_code == full.status_code == 200
+
+        signup = compact.get_json()["range_dps"][0]
+        assert "equipment" not in signup["character"]["metadata"]
+        assert signup["note"] == "gs 5.6k"
+        assert full.get_json()["range_dps"][0]["character"]["metadata"]["equipment"]
+        assert len(full.data) > 2 * len(compact.data)
+
+    def test_lineup_fields_and_bad_view(self, raid):
+        client, base = raid
+        body = client.get(f"{base}/lineup?fields=chosen_role").get_json()
+        assert body["range_dps"][0] == {"id": body["range_dps"][0]["id"], "chosen_role": "range_dps"}
+        assert "version" in body
+
+        resp = client.get(f"{base}/lineup?view=everything")
+        assert resp.status_code == 400
+
+    def test_signups_keep_full_by_default(self, raid):
+        client, base = raid
+        full = client.get(f"{base}/signups").get_json()
+        assert full[0]["character"]["metadata"]["equipment"]
+        summary = client.get(f"{base}/signups?view=summary").get_json()
+        assert set(summary[0]["character"]) >= {"name", "class_name"}
+        assert "note" not in summary[0]
+
+    def test_calendar_defaults_to_summary(self, raid, seed):
+        client, base = raid
+        events = client.get(f"/api/v1/guilds/{seed['guild'].id}/events").get_json()
+        assert "instructions" not in events[0]
+        assert "created_at" not in events[0]
+        assert events[0]["starts_at_utc"]
+
+        full = client.get(f"/api/v1/guilds/{seed['guild'].id}/events?view=full").get_json()
+        assert "instructions" in full[0]
+        detail = client.get(base).get_json()
+        assert "instructions" in detail
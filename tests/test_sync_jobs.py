@@ -0,0 +1,127 @@
+"""Tests for queued admin character syncs and their progress reporting."""
+
+from __future__ import annotations
+
+import json
+from unittest.mock import patch
+
+import pytest
+
+from app.jobs.worker import claim_next_job, run_job
+from app.models.notification import JobProgress, JobQueue
+from app.services import sync_job_service, warmane_service
+
+
+def _fake_fetch(realm, name):
+    return {"name": name, "class": "Hunter", "level": "80", "race": "Orc", "talents": []}
+
+
+@pytest.fixture
+def admin_client(app, db, seed):
+    from flask import session as flask_session
+    from flask_login import login_user
+
+    seed["user1"].is_admin = True
+    db.session.commit()
+    client = app.test_client()
+    with app.test_request_context():
+        login_user(seed["user1"])
+        sess_data = dict(flask_session)
+    with client.session_transaction() as s:
+        s.update(sess_data)
+    return client
+
+
+@pytest.fixture
+def stub_armory(app, monkeypatch):
+    monkeypatch.setitem(app.config, "ARMORY_SYNC_MODE", "character")
+    monkeypatch.setattr(warmane_service, "fetch_character", _fake_fetch)
+
+
+class TestRequestSync:
+    def test_duplicates_collapse(self, db, seed):
+        job, created = sync_job_service.request_sync()
+        assert created
+        again, created = sync_job_service.request_sync()
+        assert (again.id, created) == (job.id, False)
+        # A full sync already covers any single guild
+        covered, created = sync_job_service.request_sync(seed["guild"].id)
+        assert (covered.id, created) == (job.id, False)
+
+    def test_guild_sync_does_not_cover_full_sync(self, db, seed):
+        guild_job, _ = sync_job_service.request_sync(seed["guild"].id)
+        full_job, created = sync_job_service.request_sync()
+        assert created
+        assert full_job.id != guild_job.id
+
+    def test_incremental_jobs_are_not_reused(self, db, seed):
+        from app.jobs.worker import enqueue_job
+
+        enqueue_job(sync_job_service.JOB_TYPE, {"incremental": True})
+        _, created = sync_job_service.request_sync()
+        assert created
+
+
+class TestSyncJobRun:
+    def test_job_records_and_streams_progress(self, db, seed, stub_armory):
+        job, _ = sync_job_service.request_sync()
+        with patch("app.utils.realtime.socketio.emit") as emit:
+            run_job(claim_next_job())
+
+        progress = db.session.get(JobProgress, job.id)
+        assert (progress.done, progress.total, progress.failed) == (3, 3, 0)
+        assert json.loads(progress.result_json)["synced"] == 3
+
+        updates = [c.args[1] for c in emit.call_args_list if c.args[0] == "sync_progress"]
+        assert all(c.kwargs["to"] == "admin_sync" for c in emit.call_args_list if c.args[0] == "sync_progress")
+        assert updates[0]["status"] == "running"
+        assert updates[0]["progress"]["done"] == 0
+        assert updates[-1]["status"] == "done"
+        assert updates[-1]["progress"]["done"] == 3
+
+    def test_inline_sync_has_no_tracker(self, db, seed, stub_armory):
+        from app.jobs.handlers import handle_sync_all_characters
+
+        with patch("app.utils.realtime.socketio.emit") as emit:
+            stats = handle_sync_all_characters({})
+        assert stats["synced"] == 3
+        assert not [c for c in emit.call_args_list if c.args[0] == "sync_progress"]
+
+
+class TestSyncEndpoints:
+    def test_trigger_returns_job_and_status(self, admin_client, db, seed, stub_armory):
+        resp = admin_client.post("/api/v1/admin/sync-characters")
+        assert resp.status_code == 202
+        body = resp.get_json()
+        assert body["created"] is True
+        assert body["status"] == "queued"
+
+        dup = admin_client.post(f"/api/v1/admin/guilds/{seed['guild'].id}/sync-characters")
+        assert dup.status_code == 202
+        assert dup.get_json()["job_id"] == body["job_id"]
+        assert dup.get_json()["created"] is False
+
+        url = f"/api/v1/admin/sync-jobs/{body['job_id']}"
+        assert admin_client.get(url).get_json()["progress"] is None
+        with patch("app.utils.realtime.socketio.emit"):
+            run_job(claim_next_job())
+        status = admin_client.get(url).get_json()
+        assert status["status"] == "done"
+        assert status["progress"]["done"] == status["progress"]["total"] == 3
+
+    def test_unknown_job_and_guild(self, admin_client, db, seed):
+        assert admin_client.get("/api/v1/admin/sync-jobs/999").status_code == 404
+        assert admin_client.post("/api/v1/admin/guilds/999/sync-characters").status_code == 404
+        assert db.session.query(JobQueue).count() == 0
+
+    def test_requires_permission(self, app, db, seed):
+        from flask import session as flask_session
+        from flask_login import login_user
+
+        client = app.test_client()
+        with app.test_request_context():
+            login_user(seed["user2"])
+            sess_data = dict(flask_session)
+        with client.session_transaction() as s:
+            s.update(sess_data)
+        assert client.post("/api/v1/admin/sync-characters").status_code == 403
@@ -2,6 +2,10 @@
 
 For development:  python wsgi.py
 For production:   gunicorn -k geventwebsocket.gunicorn.workers.GeventWebSocketWorker -w 1 wsgi:app
+
+More than one worker (``-w N`` or several single-worker instances behind a
+sticky proxy) requires ``SOCKETIO_MESSAGE_QUEUE`` so realtime events reach
+clients connected to any worker; see "Multi-process deployment" in the README.
 """
 
 # Fix zope namespace package resolution before any gevent imports.